@@ -0,0 +1,265 @@
+"""Admission control — per-client rate limits and load shedding for expensive routes.
+
+Scoring and summary endpoints can trigger upstream fetches and CPU work,
+so a burst of clients can swamp a single process. Routes opt in with the
+:func:`admit` dependency, which applies two checks:
+
+  - a token bucket per client (``rate`` requests/s, ``burst`` deep);
+    over the limit → 429 with ``Retry-After``.
+  - a process-wide concurrency limit. Requests beyond it wait in a
+    bounded queue; a full queue or a wait longer than ``queue_timeout``
+    → 503 with ``Retry-After``.
+
+The dashboard page, static files and cheap routes are not affected.
+
+Configuration (environment, 0 disables a check):
+  - ``INFRASCOPE_RATE_LIMIT``        requests/s per client (default 10)
+  - ``INFRASCOPE_RATE_BURST``        bucket size (default 40)
+  - ``INFRASCOPE_MAX_CONCURRENT``    expensive requests in flight (default 32)
+  - ``INFRASCOPE_MAX_QUEUE``         requests waiting for a slot (default 64)
+  - ``INFRASCOPE_QUEUE_TIMEOUT_S``   longest wait for a slot (default 2)
+  - ``INFRASCOPE_TRUST_PROXY``       1 = identify clients by X-Forwarded-For
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Callable
+
+from fastapi import Request
+
+from backend.app import metrics
+
+_MAX_TRACKED_CLIENTS = 100_000
+
+
+class RateLimited(RuntimeError):
+    """Raised when a client has used up its token bucket."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Rate limit exceeded")
+        self.retry_after = retry_after
+
+
+class Overloaded(RuntimeError):
+    """Raised when the concurrency queue is full or the wait timed out."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Server is overloaded")
+        self.retry_after = retry_after
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+# =====================================================================
+# Per-client token buckets
+# =====================================================================
+
+class TokenBucketLimiter:
+    """Token buckets keyed by client; idle clients are evicted oldest first."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_clients: int = _MAX_TRACKED_CLIENTS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._clock = clock
+        # client → (tokens, last refill); insertion order = least recently seen first
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens; return 0 on success, else seconds until possible.
+
+        ``cost`` is capped at ``burst``: a bucket never holds more, so a
+        costlier route would otherwise be refused forever.
+        """
+        cost = min(cost, self.burst)
+        now = self._clock()
+        tokens, last = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens >= cost:
+            tokens -= cost
+            wait = 0.0
+        else:
+            wait = (cost - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            del self._buckets[next(iter(self._buckets))]
+        return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# =====================================================================
+# Global concurrency limit with a bounded queue
+# =====================================================================
+
+class ConcurrencyLimiter:
+    """Caps requests in flight; sheds load instead of queueing without bound."""
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _retry_after(self) -> int:
+        return 1 + len(self._waiters) // max(self.limit, 1)
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise Overloaded(self._retry_after())
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return  # a slot was handed over just as the wait expired
+            future.cancel()
+            raise Overloaded(self._retry_after()) from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            future.cancel()
+            raise
+        finally:
+            try:
+                self._waiters.remove(future)
+            except ValueError:
+                pass
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the next waiter if there is one."""
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+# =====================================================================
+# Process-wide limiters and the route dependency
+# =====================================================================
+
+_rate_limiter: TokenBucketLimiter | None = None
+_concurrency: ConcurrencyLimiter | None = None
+_trust_proxy = False
+
+
+def configure_admission(
+    rate: float = 10.0,
+    burst: float = 40.0,
+    max_concurrent: int = 32,
+    max_queue: int = 64,
+    queue_timeout: float = 2.0,
+    trust_proxy: bool = False,
+) -> None:
+    """Replace the process-wide limiters (0 disables the rate or concurrency check)."""
+    global _rate_limiter, _concurrency, _trust_proxy
+    _rate_limiter = TokenBucketLimiter(rate, max(burst, 1.0)) if rate > 0 else None
+    _concurrency = (
+        ConcurrencyLimiter(max_concurrent, max_queue, queue_timeout) if max_concurrent > 0 else None
+    )
+    _trust_proxy = trust_proxy
+
+
+def configure_from_env() -> None:
+    """(Re)build the limiters from the ``INFRASCOPE_*`` environment."""
+    configure_admission(
+        rate=_env_float("INFRASCOPE_RATE_LIMIT", 10.0),
+        burst=_env_float("INFRASCOPE_RATE_BURST", 40.0),
+        max_concurrent=int(_env_float("INFRASCOPE_MAX_CONCURRENT", 32)),
+        max_queue=int(_env_float("INFRASCOPE_MAX_QUEUE", 64)),
+        queue_timeout=_env_float("INFRASCOPE_QUEUE_TIMEOUT_S", 2.0),
+        trust_proxy=os.environ.get("INFRASCOPE_TRUST_PROXY", "0") == "1",
+    )
+
+
+configure_from_env()
+
+_REJECTED = {
+    reason: metrics.ADMISSION_REJECTED.labels(reason) for reason in ("rate_limited", "overloaded")
+}
+
+metrics.Gauge(
+    "infrascope_admission_requests", "Expensive requests running or queued for a slot.", ["state"],
+    callback=lambda: {} if _concurrency is None else {
+        ("active",): float(_concurrency.active), ("queued",): float(_concurrency.waiting),
+    },
+)
+
+
+def client_key(request: Request) -> str:
+    """Identify the client: first X-Forwarded-For hop behind a trusted proxy, else the peer."""
+    if _trust_proxy:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",", 1)[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def admission_stats() -> dict:
+    """Return limiter state for the health endpoint."""
+    return {
+        "rate_limit": None if _rate_limiter is None else {
+            "rate": _rate_limiter.rate, "burst": _rate_limiter.burst, "clients": len(_rate_limiter),
+        },
+        "concurrency": None if _concurrency is None else {
+            "limit": _concurrency.limit, "active": _concurrency.active,
+            "queued": _concurrency.waiting, "max_queue": _concurrency.max_queue,
+        },
+    }
+
+
+def admit(cost: float = 1.0):
+    """Router dependency applying rate limiting and the concurrency limit.
+
+    ``cost`` is the number of tokens a call takes from the client's bucket.
+    """
+    async def dependency(request: Request):
+        limiter = _rate_limiter
+        if limiter is not None:
+            wait = limiter.acquire(client_key(request), cost)
+            if wait > 0:
+                _REJECTED["rate_limited"].inc()
+                raise RateLimited(math.ceil(wait))
+        gate = _concurrency
+        if gate is None:
+            yield
+            return
+        try:
+            await gate.acquire()
+        except Overloaded:
+            _REJECTED["overloaded"].inc()
+            raise
+        try:
+            yield
+        finally:
+            gate.release()
+
+    return dependency
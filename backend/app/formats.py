@@ -0,0 +1,267 @@
+"""Response formats — JSON, MessagePack and Arrow IPC by content negotiation.
+
+High-rate consumers (the routing service) spend a measurable share of
+each request encoding and decoding JSON. Routes that return feed lists or
+risk results also answer in:
+
+  - ``application/msgpack``: the same structure as the JSON body, binary.
+  - ``application/vnd.apache.arrow.stream``: an Arrow IPC stream with one
+    column per schema field, for bulk lists (and route segments, with the
+    route's other fields as JSON in the schema metadata under ``"meta"``).
+
+The format is chosen from the ``Accept`` header; JSON stays the default,
+so browsers and existing clients see no change. Binary bodies carry
+exactly the fields of the route's Pydantic schema, with its defaults.
+
+Both encoders are optional (``pip install infrascope[binary]``) and
+imported on first use; without them requests fall back to JSON.
+
+Rows served from the shared snapshot skip per-request validation and
+encoding; see :func:`respond`. ``INFRASCOPE_FAST_RESPONSES=0`` turns that
+off.
+"""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+import json
+import os
+import types
+import typing
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+
+from backend.app import http_cache
+from backend.app.mcp.snapshot_store import SnapshotRows
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+_ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+
+ROW_RESPONSES = {200: {"content": {MSGPACK: {}, ARROW: {}}}}
+OBJECT_RESPONSES = {200: {"content": {MSGPACK: {}}}}
+
+_fast_path = os.environ.get("INFRASCOPE_FAST_RESPONSES", "1") != "0"
+
+
+def set_fast_path(enabled: bool) -> None:
+    """Turn the pre-encoded snapshot fast path on or off at runtime."""
+    global _fast_path
+    _fast_path = enabled
+
+
+@functools.cache
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def available_formats(columnar: bool) -> tuple[str, ...]:
+    """Formats this process can produce for a route, JSON first."""
+    formats = [JSON]
+    if _installed("msgpack"):
+        formats.append(MSGPACK)
+    if columnar and _installed("pyarrow"):
+        formats.append(ARROW)
+    return tuple(formats)
+
+
+def negotiate(accept: str | None, offered: tuple[str, ...]) -> str:
+    """Pick the best of ``offered`` for an ``Accept`` header (JSON on ties and misses)."""
+    if not accept:
+        return JSON
+    weights: dict[str, float] = {}
+    for item in accept.split(","):
+        media, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media = media.strip().lower()
+        weights[_ALIASES.get(media, media)] = q
+    best, best_q = JSON, 0.0
+    for media in offered:
+        q = weights.get(media)
+        if q is None:
+            q = weights.get(media.split("/", 1)[0] + "/*", weights.get("*/*", 0.0))
+        if q > best_q:
+            best, best_q = media, q
+    return best
+
+
+# =====================================================================
+# Projection onto the response schema
+# =====================================================================
+
+_MISSING = object()
+
+
+def _model_of(annotation) -> type[BaseModel] | None:
+    """Return the model of ``Model``, ``list[Model]`` or ``Model | None``."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        model = _model_of(arg)
+        if model is not None:
+            return model
+    return None
+
+
+@functools.cache
+def _plan(model: type[BaseModel]) -> tuple[tuple[str, Any, type[BaseModel] | None], ...]:
+    """(field, default, nested model) for every field of ``model``."""
+    plan = []
+    for name, info in model.model_fields.items():
+        default = _MISSING if info.default is PydanticUndefined else info.default
+        plan.append((name, default, _model_of(info.annotation)))
+    return tuple(plan)
+
+
+def project(obj: Any, model: type[BaseModel], exclude: str | None = None) -> Any:
+    """Reduce ``obj`` (a dict or list of dicts) to the fields of ``model``, filling defaults."""
+    if isinstance(obj, list):
+        return [project(item, model) for item in obj]
+    out = {}
+    for name, default, nested in _plan(model):
+        if name == exclude:
+            continue
+        value = obj[name] if default is _MISSING else obj.get(name, default)
+        out[name] = value if nested is None or value is None else project(value, nested)
+    return out
+
+
+# =====================================================================
+# Encoders
+# =====================================================================
+
+@functools.cache
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def encode_json(data: Any, schema: Any) -> bytes:
+    """Validate and encode ``data`` exactly as FastAPI renders a ``schema`` response."""
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(data), by_alias=True)
+
+
+def encode_msgpack(rows: Any) -> bytes:
+    import msgpack
+
+    return msgpack.packb(rows, use_bin_type=True)
+
+
+def _arrow_type(annotation):
+    import pyarrow as pa
+
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        (inner,) = [a for a in typing.get_args(annotation) if a is not type(None)]
+        return _arrow_type(inner)
+    if origin is list:
+        return pa.list_(_arrow_type(typing.get_args(annotation)[0]))
+    scalar = {str: pa.string(), float: pa.float64(), int: pa.int64(), bool: pa.bool_()}
+    if annotation in scalar:
+        return scalar[annotation]
+    raise TypeError(f"No Arrow type for {annotation!r}")
+
+
+@functools.cache
+def arrow_schema(model: type[BaseModel]):
+    """Arrow schema with one column per (flat) field of ``model``."""
+    import pyarrow as pa
+
+    return pa.schema([
+        pa.field(name, _arrow_type(info.annotation)) for name, info in model.model_fields.items()
+    ])
+
+
+def encode_arrow(rows: list[dict], model: type[BaseModel], meta: dict | None = None) -> bytes:
+    """Encode ``rows`` as a single-batch Arrow IPC stream, column by column."""
+    import pyarrow as pa
+
+    schema = arrow_schema(model)
+    if meta is not None:
+        schema = schema.with_metadata({"meta": json.dumps(meta, ensure_ascii=False)})
+    columns = []
+    for (name, default, _), field in zip(_plan(model), schema):
+        if default is _MISSING:
+            values = [row[name] for row in rows]
+        else:
+            values = [row.get(name, default) for row in rows]
+        columns.append(pa.array(values, type=field.type))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(pa.record_batch(columns, schema=schema))
+    return sink.getvalue().to_pybytes()
+
+
+# =====================================================================
+# Route helper
+# =====================================================================
+
+def _encode(data: Any, schema: Any, media: str, table: str | None = None) -> bytes:
+    model = _model_of(schema)
+    if media == JSON:
+        return encode_json(data, schema)
+    if media == MSGPACK:
+        return encode_msgpack(project(data, model))
+    if table is None:
+        return encode_arrow(data, model)
+    row_model = _model_of(model.model_fields[table].annotation)
+    return encode_arrow(data[table], row_model, project(data, model, exclude=table))
+
+
+def _snapshot_response(
+    request: Request, response: Response, rows: SnapshotRows, schema: Any, media: str,
+) -> Response:
+    """Serve snapshot rows from bodies encoded (and compressed) once per version."""
+    key = (media, schema)
+    entry = rows.memo.get(key)
+    if entry is None:
+        body = _encode(rows, schema, media)
+        entry = rows.memo[key] = (body, http_cache.etag_for(body))
+    body, etag = entry
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    headers["etag"] = etag
+    body = http_cache.precompress_body(
+        body, media, request.headers.get("accept-encoding"), headers, rows.memo, key,
+    )
+    return Response(body, media_type=media, headers=headers)
+
+
+def respond(
+    request: Request,
+    response: Response,
+    data: Any,
+    schema: Any,
+    table: str | None = None,
+) -> Any:
+    """Return ``data`` for FastAPI to render as JSON, or a ready Response.
+
+    ``schema`` is the route's response model (``Model`` or ``list[Model]``).
+    A list schema can be sent as Arrow; for an object, ``table`` names the
+    list field sent as the Arrow table.
+
+    Snapshot rows (:class:`SnapshotRows`) were validated at ingestion, so
+    they skip FastAPI's per-item validation: each format is encoded once
+    per snapshot version and reused. Other data is validated as usual.
+    """
+    columnar = typing.get_origin(schema) is list or table is not None
+    media = negotiate(request.headers.get("accept"), available_formats(columnar))
+    response.headers["Vary"] = "Accept"
+    if _fast_path and isinstance(data, SnapshotRows):
+        return _snapshot_response(request, response, data, schema, media)
+    if media == JSON:
+        return data
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(_encode(data, schema, media, table), media_type=media, headers=headers)
@@ -0,0 +1,431 @@
+"""HTTP caching and compression — negotiated gzip/Brotli, ETags and 304s.
+
+Dashboards poll the same feeds over slow mobile links, so two things
+matter: sending fewer bytes and not resending unchanged ones.
+
+  - :class:`HttpCacheMiddleware` compresses text-like responses with the
+    best coding the client accepts (Brotli when the optional ``brotli``
+    package is installed, else gzip) and adds ``Vary: Accept-Encoding``.
+  - Routes opt in to caching with :func:`cache_headers`, which sets
+    ``Cache-Control`` and a ``Last-Modified`` taken from the newest
+    observation in the data. The middleware gives such responses a weak
+    ``ETag`` (a digest of the body) and answers matching ``If-None-Match``
+    revalidations with 304 and no body. ``If-Modified-Since`` is not used
+    for API responses: a feed can change (a warning is lifted) without a
+    newer observation appearing in it.
+  - :class:`PrecompressedStaticFiles` serves ``app.js.br`` / ``app.js.gz``
+    next to ``app.js`` when present; build them with::
+
+        python -m backend.app.http_cache precompress frontend/static
+
+Configuration (environment):
+  - ``INFRASCOPE_CACHE_MAX_AGE``        API freshness in seconds (default 30)
+  - ``INFRASCOPE_STATIC_MAX_AGE``       static asset freshness (default 300)
+  - ``INFRASCOPE_COMPRESS_MIN_BYTES``   smallest body worth compressing (default 512)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import mimetypes
+import os
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Iterable
+
+from fastapi import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from backend.app import metrics
+from backend.app.mcp.snapshot_store import SnapshotRows
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+MAX_AGE_S = _env_int("INFRASCOPE_CACHE_MAX_AGE", 30)
+STATIC_MAX_AGE_S = _env_int("INFRASCOPE_STATIC_MAX_AGE", 300)
+MIN_SIZE = _env_int("INFRASCOPE_COMPRESS_MIN_BYTES", 512)
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # on the fly: close to gzip -6 in speed, ~15% smaller
+PRECOMPRESS_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+_COMPRESSIBLE = frozenset({
+    "application/json", "application/javascript", "application/geo+json",
+    "application/xml", "image/svg+xml",
+})
+
+_NOT_MODIFIED = metrics.HTTP_NOT_MODIFIED.labels()
+_RAW_BYTES = metrics.HTTP_RESPONSE_BYTES.labels("raw")
+_SENT_BYTES = metrics.HTTP_RESPONSE_BYTES.labels("sent")
+
+
+# =====================================================================
+# Content negotiation and encoders
+# =====================================================================
+
+def available_codings() -> tuple[str, ...]:
+    """Codings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def accepted_codings(accept_encoding: str | None, offered: Iterable[str] | None = None) -> list[str]:
+    """Return the ``offered`` codings the client accepts, best first (identity excluded)."""
+    if not accept_encoding:
+        return []
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+    ranked = [
+        (weights.get(coding, weights.get("*", 0.0)), -i, coding)
+        for i, coding in enumerate(available_codings() if offered is None else offered)
+    ]
+    return [coding for q, _, coding in sorted(ranked, reverse=True) if q > 0]
+
+
+def negotiate(accept_encoding: str | None, offered: Iterable[str] | None = None) -> str | None:
+    """Pick the coding to use for ``accept_encoding``; ``None`` means identity."""
+    codings = accepted_codings(accept_encoding, offered)
+    return codings[0] if codings else None
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    """Compress a whole body with ``coding`` ("br" or "gzip")."""
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    encoder = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return encoder.compress(body) + encoder.flush()
+
+
+class _StreamEncoder:
+    """Incremental encoder that flushes after every chunk of a streamed body."""
+
+    def __init__(self, coding: str):
+        if coding == "br":
+            self._br = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._gz = None
+        else:
+            self._br = None
+            self._gz = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def encode(self, chunk: bytes, final: bool) -> bytes:
+        if self._br is not None:
+            return self._br.process(chunk) + (self._br.finish() if final else self._br.flush())
+        return self._gz.compress(chunk) + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in vary.lower():
+        headers["vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+
+
+def is_compressible(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    mime = content_type.split(";", 1)[0].strip().lower()
+    return mime.startswith("text/") or mime in _COMPRESSIBLE or mime.endswith("+json")
+
+
+def precompress_body(
+    body: bytes, media_type: str, accept_encoding: str | None, headers: dict, memo: dict, key,
+) -> bytes:
+    """Compress ``body`` ahead of the middleware, reusing encodings kept in ``memo[key, coding]``.
+
+    For bodies served many times unchanged. Sets ``content-encoding`` and
+    ``vary`` in ``headers`` (lower-case keys); the middleware then passes
+    the response through.
+    """
+    if not is_compressible(media_type) or len(body) < MIN_SIZE:
+        return body
+    vary = headers.get("vary")
+    headers["vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+    _RAW_BYTES.inc(len(body))
+    coding = negotiate(accept_encoding)
+    if coding is not None:
+        encoded = memo.get((key, coding))
+        if encoded is None:
+            encoded = memo[key, coding] = compress(body, coding)
+        body = encoded
+        headers["content-encoding"] = coding
+    _SENT_BYTES.inc(len(body))
+    return body
+
+
+# =====================================================================
+# Validators
+# =====================================================================
+
+def etag_for(body: bytes) -> str:
+    """Return a weak ETag for ``body`` (weak: the encoding may vary)."""
+    return 'W/"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def etag_matches(etag: str | None, if_none_match: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header."""
+    if if_none_match.strip() == "*":
+        return True
+    return etag is not None and _opaque(etag) in {_opaque(t) for t in if_none_match.split(",")}
+
+
+def newest(items: Iterable[dict], field: str) -> datetime | None:
+    """Return the latest ISO-8601 ``field`` among ``items`` (None if there is none)."""
+    latest = None
+    for item in items:
+        value = item.get(field)
+        if not value:
+            continue
+        try:
+            ts = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            continue
+        if ts.tzinfo is not None and (latest is None or ts > latest):
+            latest = ts
+    return latest
+
+
+def cache_headers(
+    response: Response,
+    items: Iterable[dict] = (),
+    field: str = "observed_at",
+    max_age: int | None = None,
+) -> None:
+    """Mark ``response`` cacheable; ``Last-Modified`` is the newest ``field`` in ``items``."""
+    response.headers["Cache-Control"] = f"public, max-age={MAX_AGE_S if max_age is None else max_age}"
+    if isinstance(items, SnapshotRows):
+        key = ("newest", field)
+        if key not in items.memo:
+            items.memo[key] = newest(items, field)
+        latest = items.memo[key]
+    else:
+        latest = newest(items, field)
+    if latest is not None:
+        response.headers["Last-Modified"] = format_datetime(latest.astimezone(timezone.utc), usegmt=True)
+
+
+# =====================================================================
+# Middleware
+# =====================================================================
+
+_HEADERS_304 = frozenset({
+    b"cache-control", b"content-location", b"date", b"etag", b"expires", b"last-modified", b"vary",
+})
+
+
+class HttpCacheMiddleware:
+    """ASGI middleware adding ETags / 304s to cacheable responses and compressing bodies.
+
+    Complete bodies are buffered (JSON responses arrive in one message);
+    streamed bodies are compressed chunk by chunk and get no ETag.
+    """
+
+    def __init__(self, app, min_size: int = MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        coding = negotiate(request_headers.get("accept-encoding"))
+        is_get = scope["method"] == "GET"
+        if_none_match = request_headers.get("if-none-match") if is_get else None
+        pending: dict | None = None
+        encoder: _StreamEncoder | None = None
+
+        async def send_wrapper(message):
+            nonlocal pending, encoder
+            kind = message["type"]
+            if kind == "http.response.start":
+                pending = message
+                return
+            if pending is None:  # body already started, or e.g. http.response.debug
+                if encoder is not None and kind == "http.response.body":
+                    more = message.get("more_body", False)
+                    body = encoder.encode(message.get("body", b""), final=not more)
+                    message = {"type": kind, "body": body, "more_body": more}
+                await send(message)
+                return
+
+            start, pending = pending, None
+            if kind != "http.response.body":  # e.g. http.response.pathsend
+                await send(start)
+                await send(message)
+                return
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            body = message.get("body", b"")
+
+            if message.get("more_body", False):
+                if self._compressible(start["status"], headers, None):
+                    _vary(headers)
+                    if coding is not None:
+                        encoder = _StreamEncoder(coding)
+                        self._mark_encoded(headers, coding)
+                        del headers["content-length"]
+                        body = encoder.encode(body, final=False)
+                await send({**start, "headers": headers.raw})
+                await send({"type": kind, "body": body, "more_body": True})
+                return
+
+            cacheable = "no-store" not in headers.get("cache-control", "no-store")
+            if is_get and cacheable and start["status"] == 200:
+                etag = headers.setdefault("etag", etag_for(body))
+                if if_none_match is not None and etag_matches(etag, if_none_match):
+                    _NOT_MODIFIED.inc()
+                    await send({
+                        "type": "http.response.start", "status": 304,
+                        "headers": [(k, v) for k, v in headers.raw if k in _HEADERS_304],
+                    })
+                    await send({"type": kind, "body": b""})
+                    return
+
+            if self._compressible(start["status"], headers, len(body)):
+                _vary(headers)
+                _RAW_BYTES.inc(len(body))
+                if coding is not None:
+                    body = compress(body, coding)
+                    self._mark_encoded(headers, coding)
+                    headers["content-length"] = str(len(body))
+                _SENT_BYTES.inc(len(body))
+            await send({**start, "headers": headers.raw})
+            await send({"type": kind, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compressible(self, status: int, headers: MutableHeaders, size: int | None) -> bool:
+        if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        if size is None:
+            length = headers.get("content-length")
+            size = int(length) if length and length.isdigit() else self.min_size
+        return size >= self.min_size and is_compressible(headers.get("content-type"))
+
+    @staticmethod
+    def _mark_encoded(headers: MutableHeaders, coding: str) -> None:
+        headers["content-encoding"] = coding
+        # Byte ranges and strong validators refer to the identity body.
+        if "accept-ranges" in headers:
+            del headers["accept-ranges"]
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["etag"] = "W/" + etag
+
+
+# =====================================================================
+# Static files
+# =====================================================================
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles serving ``<file>.br`` / ``<file>.gz`` when present and accepted.
+
+    Every response carries ``Cache-Control: public, max-age=STATIC_MAX_AGE_S``.
+    """
+
+    def __init__(self, *args, max_age: int = STATIC_MAX_AGE_S, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = f"public, max-age={max_age}"
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        response = None
+        if status_code == 200 and "range" not in request_headers:
+            for coding in accepted_codings(request_headers.get("accept-encoding"), PRECOMPRESS_SUFFIXES):
+                try:
+                    encoded_stat = os.stat(f"{full_path}{PRECOMPRESS_SUFFIXES[coding]}")
+                except OSError:
+                    continue
+                if encoded_stat.st_mtime < stat_result.st_mtime:
+                    continue  # stale: the source changed after precompression
+                response = FileResponse(
+                    f"{full_path}{PRECOMPRESS_SUFFIXES[coding]}",
+                    stat_result=encoded_stat,
+                    media_type=mimetypes.guess_type(str(full_path))[0] or "application/octet-stream",
+                    headers={"Content-Encoding": coding},
+                )
+                del response.headers["accept-ranges"]
+                break
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["Cache-Control"] = self.cache_control
+        if is_compressible(response.media_type):
+            _vary(response.headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def precompress(directory: str, min_size: int = MIN_SIZE) -> list[Path]:
+    """Write ``.gz`` (and ``.br`` when available) next to each compressible file.
+
+    Outputs keep the source's mtime so they stay valid until it changes,
+    and are skipped when they would not be smaller.
+    """
+    written = []
+    for path in sorted(Path(directory).rglob("*")):
+        if not path.is_file() or path.suffix in (".br", ".gz") or path.stat().st_size < min_size:
+            continue
+        if not is_compressible(mimetypes.guess_type(path.name)[0]):
+            continue
+        data = path.read_bytes()
+        stat = path.stat()
+        for coding, suffix in PRECOMPRESS_SUFFIXES.items():
+            if coding == "br":
+                if brotli is None:
+                    continue
+                out = brotli.compress(data, quality=11)
+            else:
+                encoder = zlib.compressobj(9, zlib.DEFLATED, 31)
+                out = encoder.compress(data) + encoder.flush()
+            if len(out) >= len(data):
+                continue
+            target = path.with_name(path.name + suffix)
+            target.write_bytes(out)
+            os.utime(target, (stat.st_atime, stat.st_mtime))
+            written.append(target)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP caching and compression utilities.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pre = sub.add_parser("precompress", help="Write .br/.gz siblings for static assets")
+    pre.add_argument("directory")
+    args = parser.parse_args()
+    if args.command == "precompress":
+        for target in precompress(args.directory):
+            print(target)
+        if brotli is None:
+            print("brotli is not installed; wrote gzip only")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,31 +2,123 @@
 
 from __future__ import annotations
 
+# Imported before anything else so the ``import`` startup phase covers the
+# framework too.
+from backend.app import startup  # isort: skip
+
+import asyncio
+import functools
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
 
+from backend.app import metrics, tracing
+from backend.app.admission import Overloaded, RateLimited
+from backend.app.http_cache import HttpCacheMiddleware, PrecompressedStaticFiles
 from backend.app.routers.disaster import router as disaster_router
+from backend.app.services.alerting import run_alert_loop
+from backend.app.services.executor import ExecutorBusy, JobCancelled, shutdown_executor
 
 FRONTEND_DIR = Path(__file__).resolve().parent.parent.parent / "frontend"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Alerts are evaluated here only in single-process deployments; with a
+    # snapshot ingestor, the ingestor evaluates them.
+    interval = float(os.environ.get("INFRASCOPE_ALERT_INTERVAL", "0"))
+    alert_task = asyncio.create_task(run_alert_loop(interval)) if interval > 0 else None
+    startup.reset()
+    warmup_task = None
+    if startup.WARMUP:
+        _templates()
+        warmup_task = asyncio.create_task(startup.warm_up())
+    else:
+        startup.set_ready()
+    yield
+    for task in (alert_task, warmup_task):
+        if task is not None:
+            task.cancel()
+    shutdown_executor()
+
+
 app = FastAPI(
     title="InfraScope",
     description="AI-powered disaster & infrastructure visualization dashboard",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Innermost, so metrics and traces see 304s and the time spent compressing.
+app.add_middleware(HttpCacheMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(tracing.TracingMiddleware)
 app.include_router(disaster_router)
 
-app.mount("/static", StaticFiles(directory=str(FRONTEND_DIR / "static")), name="static")
 
-templates = Jinja2Templates(directory=str(FRONTEND_DIR / "templates"))
+@app.exception_handler(ExecutorBusy)
+async def executor_busy_handler(request: Request, exc: ExecutorBusy):
+    """Shed load when the offload pools are saturated."""
+    return JSONResponse(
+        {"detail": str(exc)}, status_code=503, headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request: Request, exc: RateLimited):
+    """Reject clients that exceeded their rate limit."""
+    return JSONResponse(
+        {"detail": str(exc)}, status_code=429, headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    """Shed load when too many expensive requests are queued."""
+    return JSONResponse(
+        {"detail": str(exc)}, status_code=503, headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(JobCancelled)
+async def job_cancelled_handler(request: Request, exc: JobCancelled):
+    """The client is gone; 499 only shows up in access logs."""
+    return Response(status_code=499)
+
+
+app.mount(
+    "/static", PrecompressedStaticFiles(directory=str(FRONTEND_DIR / "static")), name="static",
+)
+
+
+@functools.cache
+def _templates():
+    # Jinja2 is only needed for the dashboard page; load it on first use.
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory=str(FRONTEND_DIR / "templates"))
 
 
 @app.get("/", response_class=HTMLResponse)
 def index(request: Request):
     """Serve the main dashboard page."""
-    return templates.TemplateResponse(request, "index.html")
+    return _templates().TemplateResponse(request, "index.html")
+
+
+@app.get("/readyz", include_in_schema=False)
+def readiness():
+    """Readiness probe: 503 until startup (and warm-up, if enabled) has finished."""
+    body = {"ready": startup.is_ready(), "startup_s": startup.PHASES}
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    """Expose Prometheus metrics in text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+startup.mark("import")
@@ -8,22 +8,48 @@ Data Sources:
 
 When a real API call fails (network error, timeout, etc.), the provider
 transparently falls back to locally generated mock data.
+
+Raw upstream payloads can be recorded and replayed offline through the
+same parse path (see ``recording``). Recording compresses and writes on a
+single writer thread, so fetches never wait for the disk.
+
+When ``INFRASCOPE_SNAPSHOT_PATH`` is set, the public functions serve the
+snapshot published by the ingestor process (see ``snapshot_store``)
+instead of fetching, and only fetch themselves if no fresh snapshot exists.
+With ``INFRASCOPE_HISTORY_DIR`` set, :func:`feeds_at` rebuilds the feeds
+as published at a past time (see ``history``).
 """
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-import httpx
-
+from backend.app import metrics, tracing
 from backend.app.mcp import mock_data
+from backend.app.mcp.history import HistoryReader
+from backend.app.mcp.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    hedged,
+)
+from backend.app.mcp.recording import Recorder, Replayer
+from backend.app.mcp.snapshot_store import SnapshotReader
 
 logger = logging.getLogger(__name__)
 
 JST = timezone(timedelta(hours=9))
-_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+_TIMEOUT_S = 10.0
+_CONNECT_TIMEOUT_S = 5.0
+
+# Overridable so benchmarks and tests can point the fetchers at a local stub.
+JMA_BASE_URL = os.environ.get("INFRASCOPE_JMA_BASE_URL", "https://www.jma.go.jp").rstrip("/")
 
 # ── Area code → name / coordinate mapping for JMA data ──────────────
 # JMA uses 6-digit municipality codes. We map major ones for display.
@@ -92,19 +118,130 @@ _WARNING_TYPES = {
 }
 
 
+# =====================================================================
+# Upstream access (circuit breakers + optional hedging)
+# =====================================================================
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+# Hedge a request once it is slower than this latency percentile (0 = off).
+HEDGE_PERCENTILE = _env_float("INFRASCOPE_HEDGE_PERCENTILE", 0.0)
+
+FEEDS = ("warnings", "flood", "sediment")
+
+_BREAKERS: dict[str, CircuitBreaker] = {
+    feed: CircuitBreaker(
+        feed,
+        failure_threshold=int(_env_float("INFRASCOPE_BREAKER_FAILURES", 3)),
+        reset_timeout=_env_float("INFRASCOPE_BREAKER_RESET_S", 30.0),
+    )
+    for feed in FEEDS
+}
+_LATENCY: dict[str, LatencyTracker] = {feed: LatencyTracker() for feed in FEEDS}
+
+# Metric children bound once so the fetch path does no label lookups.
+_FETCH_TIMERS = {feed: metrics.UPSTREAM_FETCH_SECONDS.labels(feed) for feed in FEEDS}
+_PARSE_TIMERS = {feed: metrics.UPSTREAM_PARSE_SECONDS.labels(feed) for feed in FEEDS}
+_BYTES = {feed: metrics.UPSTREAM_BYTES.labels(feed) for feed in FEEDS}
+_FETCH_SPANS = {feed: f"fetch.{feed}" for feed in FEEDS}
+_PARSE_SPANS = {feed: f"parse.{feed}" for feed in FEEDS}
+
+# Last successfully fetched data per public feed, served while a circuit is open.
+_last_good: dict[str, list[dict]] = {}
+
+
+def _count_fallback(feed: str, reason: str) -> None:
+    metrics.FEED_FALLBACKS.labels(feed, reason).inc()
+
+
+metrics.Gauge(
+    "infrascope_upstream_circuit_open", "1 if the upstream circuit is not closed.", ["feed"],
+    callback=lambda: {
+        (feed,): float(_BREAKERS[feed].state != "closed") for feed in FEEDS
+    },
+)
+
+
+async def _request(url: str) -> bytes:
+    """Perform one GET against an upstream endpoint and return the raw body."""
+    import httpx  # deferred: ~50 ms of import time, not needed until the first fetch
+
+    timeout = httpx.Timeout(_TIMEOUT_S, connect=_CONNECT_TIMEOUT_S)
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        resp = await client.get(url)
+        resp.raise_for_status()
+        return resp.content
+
+
+async def _fetch_raw(feed: str, url: str) -> bytes:
+    """Fetch ``url`` through the breaker (and hedging) of ``feed``."""
+    breaker = _BREAKERS[feed]
+    if not breaker.allow():
+        raise CircuitOpenError(f"Circuit for '{feed}' is open")
+    tracker = _LATENCY[feed]
+    delay = tracker.percentile(HEDGE_PERCENTILE) if HEDGE_PERCENTILE else None
+    start = time.perf_counter()
+    try:
+        with tracing.span(_FETCH_SPANS[feed]):
+            if _replayer is not None:
+                body = _replayer.payload(feed)
+            elif delay is None:
+                body = await _request(url)
+            else:
+                body = await hedged(lambda: _request(url), delay)
+    except Exception:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.release()  # cancelled (hedge loser, client gone): not an upstream verdict
+        raise
+    elapsed = time.perf_counter() - start
+    breaker.record_success()
+    tracker.observe(elapsed)
+    _FETCH_TIMERS[feed].observe(elapsed)
+    _BYTES[feed].inc(len(body))
+    if _recorder is not None and _replayer is None:
+        _record(feed, body)
+    return body
+
+
+def upstream_health() -> dict[str, dict]:
+    """Return breaker state and recent latency for every upstream feed."""
+    health = {}
+    for feed in FEEDS:
+        p50 = _LATENCY[feed].percentile(50)
+        p95 = _LATENCY[feed].percentile(95)
+        health[feed] = {
+            **_BREAKERS[feed].snapshot(),
+            "latency_p50_ms": None if p50 is None else round(p50 * 1000, 1),
+            "latency_p95_ms": None if p95 is None else round(p95 * 1000, 1),
+        }
+    return health
+
+
 # =====================================================================
 # JMA Weather Warnings (気象警報・注意報)
 # =====================================================================
 
-JMA_WARNING_URL = "https://www.jma.go.jp/bosai/warning/data/warning/map.json"
+JMA_WARNING_PATH = "/bosai/warning/data/warning/map.json"
+JMA_WARNING_URL = JMA_BASE_URL + JMA_WARNING_PATH
 
 
 async def _fetch_jma_warnings() -> list[dict]:
     """Fetch weather warnings from JMA bosai API."""
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.get(JMA_WARNING_URL)
-        resp.raise_for_status()
-        data = resp.json()
+    payload = await _fetch_raw("warnings", JMA_WARNING_URL)
+    with _PARSE_TIMERS["warnings"].time(), tracing.span(_PARSE_SPANS["warnings"]):
+        return _parse_jma_warnings(payload)
+
+
+def _parse_jma_warnings(payload: bytes) -> list[dict]:
+    """Normalise a raw JMA warning map.json payload."""
+    data = json.loads(payload)
 
     results: list[dict] = []
     # JMA map.json structure: { "<areaCode>": { "warnings": [...], ... }, ... }
@@ -139,7 +276,8 @@ async def _fetch_jma_warnings() -> list[dict]:
 # JMA Flood Warnings (洪水警報)
 # =====================================================================
 
-JMA_FLOOD_URL = "https://www.jma.go.jp/bosai/flood/data/warning/map.json"
+JMA_FLOOD_PATH = "/bosai/flood/data/warning/map.json"
+JMA_FLOOD_URL = JMA_BASE_URL + JMA_FLOOD_PATH
 
 
 async def _fetch_jma_flood_warnings() -> list[dict]:
@@ -148,10 +286,14 @@ async def _fetch_jma_flood_warnings() -> list[dict]:
     Returns data in the same schema as the river water level format,
     since river.go.jp does not offer a clean public API.
     """
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.get(JMA_FLOOD_URL)
-        resp.raise_for_status()
-        raw = resp.json()
+    payload = await _fetch_raw("flood", JMA_FLOOD_URL)
+    with _PARSE_TIMERS["flood"].time(), tracing.span(_PARSE_SPANS["flood"]):
+        return _parse_jma_flood_warnings(payload)
+
+
+def _parse_jma_flood_warnings(payload: bytes) -> list[dict]:
+    """Normalise a raw JMA flood map.json payload."""
+    raw = json.loads(payload)
 
     now = datetime.now(tz=JST).isoformat()
     results: list[dict] = []
@@ -202,15 +344,20 @@ async def _fetch_jma_flood_warnings() -> list[dict]:
 # JMA Landslide Warnings (土砂災害警戒情報)
 # =====================================================================
 
-JMA_SEDIMENT_URL = "https://www.jma.go.jp/bosai/sediment/data/warning/map.json"
+JMA_SEDIMENT_PATH = "/bosai/sediment/data/warning/map.json"
+JMA_SEDIMENT_URL = JMA_BASE_URL + JMA_SEDIMENT_PATH
 
 
 async def _fetch_jma_landslide_warnings() -> list[dict]:
     """Fetch landslide warnings from JMA bosai sediment API."""
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.get(JMA_SEDIMENT_URL)
-        resp.raise_for_status()
-        raw = resp.json()
+    payload = await _fetch_raw("sediment", JMA_SEDIMENT_URL)
+    with _PARSE_TIMERS["sediment"].time(), tracing.span(_PARSE_SPANS["sediment"]):
+        return _parse_jma_landslide_warnings(payload)
+
+
+def _parse_jma_landslide_warnings(payload: bytes) -> list[dict]:
+    """Normalise a raw JMA sediment map.json payload."""
+    raw = json.loads(payload)
 
     now = datetime.now(tz=JST).isoformat()
     results: list[dict] = []
@@ -256,47 +403,226 @@ async def _fetch_jma_landslide_warnings() -> list[dict]:
     return results
 
 
+def configure_upstream(base_url: str) -> None:
+    """Point every JMA fetcher at ``base_url`` (e.g. a local stub server)."""
+    global JMA_BASE_URL, JMA_WARNING_URL, JMA_FLOOD_URL, JMA_SEDIMENT_URL
+    JMA_BASE_URL = base_url.rstrip("/")
+    JMA_WARNING_URL = JMA_BASE_URL + JMA_WARNING_PATH
+    JMA_FLOOD_URL = JMA_BASE_URL + JMA_FLOOD_PATH
+    JMA_SEDIMENT_URL = JMA_BASE_URL + JMA_SEDIMENT_PATH
+
+
+# =====================================================================
+# Recording / replay of raw upstream payloads
+# =====================================================================
+
+_recorder: Recorder | None = None
+_record_writer: ThreadPoolExecutor | None = None
+_replayer: Replayer | None = None
+
+
+def _log_record_error(future: Future) -> None:
+    if future.exception() is not None:
+        logger.warning("Could not record upstream payload", exc_info=future.exception())
+
+
+def _record(feed: str, body: bytes) -> None:
+    """Queue ``body`` for the writer thread, stamped with the fetch time."""
+    future = _record_writer.submit(_recorder.record, feed, body, time.time())
+    future.add_done_callback(_log_record_error)
+
+
+def configure_recording(directory: str | None) -> None:
+    """Append every fetched payload to segment files in ``directory`` (``None`` stops).
+
+    Payloads already queued are written before the old recorder closes.
+    """
+    global _recorder, _record_writer
+    if _record_writer is not None:
+        _record_writer.shutdown(wait=True)
+    if _recorder is not None:
+        _recorder.close()
+    if directory:
+        _recorder = Recorder(directory)
+        # One thread keeps records in fetch order and the file single-writer.
+        _record_writer = ThreadPoolExecutor(1, thread_name_prefix="recorder")
+    else:
+        _recorder = _record_writer = None
+
+
+def configure_replay(directory: str | None, speed: float = 1.0, loop: bool = False) -> Replayer | None:
+    """Serve upstream payloads from a recording instead of the network."""
+    global _replayer
+    _replayer = Replayer(directory, speed=speed, loop=loop) if directory else None
+    return _replayer
+
+
+def replay_status() -> dict | None:
+    """Return the replay position, or ``None`` when fetching live."""
+    return None if _replayer is None else _replayer.status()
+
+
+configure_recording(os.environ.get("INFRASCOPE_RECORD_DIR"))
+configure_replay(
+    os.environ.get("INFRASCOPE_REPLAY_DIR"),
+    speed=_env_float("INFRASCOPE_REPLAY_SPEED", 1.0),
+    loop=os.environ.get("INFRASCOPE_REPLAY_LOOP", "0") == "1",
+)
+
+
+# =====================================================================
+# Shared snapshot (multi-worker mode)
+# =====================================================================
+
+SNAPSHOT_MAX_AGE_S = float(os.environ.get("INFRASCOPE_SNAPSHOT_MAX_AGE", "600"))
+
+_snapshot_reader: SnapshotReader | None = None
+
+
+def configure_shared_snapshot(path: str | None) -> None:
+    """Serve feeds from the shared snapshot file at ``path`` (``None`` disables)."""
+    global _snapshot_reader
+    if _snapshot_reader is not None:
+        _snapshot_reader.close()
+    _snapshot_reader = SnapshotReader(path) if path else None
+
+
+def shared_snapshot_status() -> dict | None:
+    """Return version / age of the shared snapshot, or ``None`` if disabled."""
+    if _snapshot_reader is None:
+        return None
+    snap = _snapshot_reader.read()
+    if snap is None:
+        return {"path": _snapshot_reader.path, "version": 0, "age_s": None}
+    version, published_at, _ = snap
+    return {
+        "path": _snapshot_reader.path,
+        "version": version,
+        "age_s": round(time.time() - published_at, 1),
+    }
+
+
+def _shared_feed(name: str) -> list[dict] | None:
+    """Return feed ``name`` from a fresh shared snapshot, if there is one.
+
+    The returned list is shared by every caller in this worker and must be
+    treated as read-only.
+    """
+    if _snapshot_reader is None:
+        return None
+    snap = _snapshot_reader.read()
+    if snap is None:
+        return None
+    _, published_at, feeds = snap
+    if time.time() - published_at > SNAPSHOT_MAX_AGE_S:
+        return None
+    return feeds.get(name)
+
+
+configure_shared_snapshot(os.environ.get("INFRASCOPE_SNAPSHOT_PATH"))
+
+
+# =====================================================================
+# Snapshot history (time-travel queries)
+# =====================================================================
+
+_history: HistoryReader | None = None
+
+
+def configure_history(directory: str | None) -> None:
+    """Answer ``at=`` queries from the snapshot history in ``directory`` (``None`` disables)."""
+    global _history
+    _history = HistoryReader(directory) if directory else None
+
+
+def feeds_at(at: datetime) -> tuple[datetime, dict[str, list[dict]]]:
+    """Return (snapshot time, feeds) as published at or before ``at``.
+
+    Naive times are taken as JST. Raises LookupError if history is not
+    enabled or starts later, and ValueError for times in the future.
+    """
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=JST)
+    ts = at.timestamp()
+    if ts > time.time():
+        raise ValueError("'at' is in the future")
+    if _history is None:
+        raise LookupError("Snapshot history is not enabled (set INFRASCOPE_HISTORY_DIR)")
+    logged_at, feeds = _history.state_at(ts)
+    return datetime.fromtimestamp(logged_at, tz=JST), feeds
+
+
+configure_history(os.environ.get("INFRASCOPE_HISTORY_DIR"))
+
+
 # =====================================================================
 # Public API functions (with fallback)
 # =====================================================================
 
-async def get_river_water_levels_async() -> list[dict]:
+async def get_river_water_levels_async(use_snapshot: bool = True) -> list[dict]:
     """Fetch river/flood data from JMA, fallback to mock."""
+    if use_snapshot and (shared := _shared_feed("rivers")) is not None:
+        return shared
     try:
         data = await _fetch_jma_flood_warnings()
         if data:
             logger.info("Fetched %d river/flood entries from JMA", len(data))
+            _last_good["rivers"] = data
             return data
+        _count_fallback("rivers", "empty")
+        return mock_data.get_river_water_levels()
+    except CircuitOpenError:
+        logger.debug("JMA flood circuit open, serving last good data")
+        _count_fallback("rivers", "circuit_open")
     except Exception:
-        logger.warning("JMA flood API unavailable, using mock data", exc_info=True)
-    return mock_data.get_river_water_levels()
+        logger.warning("JMA flood API unavailable, using fallback data", exc_info=True)
+        _count_fallback("rivers", "error")
+    return _last_good.get("rivers") or mock_data.get_river_water_levels()
 
 
-async def get_landslide_warnings_async() -> list[dict]:
+async def get_landslide_warnings_async(use_snapshot: bool = True) -> list[dict]:
     """Fetch landslide warnings from JMA, fallback to mock."""
+    if use_snapshot and (shared := _shared_feed("landslides")) is not None:
+        return shared
     try:
         data = await _fetch_jma_landslide_warnings()
         if data:
             logger.info("Fetched %d landslide entries from JMA", len(data))
+            _last_good["landslides"] = data
             return data
+        _count_fallback("landslides", "empty")
+        return mock_data.get_landslide_warnings()
+    except CircuitOpenError:
+        logger.debug("JMA sediment circuit open, serving last good data")
+        _count_fallback("landslides", "circuit_open")
     except Exception:
-        logger.warning("JMA sediment API unavailable, using mock data", exc_info=True)
-    return mock_data.get_landslide_warnings()
+        logger.warning("JMA sediment API unavailable, using fallback data", exc_info=True)
+        _count_fallback("landslides", "error")
+    return _last_good.get("landslides") or mock_data.get_landslide_warnings()
 
 
-async def get_jma_warnings_async() -> list[dict]:
+async def get_jma_warnings_async(use_snapshot: bool = True) -> list[dict]:
     """Fetch weather warnings from JMA, returns empty list on failure."""
+    if use_snapshot and (shared := _shared_feed("warnings")) is not None:
+        return shared
     try:
         data = await _fetch_jma_warnings()
         logger.info("Fetched %d weather warnings from JMA", len(data))
+        _last_good["warnings"] = data
         return data
+    except CircuitOpenError:
+        logger.debug("JMA warning circuit open, serving last good data")
+        _count_fallback("warnings", "circuit_open")
     except Exception:
         logger.warning("JMA warning API unavailable", exc_info=True)
-    return []
+        _count_fallback("warnings", "error")
+    return _last_good.get("warnings", [])
 
 
-def get_road_closures() -> list[dict]:
+def get_road_closures(use_snapshot: bool = True) -> list[dict]:
     """Return road closure data (mock — no public API available)."""
+    if use_snapshot and (shared := _shared_feed("roads")) is not None:
+        return shared
     return mock_data.get_road_closures()
 
 
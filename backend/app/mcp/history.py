@@ -0,0 +1,408 @@
+"""Snapshot History — a time-indexed log of published feed snapshots.
+
+The ingestor appends every snapshot it publishes to a local log when
+``INFRASCOPE_HISTORY_DIR`` (or ``--history-dir``) is set; API workers
+with the same setting answer ``at=`` queries from it by rebuilding the
+feeds as they were at that time::
+
+    python -m backend.app.mcp.ingestor --history-dir /var/lib/infrascope/history &
+    INFRASCOPE_HISTORY_DIR=/var/lib/infrascope/history uvicorn backend.app.main:app
+    python -m backend.app.mcp.history info /var/lib/infrascope/history
+    python -m backend.app.mcp.history prune /var/lib/infrascope/history --max-age 604800
+
+The log uses the segment files of :mod:`backend.app.mcp.recording`. Each
+record is either a full ``checkpoint`` (every ``checkpoint_every``
+snapshots) or a ``delta`` against the previous snapshot: per feed, the
+rows added, the keys removed and the changed fields of the rest (rows
+are keyed by :data:`FEED_KEYS`). Seeking reads the nearest checkpoint at or before the
+requested time and applies at most ``checkpoint_every - 1`` deltas;
+rebuilt states are kept in a small LRU, and a later seek starts from a
+cached state when one lies between the checkpoint and the target.
+
+Segments are only rolled at a checkpoint, so every segment starts with
+one. Retention (``max_age_s`` / ``max_bytes``) deletes whole segments,
+oldest first, and the retained history always starts at a checkpoint.
+Readers index the log on their first query, from the record headers
+only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from backend.app.mcp.recording import (
+    DEFAULT_SEGMENT_SECONDS,
+    Recorder,
+    _read_body,
+    _scan_headers,
+    segments,
+)
+
+DEFAULT_CHECKPOINT_EVERY = 30
+DEFAULT_CACHE_SIZE = 8
+REFRESH_INTERVAL_S = 1.0
+
+CHECKPOINT = "checkpoint"
+DELTA = "delta"
+
+# Fields identifying a row within its feed.
+FEED_KEYS: dict[str, tuple[str, ...]] = {
+    "rivers": ("station_id",),
+    "roads": ("road_id",),
+    "landslides": ("area_id",),
+    "warnings": ("area_code", "warning_type"),
+}
+
+Feeds = dict[str, list[dict]]
+
+
+def _by_key(feed: str, rows: list[dict]) -> dict[str, dict] | None:
+    """Index ``rows`` by key, or ``None`` if the feed has no unique key."""
+    fields = FEED_KEYS.get(feed)
+    if fields is None:
+        return None
+    keyed = {"|".join(str(row[f]) for f in fields): row for row in rows}
+    return keyed if len(keyed) == len(rows) else None
+
+
+def _diff(feed: str, old: list[dict], new: list[dict]) -> dict | None:
+    """Return the change from ``old`` to ``new`` (``None`` if equal).
+
+    Rows present in both are patched field by field; a value every
+    surviving row now shares (typically a fetch timestamp) is stored once
+    under ``"all"``.
+    """
+    if old == new:
+        return None
+    before, after = _by_key(feed, old), _by_key(feed, new)
+    if before is None or after is None:
+        return {"rows": new}
+    kept = [k for k in before if k in after]
+    patches: dict[str, dict] = {}
+    for k in kept:
+        prev, row = before[k], after[k]
+        if prev != row:
+            if prev.keys() != row.keys():
+                return {"rows": new}
+            patches[k] = {f: v for f, v in row.items() if prev[f] != v}
+    common = {}
+    if patches:
+        for f, v in next(iter(patches.values())).items():
+            if all(after[k][f] == v for k in kept):
+                common[f] = v
+        for k in list(patches):
+            patch = {f: v for f, v in patches[k].items() if f not in common}
+            if patch:
+                patches[k] = patch
+            else:
+                del patches[k]
+    change: dict[str, Any] = {
+        "add": [row for k, row in after.items() if k not in before],
+        "remove": [k for k in before if k not in after],
+        "patch": patches,
+    }
+    if common:
+        change["all"] = common
+    # Applying keeps surviving rows in place and appends new ones; spell
+    # out the order only when the feed reordered.
+    expected = kept + [k for k in after if k not in before]
+    if expected != list(after):
+        change["order"] = list(after)
+    return change
+
+
+def _apply(feed: str, rows: list[dict], change: dict) -> list[dict]:
+    if "rows" in change:
+        return change["rows"]
+    fields = FEED_KEYS[feed]
+    keyed = _by_key(feed, rows)
+    for k in change["remove"]:
+        del keyed[k]
+    common, patches = change.get("all", {}), change["patch"]
+    if common or patches:
+        for k, row in keyed.items():
+            patch = patches.get(k)
+            if common or patch:
+                keyed[k] = {**row, **common, **(patch or {})}
+    for row in change["add"]:
+        keyed["|".join(str(row[f]) for f in fields)] = row
+    if "order" in change:
+        return [keyed[k] for k in change["order"]]
+    return list(keyed.values())
+
+
+# =====================================================================
+# Writing
+# =====================================================================
+
+def _segment_start(path: Path) -> float:
+    """Start time of a segment, from its ``<start ms>-<pid>.seg`` name."""
+    return int(path.stem.split("-", 1)[0]) / 1000.0
+
+
+def prune(
+    directory: str,
+    max_age_s: float | None = None,
+    max_bytes: int | None = None,
+    now: float | None = None,
+) -> list[Path]:
+    """Delete the oldest segments beyond ``max_age_s`` or ``max_bytes``; return them.
+
+    A segment goes once the next one starts before the age cutoff (so
+    ``max_age_s`` of history stays queryable), or while the directory is
+    over ``max_bytes``. The newest segment is always kept.
+    """
+    files = segments(directory)
+    cutoff = None if max_age_s is None else (time.time() if now is None else now) - max_age_s
+    total = sum(p.stat().st_size for p in files)
+    removed = []
+    for path, following in zip(files, files[1:]):
+        too_old = cutoff is not None and _segment_start(following) <= cutoff
+        too_big = max_bytes is not None and total > max_bytes
+        if not (too_old or too_big):
+            break
+        total -= path.stat().st_size
+        path.unlink()
+        removed.append(path)
+    return removed
+
+
+class HistoryWriter:
+    """Appends published snapshots as checkpoints and deltas.
+
+    A new segment starts at the first checkpoint after ``segment_seconds``;
+    with ``max_age_s`` or ``max_bytes`` set, old segments are pruned then.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+        max_age_s: float | None = None,
+        max_bytes: int | None = None,
+    ):
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1")
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.segment_seconds = segment_seconds
+        self.max_age_s = max_age_s
+        self.max_bytes = max_bytes
+        # Rolling is decided here, at checkpoints only.
+        self._recorder = Recorder(directory, segment_bytes=1 << 62, segment_seconds=math.inf)
+        self._last: Feeds | None = None
+        self._since_checkpoint = 0
+        self._segment_started: float | None = None
+
+    def append(self, feeds: Feeds, published_at: float | None = None) -> str:
+        """Log ``feeds`` as the state from ``published_at`` on; return the record kind."""
+        at = time.time() if published_at is None else published_at
+        if (
+            self._last is None
+            or self._since_checkpoint + 1 >= self.checkpoint_every
+            or set(feeds) != set(self._last)
+        ):
+            kind, body = CHECKPOINT, feeds
+            self._since_checkpoint = 0
+        else:
+            kind, body = DELTA, {}
+            for name, rows in feeds.items():
+                change = _diff(name, self._last[name], rows)
+                if change is not None:
+                    body[name] = change
+            self._since_checkpoint += 1
+        roll = kind == CHECKPOINT and (
+            self._segment_started is None or at - self._segment_started >= self.segment_seconds
+        )
+        payload = json.dumps(body, ensure_ascii=False, separators=(",", ":"))
+        self._recorder.record(kind, payload.encode("utf-8"), recorded_at=at, new_segment=roll)
+        self._last = feeds
+        if roll:
+            self._segment_started = at
+            if self.max_age_s is not None or self.max_bytes is not None:
+                prune(self.directory, self.max_age_s, self.max_bytes, now=at)
+        return kind
+
+    def close(self) -> None:
+        self._recorder.close()
+
+
+# =====================================================================
+# Reading
+# =====================================================================
+
+class HistoryReader:
+    """Rebuilds the feeds as they were at any logged time.
+
+    Only an index (time and location per record) is held in memory. It is
+    built on the first query and extended from the segments' new bytes
+    when a query falls after the last indexed record, at most once per
+    :data:`REFRESH_INTERVAL_S`; if segments were pruned it is rebuilt.
+    Returned feed lists are shared with the cache and must be treated as
+    read-only.
+    """
+
+    def __init__(self, directory: str, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.directory = directory
+        self.cache_size = cache_size
+        self._times: list[float] = []
+        self._locs: list[tuple[Path, int, int]] = []
+        self._checkpoints: list[int] = []
+        self._scanned: dict[Path, int] = {}
+        self._based = False
+        self._refreshed = 0.0
+        self._cache: OrderedDict[int, Feeds] = OrderedDict()
+        self._indexed = False
+        self._lock = threading.Lock()
+
+    def _reset(self) -> None:
+        self._times, self._locs, self._checkpoints = [], [], []
+        self._scanned, self._based = {}, False
+        self._cache.clear()
+
+    def refresh(self) -> None:
+        """Index records appended since the last refresh."""
+        self._indexed = True
+        self._refreshed = time.monotonic()
+        files = segments(self.directory)
+        if not set(self._scanned) <= set(files):
+            self._reset()  # pruned underneath us
+        for path in files:
+            offset = self._scanned.get(path, 0)
+            for recorded_at, kind, start, length, crc in _scan_headers(path, offset):
+                offset = start + length
+                if self._times and recorded_at < self._times[-1]:
+                    # Out of order (overlapping writers): skip it, and the
+                    # deltas built on it, until the next checkpoint.
+                    self._based = False
+                    continue
+                if kind == CHECKPOINT:
+                    self._checkpoints.append(len(self._times))
+                    self._based = True
+                elif not self._based:
+                    continue
+                self._times.append(recorded_at)
+                self._locs.append((path, start, length, crc))
+            self._scanned[path] = offset
+
+    def _ensure_index(self) -> None:
+        if not self._indexed:
+            self.refresh()
+
+    @property
+    def start(self) -> float | None:
+        self._ensure_index()
+        return self._times[0] if self._times else None
+
+    @property
+    def end(self) -> float | None:
+        self._ensure_index()
+        return self._times[-1] if self._times else None
+
+    def _load(self, i: int) -> dict:
+        return json.loads(_read_body(*self._locs[i]))
+
+    def _build(self, i: int) -> Feeds:
+        base = self._checkpoints[bisect.bisect_right(self._checkpoints, i) - 1]
+        cached = max((j for j in self._cache if base <= j <= i), default=None)
+        if cached is None:
+            feeds, j = self._load(base), base
+        else:
+            feeds, j = dict(self._cache[cached]), cached
+        for k in range(j + 1, i + 1):
+            for name, change in self._load(k).items():
+                feeds[name] = _apply(name, feeds[name], change)
+        return feeds
+
+    def state_at(self, at: float) -> tuple[float, Feeds]:
+        """Return (logged time, feeds) of the latest snapshot at or before ``at``.
+
+        Raises LookupError if nothing was logged by then.
+        """
+        with self._lock:
+            stale = (not self._times or at > self._times[-1]) and (
+                time.monotonic() - self._refreshed >= REFRESH_INTERVAL_S
+            )
+            if not self._indexed or stale:
+                self.refresh()
+            try:
+                return self._state_at(at)
+            except FileNotFoundError:
+                self.refresh()  # a segment was pruned since the last refresh
+                return self._state_at(at)
+            except ValueError as exc:
+                raise LookupError(f"Snapshot history is unreadable: {exc}") from None
+
+    def _state_at(self, at: float) -> tuple[float, Feeds]:
+        i = bisect.bisect_right(self._times, at) - 1
+        if i < 0:
+            raise LookupError(
+                "No snapshot history at that time"
+                + (f" (history starts at {self._times[0]:.0f})" if self._times else ""),
+            )
+        feeds = self._cache.get(i)
+        if feeds is None:
+            feeds = self._build(i)
+            self._cache[i] = feeds
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(i)
+        return self._times[i], feeds
+
+    def status(self) -> dict:
+        self._ensure_index()
+        return {
+            "directory": self.directory,
+            "snapshots": len(self._times),
+            "checkpoints": len(self._checkpoints),
+            "start": self.start,
+            "end": self.end,
+        }
+
+
+# =====================================================================
+# CLI
+# =====================================================================
+
+def _info(directory: str) -> None:
+    reader = HistoryReader(directory)
+    stored = sum(p.stat().st_size for p in segments(directory))
+    status = reader.status()
+    print(
+        f"{status['snapshots']} snapshots ({status['checkpoints']} checkpoints), "
+        f"{stored} bytes on disk",
+    )
+    if reader.start is not None:
+        span = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(reader.start))
+        print(f"from {span}, {reader.end - reader.start:.0f}s of history")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect or prune the snapshot history log.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Summarise a history directory")
+    info.add_argument("directory")
+    trim = sub.add_parser("prune", help="Delete the oldest segments")
+    trim.add_argument("directory")
+    trim.add_argument("--max-age", type=float, help="Seconds of history to keep")
+    trim.add_argument("--max-bytes", type=int, help="Bytes of history to keep")
+    args = parser.parse_args()
+    if args.command == "info":
+        _info(args.directory)
+    else:
+        for path in prune(args.directory, args.max_age, args.max_bytes):
+            print(f"removed {path}")
+
+
+if __name__ == "__main__":
+    main()
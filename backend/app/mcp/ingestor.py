@@ -0,0 +1,138 @@
+"""Snapshot Ingestor — the single process that fetches upstream feeds.
+
+Run one ingestor next to a multi-worker API deployment::
+
+    python -m backend.app.mcp.ingestor --path /dev/shm/infrascope.snap --interval 60 &
+    INFRASCOPE_SNAPSHOT_PATH=/dev/shm/infrascope.snap \\
+        uvicorn backend.app.main:app --workers 4
+
+Each cycle fetches every feed once (with the usual mock fallback) and
+publishes them together as one versioned snapshot, so all workers serve
+the same consistent data and JMA sees one client instead of N. Alert
+subscriptions (see ``services.alerting``) are evaluated against each
+published snapshot. With ``--history-dir`` (or ``INFRASCOPE_HISTORY_DIR``)
+every snapshot is also appended to a local history log for ``at=``
+queries (see ``history``); ``--history-max-age`` / ``--history-max-bytes``
+(``INFRASCOPE_HISTORY_MAX_AGE`` / ``_MAX_BYTES``) bound its size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+
+from backend.app.mcp import data_provider
+from backend.app.mcp.history import DEFAULT_CHECKPOINT_EVERY, HistoryWriter
+from backend.app.mcp.snapshot_store import DEFAULT_CAPACITY, SnapshotWriter
+from backend.app.models.schemas import validate_feeds
+from backend.app.services import alerting
+
+logger = logging.getLogger(__name__)
+
+
+async def collect_feeds() -> dict[str, list[dict]]:
+    """Fetch every feed directly from upstream (never from a shared snapshot)."""
+    rivers, landslides, warnings = await asyncio.gather(
+        data_provider.get_river_water_levels_async(use_snapshot=False),
+        data_provider.get_landslide_warnings_async(use_snapshot=False),
+        data_provider.get_jma_warnings_async(use_snapshot=False),
+    )
+    return {
+        "rivers": rivers,
+        "landslides": landslides,
+        "warnings": warnings,
+        "roads": data_provider.get_road_closures(use_snapshot=False),
+    }
+
+
+async def ingest_once(writer: SnapshotWriter, history: HistoryWriter | None = None) -> int:
+    """Fetch all feeds and publish them as the next snapshot version.
+
+    Feeds are validated against their response schemas here, once, so
+    workers can serve them through the pre-encoded fast path.
+    """
+    feeds = validate_feeds(await collect_feeds())
+    version = writer.publish(feeds)
+    if history is not None:
+        try:
+            history.append(feeds)
+        except OSError:
+            logger.exception("Could not append snapshot v%d to history", version)
+    logger.info(
+        "Published snapshot v%d (%s)", version,
+        ", ".join(f"{k}={len(v)}" for k, v in feeds.items()),
+    )
+    await alerting.get_engine().process(feeds)
+    return version
+
+
+async def run(
+    path: str,
+    interval: float,
+    capacity: int = DEFAULT_CAPACITY,
+    history_dir: str | None = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    history_max_age: float | None = None,
+    history_max_bytes: int | None = None,
+) -> None:
+    """Publish a fresh snapshot every ``interval`` seconds until cancelled."""
+    writer = SnapshotWriter(path, capacity)
+    history = None
+    if history_dir:
+        history = HistoryWriter(
+            history_dir, checkpoint_every,
+            max_age_s=history_max_age, max_bytes=history_max_bytes,
+        )
+    try:
+        while True:
+            try:
+                await ingest_once(writer, history)
+            except Exception:
+                logger.exception("Snapshot ingestion failed; keeping previous version")
+            await asyncio.sleep(interval)
+    finally:
+        writer.close()
+        if history is not None:
+            history.close()
+
+
+def _env_number(name: str, kind):
+    value = os.environ.get(name)
+    return kind(value) if value else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish shared feed snapshots for API workers.")
+    parser.add_argument("--path", default="/dev/shm/infrascope.snap")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between fetches")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="Bytes per slot")
+    parser.add_argument(
+        "--history-dir", default=os.environ.get("INFRASCOPE_HISTORY_DIR"),
+        help="Append every snapshot to a history log here",
+    )
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY,
+        help="Snapshots per full history checkpoint",
+    )
+    parser.add_argument(
+        "--history-max-age", type=float,
+        default=_env_number("INFRASCOPE_HISTORY_MAX_AGE", float),
+        help="Seconds of history to keep (default: no limit)",
+    )
+    parser.add_argument(
+        "--history-max-bytes", type=int,
+        default=_env_number("INFRASCOPE_HISTORY_MAX_BYTES", int),
+        help="Bytes of history to keep (default: no limit)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(
+        args.path, args.interval, args.capacity, args.history_dir, args.checkpoint_every,
+        args.history_max_age, args.history_max_bytes,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""Upstream Recording — capture raw JMA payloads and replay them later.
+
+With ``INFRASCOPE_RECORD_DIR`` set, every successful upstream fetch is
+appended, byte for byte, to a compressed segment file in that directory.
+With ``INFRASCOPE_REPLAY_DIR`` set, the fetchers read from a recording
+instead of the network and the payloads go through the usual parse path
+(and breakers, metrics, spans), so a disaster day can be served again
+offline, at real speed or faster (``INFRASCOPE_REPLAY_SPEED``)::
+
+    INFRASCOPE_RECORD_DIR=/var/lib/infrascope/rec uvicorn backend.app.main:app
+    INFRASCOPE_REPLAY_DIR=/var/lib/infrascope/rec INFRASCOPE_REPLAY_SPEED=60 \\
+        uvicorn backend.app.main:app
+    python -m backend.app.mcp.recording info /var/lib/infrascope/rec
+
+Segment files are append-only and named ``<start ms>-<pid>.seg`` so
+several workers can record into one directory. Each record is::
+
+    crc32(I) recorded_at(d) feed_len(H) body_len(I) feed... zlib(body)...
+
+A record torn by a crash fails its length or checksum and ends the
+segment for readers; nothing after it is lost except that record.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import heapq
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+_RECORD = struct.Struct("<IdHI")
+_SUFFIX = ".seg"
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_SEGMENT_SECONDS = 3600.0
+
+
+class Record(NamedTuple):
+    recorded_at: float
+    feed: str
+    payload: bytes
+
+
+# =====================================================================
+# Writing
+# =====================================================================
+
+class Recorder:
+    """Appends upstream payloads to rolling compressed segment files."""
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        segment_seconds: float = DEFAULT_SEGMENT_SECONDS,
+        level: int = 6,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.level = level
+        self._file = None
+        self._opened_at = 0.0
+        self.records = 0
+
+    def _roll(self, now: float) -> None:
+        if self._file is not None:
+            self._file.close()
+        name = f"{int(now * 1000):013d}-{os.getpid()}{_SUFFIX}"
+        self._file = open(self.directory / name, "ab")
+        self._opened_at = now
+
+    def record(
+        self,
+        feed: str,
+        payload: bytes,
+        recorded_at: float | None = None,
+        new_segment: bool = False,
+    ) -> None:
+        """Append one raw payload for ``feed`` (first in a new segment if ``new_segment``)."""
+        now = time.time() if recorded_at is None else recorded_at
+        if (
+            new_segment
+            or self._file is None
+            or self._file.tell() >= self.segment_bytes
+            or now - self._opened_at >= self.segment_seconds
+        ):
+            self._roll(now)
+        name = feed.encode("utf-8")
+        body = zlib.compress(payload, self.level)
+        self._file.write(
+            _RECORD.pack(zlib.crc32(body), now, len(name), len(body)) + name + body,
+        )
+        self._file.flush()
+        self.records += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# =====================================================================
+# Reading
+# =====================================================================
+
+def segments(directory: str) -> list[Path]:
+    """Return the segment files in ``directory`` in start-time order."""
+    return sorted(Path(directory).glob(f"*{_SUFFIX}"))
+
+
+def _scan(path: Path, offset: int = 0) -> Iterator[tuple[float, str, int, int]]:
+    """Yield (recorded_at, feed, body offset, body length) for intact records.
+
+    ``offset`` must be a record boundary (0, or the end of a record already
+    scanned), so a growing segment can be indexed incrementally.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    pos = 0
+    while pos + _RECORD.size <= len(data):
+        crc, recorded_at, name_len, body_len = _RECORD.unpack_from(data, pos)
+        start = pos + _RECORD.size + name_len
+        end = start + body_len
+        if end > len(data) or zlib.crc32(data[start:end]) != crc:
+            return  # torn tail
+        yield recorded_at, data[pos + _RECORD.size:start].decode("utf-8"), offset + start, body_len
+        pos = end
+
+
+def _scan_headers(path: Path, offset: int = 0) -> Iterator[tuple[float, str, int, int, int]]:
+    """Like :func:`_scan`, plus each body's crc32, reading only the record headers.
+
+    Bodies are skipped, not checksummed; pass the crc to :func:`_read_body`.
+    """
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        f.seek(offset)
+        pos = offset
+        while pos + _RECORD.size <= size:
+            crc, recorded_at, name_len, body_len = _RECORD.unpack(f.read(_RECORD.size))
+            start = pos + _RECORD.size + name_len
+            end = start + body_len
+            if end > size:
+                return  # torn tail
+            name = f.read(name_len).decode("utf-8")
+            yield recorded_at, name, start, body_len, crc
+            f.seek(end)
+            pos = end
+
+
+def _read_body(path: Path, offset: int, length: int, crc: int | None = None) -> bytes:
+    """Read and decompress one body; raises ValueError if ``crc`` does not match."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        body = f.read(length)
+    if crc is not None and zlib.crc32(body) != crc:
+        raise ValueError(f"Corrupt record at {path.name}:{offset}")
+    return zlib.decompress(body)
+
+
+def iter_records(
+    directory: str,
+    start: float | None = None,
+    end: float | None = None,
+    feeds: tuple[str, ...] | None = None,
+) -> Iterator[Record]:
+    """Yield recorded payloads in time order, merged across segments."""
+
+    def one(path: Path) -> Iterator[Record]:
+        for recorded_at, feed, offset, length in _scan(path):
+            if start is not None and recorded_at < start:
+                continue
+            if end is not None and recorded_at >= end:
+                continue
+            if feeds is not None and feed not in feeds:
+                continue
+            yield Record(recorded_at, feed, _read_body(path, offset, length))
+
+    yield from heapq.merge(*(one(p) for p in segments(directory)), key=lambda r: r.recorded_at)
+
+
+# =====================================================================
+# Replay
+# =====================================================================
+
+class Replayer:
+    """Serves the payload each feed had at a moving point in recorded time.
+
+    The replay clock starts at the first record and advances ``speed``
+    recorded seconds per wall second (0 freezes it; use :meth:`seek`).
+    Only an index is kept in memory; payloads are read on demand and the
+    last one per feed is cached.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        speed: float = 1.0,
+        loop: bool = False,
+        clock=time.monotonic,
+    ):
+        self.directory = directory
+        self.speed = speed
+        self.loop = loop
+        self._clock = clock
+        self._index: dict[str, tuple[list[float], list[tuple[Path, int, int]]]] = {}
+        for path in segments(directory):
+            for recorded_at, feed, offset, length in _scan(path):
+                times, locs = self._index.setdefault(feed, ([], []))
+                i = bisect.bisect_right(times, recorded_at)
+                times.insert(i, recorded_at)
+                locs.insert(i, (path, offset, length))
+        if not self._index:
+            raise ValueError(f"No recorded payloads in {directory}")
+        self.start = min(times[0] for times, _ in self._index.values())
+        self.end = max(times[-1] for times, _ in self._index.values())
+        self._cache: dict[str, tuple[int, bytes]] = {}
+        self.seek(self.start)
+
+    def seek(self, recorded_at: float) -> None:
+        """Move the replay clock to ``recorded_at``."""
+        self._origin = recorded_at
+        self._origin_wall = self._clock()
+
+    def now(self) -> float:
+        """Return the current position in recorded time."""
+        t = self._origin + (self._clock() - self._origin_wall) * self.speed
+        if self.loop and t > self.end and self.end > self.start:
+            t = self.start + (t - self.start) % (self.end - self.start)
+        return t
+
+    def feeds(self) -> tuple[str, ...]:
+        return tuple(self._index)
+
+    def payload(self, feed: str) -> bytes:
+        """Return the latest payload recorded for ``feed`` at :meth:`now`.
+
+        Before a feed's first record, its first payload is served.
+        Raises LookupError if the feed was never recorded.
+        """
+        try:
+            times, locs = self._index[feed]
+        except KeyError:
+            raise LookupError(f"Feed '{feed}' is not in the recording") from None
+        i = max(bisect.bisect_right(times, self.now()) - 1, 0)
+        cached = self._cache.get(feed)
+        if cached is not None and cached[0] == i:
+            return cached[1]
+        body = _read_body(*locs[i])
+        self._cache[feed] = (i, body)
+        return body
+
+    def status(self) -> dict:
+        return {
+            "directory": self.directory,
+            "speed": self.speed,
+            "start": self.start,
+            "end": self.end,
+            "position": round(self.now(), 3),
+        }
+
+
+# =====================================================================
+# CLI
+# =====================================================================
+
+def _info(directory: str) -> None:
+    files = segments(directory)
+    counts: dict[str, int] = {}
+    raw = 0
+    first = last = None
+    for rec in iter_records(directory):
+        counts[rec.feed] = counts.get(rec.feed, 0) + 1
+        raw += len(rec.payload)
+        first = rec.recorded_at if first is None else first
+        last = rec.recorded_at
+    stored = sum(p.stat().st_size for p in files)
+    print(f"{len(files)} segments, {stored} bytes on disk, {raw} bytes raw")
+    if first is not None:
+        span = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(first))
+        print(f"from {span}, {last - first:.0f}s of traffic")
+    for feed, n in sorted(counts.items()):
+        print(f"  {feed}: {n} payloads")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect upstream payload recordings.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Summarise a recording directory")
+    info.add_argument("directory")
+    args = parser.parse_args()
+    if args.command == "info":
+        _info(args.directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Upstream resilience helpers — circuit breakers, latency tracking, hedging.
+
+When jma.go.jp is slow or down, waiting the full timeout on every request
+only to fall back anyway wastes the caller's time. Each upstream endpoint
+gets a :class:`CircuitBreaker`:
+
+  - **closed**: requests flow; consecutive failures are counted.
+  - **open**: after ``failure_threshold`` failures, calls fail immediately
+    (the provider serves its last good data) for ``reset_timeout`` seconds.
+  - **half_open**: after the timeout, a limited number of probe calls go
+    through; a success closes the circuit, a failure re-opens it.
+
+:func:`hedged` issues a second identical request when the first has not
+answered within a delay (typically a high latency percentile from
+:class:`LatencyTracker`) and returns whichever finishes first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Per-endpoint failure counter with open / half-open / closed states."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probes = 0
+        self.total_failures = 0
+        self.total_rejected = 0
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if self._clock() - self.opened_at < self.reset_timeout:
+                self.total_rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self._probes = 0
+        if self._probes < self.half_open_max:
+            self._probes += 1
+            return True
+        self.total_rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._probes = 0
+
+    def release(self) -> None:
+        """Free the slot of a call that ended without a verdict (e.g. cancelled)."""
+        if self.state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.total_failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = self._clock()
+            self._probes = 0
+
+    def snapshot(self) -> dict:
+        """Return the breaker state for the health endpoint."""
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = round(max(0.0, self.reset_timeout - (self._clock() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "retry_in_s": retry_in,
+        }
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies (seconds)."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> float | None:
+        """Return the ``p``-th percentile, or None until enough samples exist."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[idx]
+
+
+async def hedged(factory: Callable[[], Awaitable[Any]], delay: float) -> Any:
+    """Run ``factory()``; if it is still pending after ``delay``, race a second copy.
+
+    Returns the first successful result and cancels the loser. Raises the
+    last error only if every attempt failed.
+    """
+    first = asyncio.ensure_future(factory())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    attempts = {first, asyncio.ensure_future(factory())}
+    error: BaseException | None = None
+    try:
+        while attempts:
+            done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in attempts:
+            task.cancel()
@@ -0,0 +1,223 @@
+"""Shared Snapshot Store — one ingestor publishes, many API workers read.
+
+When uvicorn runs several workers, each one would otherwise fetch every
+JMA feed itself and keep its own copy. Instead a single ingestor process
+(see :mod:`backend.app.mcp.ingestor`) publishes versioned snapshots into a
+memory-mapped file, and workers map the same file read-only. Put the file
+on a tmpfs such as ``/dev/shm`` so it never touches disk.
+
+File layout (little-endian)::
+
+    header  magic(4s) format(I) seq(Q) active(I) pad(I) capacity(Q)
+    slot 0  version(Q) length(Q) published_at(d) crc32(I) pad(I) payload...
+    slot 1  same as slot 0
+    payload index_len(I) index(JSON {feed: [offset, length, crc32]}) feeds...
+
+Each feed is a separate JSON section of the payload with its own checksum.
+
+The writer fills the inactive slot, then bumps ``seq`` to odd, flips
+``active`` and bumps ``seq`` back to even. Readers copy the active slot
+and retry if ``seq`` moved or the checksum does not match, so they never
+observe a half-written snapshot and never take a lock.
+
+What is shared is the encoded snapshot, and the fetching behind it.
+Python objects cannot live in the mapping, so each worker decodes the
+feeds into its own heap, and decoded RAM still grows with the number of
+workers. Each worker's copy is about 4x the encoded size
+(``python -m benchmarks.snapshot_memory`` measures it). Rows are not
+decoded lazily from the mapping: scoring reads every row on every
+request, so decoding on access would cost far more CPU than the copy
+costs RAM. A feed whose section is unchanged since the previous version
+is not decoded again; the worker keeps its rows and their memoised
+response bodies.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Any
+
+_MAGIC = b"ISNP"
+_FORMAT = 2
+_HEADER = struct.Struct("<4sIQIIQ")
+_SLOT_META = struct.Struct("<QQdII")
+_HEADER_SIZE = 64
+_SLOT_META_SIZE = 32
+_INDEX_LEN = struct.Struct("<I")
+
+DEFAULT_CAPACITY = 16 * 1024 * 1024
+_READ_RETRIES = 50
+
+
+class SnapshotTooLarge(ValueError):
+    """Raised when an encoded snapshot does not fit in a slot."""
+
+
+class SnapshotRows(list):
+    """A feed list decoded from a published snapshot.
+
+    The ingestor validated the rows against their response schema before
+    publishing, and every request in the worker shares this object until
+    the next version, so treat it as read-only. ``memo`` holds values
+    derived from the rows (encoded bodies, validators), computed once per
+    version.
+    """
+
+    __slots__ = ("memo",)
+
+    def __init__(self, rows=()):
+        super().__init__(rows)
+        self.memo: dict = {}
+
+
+def _slot_offset(slot: int, capacity: int) -> int:
+    return _HEADER_SIZE + slot * (_SLOT_META_SIZE + capacity)
+
+
+class SnapshotWriter:
+    """Publishes snapshots into the shared file. Only one writer per file."""
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        size = _HEADER_SIZE + 2 * (_SLOT_META_SIZE + capacity)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+        magic, fmt, seq, active, _, cap = _HEADER.unpack_from(self._mm, 0)
+        if magic == _MAGIC and fmt == _FORMAT and cap == capacity:
+            self._seq, self._active = seq + (seq & 1), active
+            self._version = _SLOT_META.unpack_from(self._mm, _slot_offset(active, capacity))[0]
+        else:
+            self._seq, self._active, self._version = 0, 0, 0
+            _HEADER.pack_into(self._mm, 0, _MAGIC, _FORMAT, 0, 0, 0, capacity)
+
+    @property
+    def version(self) -> int:
+        """Version of the most recently published snapshot (0 = none)."""
+        return self._version
+
+    def publish(self, feeds: dict[str, Any]) -> int:
+        """Encode and publish ``feeds`` as the next snapshot version."""
+        index, sections, offset = {}, [], 0
+        for name, feed in feeds.items():
+            body = json.dumps(feed, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            index[name] = [offset, len(body), zlib.crc32(body)]
+            sections.append(body)
+            offset += len(body)
+        head = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        payload = b"".join([_INDEX_LEN.pack(len(head)), head, *sections])
+        if len(payload) > self.capacity:
+            raise SnapshotTooLarge(
+                f"Snapshot is {len(payload)} bytes, slot capacity is {self.capacity}"
+            )
+        version = self._version + 1
+        slot = 1 - self._active
+        off = _slot_offset(slot, self.capacity)
+        data_off = off + _SLOT_META_SIZE
+        self._mm[data_off:data_off + len(payload)] = payload
+        _SLOT_META.pack_into(
+            self._mm, off, version, len(payload), time.time(), zlib.crc32(payload), 0,
+        )
+        # Odd seq marks the switch in progress; readers retry until it is even.
+        self._seq += 1
+        _HEADER.pack_into(self._mm, 0, _MAGIC, _FORMAT, self._seq, self._active, 0, self.capacity)
+        self._active = slot
+        self._seq += 1
+        _HEADER.pack_into(self._mm, 0, _MAGIC, _FORMAT, self._seq, slot, 0, self.capacity)
+        self._mm.flush()
+        self._version = version
+        return version
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+class SnapshotReader:
+    """Maps the shared file read-only and decodes each changed feed once per version."""
+
+    def __init__(self, path: str, reopen_interval: float = 1.0):
+        self.path = path
+        self.reopen_interval = reopen_interval
+        self._mm: mmap.mmap | None = None
+        self._capacity = 0
+        self._last_open_attempt = 0.0
+        self._version = 0
+        self._published_at = 0.0
+        self._feeds: dict[str, Any] | None = None
+        self._crcs: dict[str, int] = {}
+
+    def _open(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_open_attempt < self.reopen_interval:
+            return False
+        self._last_open_attempt = now
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        magic, fmt, _, _, _, capacity = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or fmt != _FORMAT:
+            mm.close()
+            return False
+        self._mm, self._capacity = mm, capacity
+        return True
+
+    def read(self) -> tuple[int, float, dict[str, Any]] | None:
+        """Return ``(version, published_at, feeds)`` or ``None`` if unavailable.
+
+        Cheap when nothing changed: one header read and a cached result.
+        """
+        if self._mm is None and not self._open():
+            return None
+        mm = self._mm
+        for _ in range(_READ_RETRIES):
+            seq1, active = struct.unpack_from("<QI", mm, 8)
+            if seq1 & 1:
+                continue
+            off = _slot_offset(active, self._capacity)
+            version, length, published_at, crc, _ = _SLOT_META.unpack_from(mm, off)
+            if version == 0:
+                return None
+            if version == self._version and self._feeds is not None:
+                return self._version, self._published_at, self._feeds
+            data_off = off + _SLOT_META_SIZE
+            payload = mm[data_off:data_off + length]
+            seq2 = struct.unpack_from("<Q", mm, 8)[0]
+            if seq1 != seq2 or zlib.crc32(payload) != crc:
+                continue
+            self._decode(payload)
+            self._version, self._published_at = version, published_at
+            return self._version, self._published_at, self._feeds
+        # Writer kept us busy; serve the previous version if we have one.
+        if self._feeds is not None:
+            return self._version, self._published_at, self._feeds
+        return None
+
+    def _decode(self, payload: bytes) -> None:
+        (head_len,) = _INDEX_LEN.unpack_from(payload, 0)
+        base = _INDEX_LEN.size + head_len
+        previous = self._feeds or {}
+        feeds, crcs = {}, {}
+        for name, (offset, length, crc) in json.loads(payload[_INDEX_LEN.size:base]).items():
+            if name in previous and self._crcs.get(name) == crc:
+                feeds[name] = previous[name]
+            else:
+                feed = json.loads(payload[base + offset:base + offset + length])
+                feeds[name] = SnapshotRows(feed) if isinstance(feed, list) else feed
+            crcs[name] = crc
+        self._feeds, self._crcs = feeds, crcs
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
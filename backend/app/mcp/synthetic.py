@@ -0,0 +1,429 @@
+"""Synthetic Data Generator — seeded, scenario-driven national hazard feeds.
+
+Replaces the fixed mock lists. A :class:`SyntheticWorld` places river
+stations, road sections and landslide areas around Japan from a seed, and
+a :class:`Scenario` (typhoon track, rainfall front, calm) drives a
+rainfall field over time. Every feed is derived from that one field, so
+at a given instant rivers rise, slopes saturate and roads close in the
+same places, and the same seed, scenario and time always give the same
+data (at ``step_minutes`` resolution).
+
+Feeds are generators (:meth:`SyntheticWorld.iter_rivers` …) so large
+worlds can be streamed without building lists. :meth:`SyntheticWorld.rows`
+and :meth:`SyntheticWorld.feeds` keep the rows of the latest step per
+layer, so repeated fallback calls within a step do not regenerate them.
+The world backs the provider fallback (see ``mock_data``), the
+benchmarks and replay tests.
+
+The fallback world is configured from the environment:
+  - ``INFRASCOPE_SYNTHETIC_SEED``      (default 0)
+  - ``INFRASCOPE_SYNTHETIC_SCENARIO``  (``typhoon`` | ``front`` | ``calm``)
+  - ``INFRASCOPE_SYNTHETIC_SIZE``      (total sites, default 0 = curated sites only)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+JST = timezone(timedelta(hours=9))
+
+# Scenario clocks start here, so a given wall-clock time maps to the same
+# scenario hour in every process.
+EPOCH = datetime(2024, 1, 1, tzinfo=JST)
+
+_KM_PER_DEG = 111.32
+_RIVER_LAG_H = 3.0
+_SOIL_WINDOW_H = (0.0, 2.0, 4.0)
+_MAX_CLOSURE_LOOKBACK_H = 48
+
+
+# =====================================================================
+# Scenarios
+# =====================================================================
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    kind: str  # typhoon | front | calm
+    duration_h: float = 48.0
+    track: tuple[tuple[float, float], ...] = ()  # typhoon centre waypoints (lat, lon)
+    radius_km: float = 250.0
+    peak: float = 1.0
+    background: float = 0.05
+
+    def rain(self, lat: float, lon: float, hour: float) -> float:
+        """Return rainfall intensity in [0, 1] at a point and scenario hour."""
+        hour %= self.duration_h
+        if self.kind == "typhoon":
+            c_lat, c_lon = self.centre(hour)
+            dy = (lat - c_lat) * _KM_PER_DEG
+            dx = (lon - c_lon) * _KM_PER_DEG * math.cos(math.radians(c_lat))
+            d2 = (dx * dx + dy * dy) / (self.radius_km * self.radius_km)
+            value = self.background + self.peak * math.exp(-d2)
+        elif self.kind == "front":
+            # A wavy east-west band drifting north, with moving rain cells.
+            frac = hour / self.duration_h
+            band = 31.5 + 6.0 * frac + math.sin(lon * 0.9 + hour * 0.3)
+            cells = 0.7 + 0.3 * math.sin(lon * 2.3 - hour * 0.5)
+            value = self.background + self.peak * cells * math.exp(-(((lat - band) / 1.2) ** 2))
+        else:
+            value = self.background + 0.1 * (1.0 + math.sin(lat + lon + hour * 0.2))
+        return min(max(value, 0.0), 1.0)
+
+    def centre(self, hour: float) -> tuple[float, float]:
+        """Return the typhoon centre at ``hour`` (linear between waypoints)."""
+        if len(self.track) < 2:
+            return self.track[0] if self.track else (0.0, 0.0)
+        pos = (hour % self.duration_h) / self.duration_h * (len(self.track) - 1)
+        i = min(int(pos), len(self.track) - 2)
+        t = pos - i
+        (lat0, lon0), (lat1, lon1) = self.track[i], self.track[i + 1]
+        return lat0 + (lat1 - lat0) * t, lon0 + (lon1 - lon0) * t
+
+
+SCENARIOS: dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        # Okinawa → Kyushu → along Honshu → off Sanriku.
+        Scenario(
+            "typhoon", "typhoon", duration_h=48.0,
+            track=((24.5, 127.5), (31.0, 130.5), (34.5, 135.5), (36.5, 140.5), (41.0, 143.0)),
+        ),
+        Scenario("front", "front", duration_h=72.0, peak=0.95),
+        Scenario("calm", "calm", duration_h=24.0),
+    )
+}
+
+
+def get_scenario(name: str) -> Scenario:
+    """Look up a scenario; raises ValueError if it is not defined."""
+    try:
+        return SCENARIOS[name]
+    except KeyError:
+        raise ValueError(f"Unknown scenario '{name}', expected one of {tuple(SCENARIOS)}") from None
+
+
+# =====================================================================
+# Deterministic noise
+# =====================================================================
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(x: int) -> int:
+    """splitmix64 finaliser."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def _unit(seed: int, index: int, step: int) -> float:
+    """Return a reproducible value in [0, 1) for (seed, site, time step)."""
+    return (_mix(_mix(_mix(seed) ^ index) ^ step) >> 11) / float(1 << 53)
+
+
+# =====================================================================
+# Sites
+# =====================================================================
+
+# Hand-picked sites from the original mock feeds; they always come first.
+_RIVER_STATIONS = [
+    ("R001", "荒川 岩淵水門", "荒川", 35.7830, 139.7280, 4.0, 7.0),
+    ("R002", "多摩川 田園調布", "多摩川", 35.5900, 139.6680, 5.0, 8.5),
+    ("R003", "利根川 栗橋", "利根川", 36.1310, 139.7020, 6.0, 9.0),
+    ("R004", "江戸川 野田", "江戸川", 35.9560, 139.8740, 4.5, 7.5),
+    ("R005", "鶴見川 亀の甲橋", "鶴見川", 35.5100, 139.6440, 3.5, 5.5),
+    ("R006", "淀川 枚方", "淀川", 34.8140, 135.6530, 5.5, 8.0),
+    ("R007", "信濃川 大河津", "信濃川", 37.6400, 138.8200, 6.5, 10.0),
+    ("R008", "筑後川 瀬ノ下", "筑後川", 33.2800, 130.5200, 5.0, 8.0),
+]
+
+_ROAD_SECTIONS = [
+    ("RD001", "国道16号", "八王子〜相模原", 35.6320, 139.3380, "土砂崩れ"),
+    ("RD002", "国道246号", "厚木〜秦野", 35.3960, 139.2770, "冠水"),
+    ("RD003", "首都高速5号線", "板橋〜戸田", 35.7920, 139.6810, "路面凍結"),
+    ("RD004", "国道1号", "箱根峠付近", 35.2000, 139.0200, "土砂崩れ"),
+    ("RD005", "名神高速", "関ヶ原〜米原", 35.3700, 136.4600, "積雪"),
+]
+
+_LANDSLIDE_AREAS = [
+    ("LS001", "箱根町強羅地区", "神奈川県", 35.2470, 139.0590, 0.7),
+    ("LS002", "伊豆大島北部", "東京都", 34.7840, 139.3530, 0.6),
+    ("LS003", "奥多摩町日原地区", "東京都", 35.8530, 139.0200, 0.5),
+    ("LS004", "広島市安佐北区", "広島県", 34.5100, 132.4800, 0.8),
+    ("LS005", "熊本県南阿蘇村", "熊本県", 32.8800, 131.0500, 0.75),
+    ("LS006", "奈良県十津川村", "奈良県", 34.0600, 135.7200, 0.65),
+]
+
+# Regions generated sites are scattered around: (lat, lon, prefecture, place)
+_REGIONS = [
+    (43.06, 141.35, "北海道", "札幌"), (39.70, 141.15, "岩手県", "盛岡"),
+    (38.27, 140.87, "宮城県", "仙台"), (37.90, 139.02, "新潟県", "新潟"),
+    (36.39, 139.06, "群馬県", "前橋"), (35.69, 139.69, "東京都", "東京"),
+    (35.45, 139.64, "神奈川県", "横浜"), (36.65, 138.18, "長野県", "長野"),
+    (34.98, 138.38, "静岡県", "静岡"), (35.18, 136.91, "愛知県", "名古屋"),
+    (36.59, 136.63, "石川県", "金沢"), (35.01, 135.77, "京都府", "京都"),
+    (34.69, 135.50, "大阪府", "大阪"), (34.69, 135.19, "兵庫県", "神戸"),
+    (35.47, 133.05, "島根県", "松江"), (34.39, 132.46, "広島県", "広島"),
+    (34.34, 134.04, "香川県", "高松"), (33.56, 133.53, "高知県", "高知"),
+    (33.59, 130.40, "福岡県", "福岡"), (32.80, 130.71, "熊本県", "熊本"),
+    (31.60, 130.56, "鹿児島県", "鹿児島"), (26.21, 127.68, "沖縄県", "那覇"),
+]
+_REGION_SPREAD_DEG = 0.35
+
+_RIVER_NAMES = (
+    "石狩川", "北上川", "最上川", "阿賀野川", "信濃川", "利根川", "荒川", "多摩川",
+    "天竜川", "木曽川", "淀川", "紀の川", "吉野川", "四万十川", "太田川", "筑後川",
+)
+# Rain-driven causes close roads when the rain field crosses the site's
+# trigger; the others are standing incidents independent of the scenario.
+_RAIN_CAUSES = ("土砂崩れ", "冠水")
+_ROAD_CAUSES = ("土砂崩れ", "土砂崩れ", "冠水", "冠水", "路面凍結", "積雪")
+
+
+def _scatter(rng: random.Random) -> tuple[float, float, str, str]:
+    lat, lon, prefecture, place = rng.choice(_REGIONS)
+    return (
+        round(lat + rng.gauss(0.0, _REGION_SPREAD_DEG), 4),
+        round(lon + rng.gauss(0.0, _REGION_SPREAD_DEG), 4),
+        prefecture,
+        place,
+    )
+
+
+def _river_sites(n: int, rng: random.Random) -> list[tuple]:
+    sites = list(_RIVER_STATIONS[:n])
+    for i in range(len(sites), n):
+        lat, lon, _, place = _scatter(rng)
+        river = rng.choice(_RIVER_NAMES)
+        warning = round(rng.uniform(3.0, 7.0), 1)
+        danger = round(warning * rng.uniform(1.4, 1.8), 1)
+        sites.append((f"R{i + 1:03d}", f"{river} {place}観測所{i + 1}", river, lat, lon, warning, danger))
+    return sites
+
+
+def _road_sites(n: int, rng: random.Random) -> list[tuple]:
+    sites = list(_ROAD_SECTIONS[:n])
+    for i in range(len(sites), n):
+        lat, lon, _, place = _scatter(rng)
+        sites.append((
+            f"RD{i + 1:03d}", f"国道{rng.randint(1, 500)}号", f"{place}付近", lat, lon,
+            rng.choice(_ROAD_CAUSES),
+        ))
+    return sites
+
+
+def _landslide_sites(n: int, rng: random.Random) -> list[tuple]:
+    sites = list(_LANDSLIDE_AREAS[:n])
+    for i in range(len(sites), n):
+        lat, lon, prefecture, place = _scatter(rng)
+        sites.append((
+            f"LS{i + 1:03d}", f"{place} 警戒区域{i + 1}", prefecture, lat, lon,
+            round(rng.uniform(0.3, 0.85), 2),
+        ))
+    return sites
+
+
+# =====================================================================
+# World
+# =====================================================================
+
+class SyntheticWorld:
+    """A seeded set of sites whose readings follow a scenario over time.
+
+    Site counts default to the curated sets; larger counts add generated
+    sites after them. ``at`` arguments default to now and are snapped to
+    ``step_minutes``, so calls within one step return identical data.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        scenario: str | Scenario = "typhoon",
+        rivers: int | None = None,
+        roads: int | None = None,
+        landslides: int | None = None,
+        step_minutes: int = 10,
+    ):
+        self.seed = seed
+        self.scenario = get_scenario(scenario) if isinstance(scenario, str) else scenario
+        self.step_minutes = step_minutes
+        # Separate streams so growing one layer does not move the others.
+        self._rivers = _river_sites(
+            len(_RIVER_STATIONS) if rivers is None else rivers, random.Random(f"{seed}:rivers"),
+        )
+        self._roads = _road_sites(
+            len(_ROAD_SECTIONS) if roads is None else roads, random.Random(f"{seed}:roads"),
+        )
+        self._landslides = _landslide_sites(
+            len(_LANDSLIDE_AREAS) if landslides is None else landslides,
+            random.Random(f"{seed}:landslides"),
+        )
+        # layer -> (step, rows) for the most recent step asked for.
+        self._memo: dict[str, tuple[int, list[dict]]] = {}
+
+    @classmethod
+    def with_size(cls, hazards: int, seed: int = 0, scenario: str | Scenario = "typhoon"):
+        """Build a world with ``hazards`` sites: 40% rivers, 40% landslides, 20% roads."""
+        rivers = int(hazards * 0.4)
+        landslides = int(hazards * 0.4)
+        return cls(seed, scenario, rivers, hazards - rivers - landslides, landslides)
+
+    def sizes(self) -> dict[str, int]:
+        return {
+            "rivers": len(self._rivers),
+            "roads": len(self._roads),
+            "landslides": len(self._landslides),
+        }
+
+    def _clock(self, at: datetime | None) -> tuple[datetime, int, float]:
+        """Return (snapped time, step number, scenario hour) for ``at``."""
+        at = at or datetime.now(tz=JST)
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=JST)
+        step = int((at - EPOCH).total_seconds() // (self.step_minutes * 60))
+        snapped = EPOCH + timedelta(minutes=step * self.step_minutes)
+        hour = (step * self.step_minutes / 60.0) % self.scenario.duration_h
+        return snapped.astimezone(JST), step, hour
+
+    # -- feeds --------------------------------------------------------
+
+    def iter_rivers(self, at: datetime | None = None) -> Iterator[dict]:
+        """Yield river gauge readings; levels follow rain with a lag."""
+        now, step, hour = self._clock(at)
+        observed = now.isoformat()
+        rain = self.scenario.rain
+        for i, (sid, name, river, lat, lon, warning, danger) in enumerate(self._rivers):
+            wet = rain(lat, lon, hour - _RIVER_LAG_H)
+            jitter = _unit(self.seed, i, step) - 0.5
+            level = round(max(warning * (0.3 + 1.3 * wet + 0.1 * jitter), 0.0), 2)
+            if level >= danger:
+                status = "danger"
+            elif level >= warning:
+                status = "warning"
+            else:
+                status = "normal"
+            yield {
+                "station_id": sid,
+                "name": name,
+                "river": river,
+                "lat": lat,
+                "lon": lon,
+                "water_level_m": level,
+                "warning_level_m": warning,
+                "danger_level_m": danger,
+                "status": status,
+                "observed_at": observed,
+            }
+
+    def iter_landslides(self, at: datetime | None = None) -> Iterator[dict]:
+        """Yield landslide areas; risk follows rain accumulated over recent hours."""
+        now, step, hour = self._clock(at)
+        observed = now.isoformat()
+        rain = self.scenario.rain
+        salt = 1 << 40
+        for i, (aid, name, prefecture, lat, lon, base) in enumerate(self._landslides):
+            soaked = sum(rain(lat, lon, hour - h) for h in _SOIL_WINDOW_H) / len(_SOIL_WINDOW_H)
+            jitter = _unit(self.seed, salt + i, step) - 0.5
+            risk = round(min(max(base * (0.5 + soaked) + 0.05 * jitter, 0.0), 1.0), 2)
+            if risk >= 0.8:
+                level = "very_high"
+            elif risk >= 0.6:
+                level = "high"
+            elif risk >= 0.4:
+                level = "moderate"
+            else:
+                level = "low"
+            yield {
+                "area_id": aid,
+                "name": name,
+                "prefecture": prefecture,
+                "lat": lat,
+                "lon": lon,
+                "risk_score": risk,
+                "warning_level": level,
+                "observed_at": observed,
+            }
+
+    def iter_roads(self, at: datetime | None = None) -> Iterator[dict]:
+        """Yield active road closures.
+
+        Rain-driven sections close while rain at the site is above their
+        trigger, and ``since`` is when it crossed it. Standing incidents
+        (snow, ice) are always listed, since the start of the cycle.
+        """
+        now, _, hour = self._clock(at)
+        updated = now.isoformat()
+        cycle_start = (now - timedelta(hours=hour)).isoformat()
+        rain = self.scenario.rain
+        salt = 2 << 40
+        for i, (rid, road, section, lat, lon, cause) in enumerate(self._roads):
+            pick = _unit(self.seed, salt + i, 0)
+            if cause not in _RAIN_CAUSES:
+                yield {
+                    "road_id": rid, "road_name": road, "section": section,
+                    "lat": lat, "lon": lon, "cause": cause,
+                    "status": "closed" if pick < 0.5 else "restricted",
+                    "since": cycle_start, "updated_at": updated,
+                }
+                continue
+            trigger = 0.35 + 0.35 * pick
+            wet = rain(lat, lon, hour)
+            if wet < trigger:
+                continue
+            back = 1
+            while back < _MAX_CLOSURE_LOOKBACK_H and rain(lat, lon, hour - back) >= trigger:
+                back += 1
+            yield {
+                "road_id": rid, "road_name": road, "section": section,
+                "lat": lat, "lon": lon, "cause": cause,
+                "status": "closed" if wet >= trigger + 0.2 else "restricted",
+                "since": (now - timedelta(hours=back)).isoformat(), "updated_at": updated,
+            }
+
+    def rows(self, layer: str, at: datetime | None = None) -> list[dict]:
+        """Return one layer's rows at ``at``, memoised for the latest step.
+
+        The list is a fresh copy but the row dicts are shared between
+        calls in the same step, so callers must not modify them.
+        """
+        step = self._clock(at)[1]
+        hit = self._memo.get(layer)
+        if hit is None or hit[0] != step:
+            generate = getattr(self, f"iter_{layer}", None)
+            if generate is None:
+                raise ValueError(f"unknown synthetic layer {layer!r}")
+            hit = self._memo[layer] = (step, list(generate(at)))
+        return list(hit[1])
+
+    def feeds(self, at: datetime | None = None) -> dict[str, list[dict]]:
+        """Return every feed for one instant, shaped like a shared snapshot."""
+        return {
+            "rivers": self.rows("rivers", at),
+            "landslides": self.rows("landslides", at),
+            "roads": self.rows("roads", at),
+            "warnings": [],
+        }
+
+
+_default_world: SyntheticWorld | None = None
+
+
+def default_world() -> SyntheticWorld:
+    """Return the process-wide fallback world, configured from the environment."""
+    global _default_world
+    if _default_world is None:
+        seed = int(os.environ.get("INFRASCOPE_SYNTHETIC_SEED", "0"))
+        scenario = os.environ.get("INFRASCOPE_SYNTHETIC_SCENARIO", "typhoon")
+        size = int(os.environ.get("INFRASCOPE_SYNTHETIC_SIZE", "0"))
+        if size > 0:
+            _default_world = SyntheticWorld.with_size(size, seed, scenario)
+        else:
+            _default_world = SyntheticWorld(seed, scenario)
+    return _default_world
@@ -0,0 +1,340 @@
+"""Prometheus metrics — counters, histograms and hot-path timers.
+
+A deliberately small, dependency-free implementation of the Prometheus
+text exposition format (0.0.4), served at ``/metrics``.
+
+Instrumenting the hot path must be close to free, so label children are
+bound once at import time and :meth:`Histogram.time` returns a shared
+no-op context manager while metrics are disabled. Disable with
+``INFRASCOPE_METRICS=0`` or :func:`set_enabled`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import os
+import time
+from typing import Any, Callable, Iterable
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_enabled = os.environ.get("INFRASCOPE_METRICS", "1") != "0"
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn recording on or off at runtime."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        REGISTRY.append(self)
+
+    def labels(self, *values: str):
+        """Return the child for these label values (bind once, reuse)."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Counter
+# ---------------------------------------------------------------------------
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if _enabled:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}_total{_label_str(self.labelnames, key)} {_fmt(child.value)}"
+            for key, child in self._children.items()
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Gauge (callback-based)
+# ---------------------------------------------------------------------------
+
+class Gauge(_Metric):
+    """Gauge whose samples are produced by a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        callback: Callable[[], dict[tuple[str, ...], float]] | None = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _samples(self) -> list[str]:
+        if self.callback is None:
+            return []
+        return [
+            f"{self.name}{_label_str(self.labelnames, key)} {_fmt(value)}"
+            for key, value in self.callback().items()
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Histogram
+# ---------------------------------------------------------------------------
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: "_HistogramChild"):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+class _HistogramChild:
+    __slots__ = ("upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        if not _enabled:
+            return
+        self.counts[bisect.bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self):
+        """Context manager that observes the elapsed wall time in seconds."""
+        return _Timer(self) if _enabled else _NULL_TIMER
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = f'le="{_fmt(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_label_str(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _label_str(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_fmt(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+def timed(child: _HistogramChild) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator observing each call's duration into a histogram child."""
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render() -> str:
+    """Return every registered metric in Prometheus text format."""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+# =====================================================================
+# InfraScope metrics
+# =====================================================================
+
+UPSTREAM_FETCH_SECONDS = Histogram(
+    "infrascope_upstream_fetch_seconds", "Upstream HTTP fetch latency.", ["feed"],
+)
+UPSTREAM_PARSE_SECONDS = Histogram(
+    "infrascope_upstream_parse_seconds", "Time to decode and normalise an upstream payload.",
+    ["feed"],
+)
+UPSTREAM_BYTES = Counter(
+    "infrascope_upstream_bytes", "Bytes received from upstream feeds.", ["feed"],
+)
+FEED_FALLBACKS = Counter(
+    "infrascope_feed_fallbacks",
+    "Times a feed was served from last good or mock data instead of upstream.",
+    ["feed", "reason"],
+)
+RISK_SCORE_SECONDS = Histogram(
+    "infrascope_risk_score_seconds", "Risk scoring compute time.", ["kind"],
+)
+SUMMARY_BUILD_SECONDS = Histogram(
+    "infrascope_summary_build_seconds", "Situation summary build time.",
+)
+ALERT_EVALUATION_SECONDS = Histogram(
+    "infrascope_alert_evaluation_seconds", "Time to evaluate all subscriptions against a snapshot.",
+)
+ALERTS_EMITTED = Counter(
+    "infrascope_alerts", "Alerts emitted by kind.", ["kind"],
+)
+ALERTS_SUPPRESSED = Counter(
+    "infrascope_alerts_suppressed", "Alert changes held back by the per-subscription cooldown.",
+)
+ADMISSION_REJECTED = Counter(
+    "infrascope_admission_rejected", "Requests refused by admission control.", ["reason"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "infrascope_http_request_seconds", "HTTP request latency by route.",
+    ["method", "route", "status"],
+)
+HTTP_RESPONSE_BYTES = Counter(
+    "infrascope_http_response_bytes",
+    "Compressible response body bytes before (raw) and after (sent) compression.", ["stage"],
+)
+HTTP_NOT_MODIFIED = Counter(
+    "infrascope_http_not_modified", "Revalidations answered with 304 Not Modified.",
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "other"
+            HTTP_REQUEST_SECONDS.labels(scope["method"], path, str(status)).observe(
+                time.perf_counter() - start,
+            )
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+from typing import Any
+
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter
 
 
 class RiverWaterLevel(BaseModel):
@@ -61,9 +63,93 @@ class RiskScore(BaseModel):
     landslide_risk: float
     level: str  # low | moderate | high | critical
     contributing_factors: list[str]
+    profile: str = "default"
+    as_of: str | None = None  # snapshot time, for ``at=`` queries
+
+
+class RouteRiskRequest(BaseModel):
+    geometry: dict[str, Any] | None = None  # GeoJSON LineString or Feature
+    polyline: str | None = None  # encoded polyline, precision 5
+    step_km: float = Field(1.0, gt=0, le=50)
+    buffer_km: float = Field(1.0, ge=0, le=50)
+    profile: str | None = None
+
+
+class RouteSegmentRisk(BaseModel):
+    index: int
+    start: list[float]  # [lat, lon]
+    end: list[float]  # [lat, lon]
+    length_km: float
+    overall_score: float
+    river_risk: float
+    road_risk: float
+    landslide_risk: float
+    level: str  # low | moderate | high | critical
+
+
+class RouteRisk(BaseModel):
+    distance_km: float
+    step_km: float
+    sample_count: int
+    max_score: float
+    mean_score: float
+    level: str  # low | moderate | high | critical
+    segments: list[RouteSegmentRisk]
+    road_closures: list[RoadClosure]
+    profile: str = "default"
+
+
+class SubscriptionRequest(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+    radius_km: float = Field(0.0, ge=0, le=100)  # 0 = the point only
+    level: str = "high"  # moderate | high | critical
+    profile: str = "default"
+    webhook_url: HttpUrl | None = None  # host must be in INFRASCOPE_ALERT_WEBHOOK_HOSTS
+
+
+class Subscription(SubscriptionRequest):
+    id: str
+    created_at: float
 
 
 class SituationSummary(BaseModel):
     summary: str
     generated_at: str
     data_snapshot: dict
+    as_of: str | None = None  # snapshot time, for ``at=`` queries
+
+
+class HealthStatus(BaseModel):
+    status: str  # ok | degraded
+    upstream: dict[str, dict]
+    shared_snapshot: dict | None
+    executor: dict
+    admission: dict
+    replay: dict | None = None
+
+
+# Snapshot feed name → row schema of the route serving it
+FEED_SCHEMAS: dict[str, type[BaseModel]] = {
+    "rivers": RiverWaterLevel,
+    "roads": RoadClosure,
+    "landslides": LandslideWarning,
+    "warnings": JmaWarning,
+}
+
+_FEED_ADAPTERS = {name: TypeAdapter(list[model]) for name, model in FEED_SCHEMAS.items()}
+
+
+def validate_feeds(feeds: dict[str, Any]) -> dict[str, Any]:
+    """Validate each feed against its row schema and return schema-exact plain rows.
+
+    Run once at ingestion, so API workers can serve snapshot rows without
+    validating them on every request. Raises ``pydantic.ValidationError``.
+    """
+    out = {}
+    for name, rows in feeds.items():
+        adapter = _FEED_ADAPTERS.get(name)
+        out[name] = rows if adapter is None else adapter.dump_python(
+            adapter.validate_python(rows), mode="json",
+        )
+    return out
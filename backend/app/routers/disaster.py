@@ -2,74 +2,209 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+from dataclasses import asdict
+from datetime import datetime
 
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from backend.app import formats
+from backend.app.admission import admission_stats, admit
+from backend.app.http_cache import cache_headers
 from backend.app.mcp.data_provider import (
     get_jma_warnings_async,
     get_landslide_warnings_async,
     get_river_water_levels_async,
     get_road_closures,
+    replay_status,
+    shared_snapshot_status,
+    upstream_health,
 )
 from backend.app.models.schemas import (
+    HealthStatus,
     JmaWarning,
     LandslideWarning,
     RiskScore,
     RiverWaterLevel,
     RoadClosure,
+    RouteRisk,
+    RouteRiskRequest,
     SituationSummary,
+    Subscription,
+    SubscriptionRequest,
 )
+from backend.app.services import alerting
+from backend.app.services.executor import bind_request, get_executor
 from backend.app.services.risk_scoring import compute_risk_async
+from backend.app.services.route_risk import score_route_async
+from backend.app.services.scoring_profiles import list_profiles
 from backend.app.services.situation_summary import generate_summary_async
+from backend.app.tracing import TracedRoute
+
+router = APIRouter(prefix="/api", tags=["disaster"], route_class=TracedRoute)
 
-router = APIRouter(prefix="/api", tags=["disaster"])
+_AT_DESCRIPTION = (
+    "Use the feeds as published at this time (ISO 8601, JST if no offset); "
+    "needs the snapshot history"
+)
 
 
-@router.get("/rivers", response_model=list[RiverWaterLevel])
-async def list_river_levels():
+@router.get("/rivers", response_model=list[RiverWaterLevel], responses=formats.ROW_RESPONSES)
+async def list_river_levels(request: Request, response: Response):
     """Return current river water level / flood warning data.
 
     Data source: JMA flood warnings API (fallback: mock data).
     """
-    return await get_river_water_levels_async()
+    data = await get_river_water_levels_async()
+    cache_headers(response, data, "observed_at")
+    return formats.respond(request, response, data, list[RiverWaterLevel])
 
 
-@router.get("/roads", response_model=list[RoadClosure])
-def list_road_closures():
+@router.get("/roads", response_model=list[RoadClosure], responses=formats.ROW_RESPONSES)
+def list_road_closures(request: Request, response: Response):
     """Return current road closure / restriction information.
 
     Data source: Mock data (no public API available).
     """
-    return get_road_closures()
+    data = get_road_closures()
+    cache_headers(response, data, "updated_at")
+    return formats.respond(request, response, data, list[RoadClosure])
 
 
-@router.get("/landslides", response_model=list[LandslideWarning])
-async def list_landslide_warnings():
+@router.get("/landslides", response_model=list[LandslideWarning], responses=formats.ROW_RESPONSES)
+async def list_landslide_warnings(request: Request, response: Response):
     """Return current landslide warning areas.
 
     Data source: JMA sediment warnings API (fallback: mock data).
     """
-    return await get_landslide_warnings_async()
+    data = await get_landslide_warnings_async()
+    cache_headers(response, data, "observed_at")
+    return formats.respond(request, response, data, list[LandslideWarning])
 
 
-@router.get("/warnings", response_model=list[JmaWarning])
-async def list_jma_warnings():
+@router.get("/warnings", response_model=list[JmaWarning], responses=formats.ROW_RESPONSES)
+async def list_jma_warnings(request: Request, response: Response):
     """Return current JMA weather warnings.
 
     Data source: JMA weather warnings API.
     """
-    return await get_jma_warnings_async()
+    data = await get_jma_warnings_async()
+    cache_headers(response)
+    return formats.respond(request, response, data, list[JmaWarning])
 
 
-@router.get("/risk", response_model=RiskScore)
+@router.get(
+    "/risk", response_model=RiskScore, responses=formats.OBJECT_RESPONSES,
+    dependencies=[Depends(admit()), Depends(bind_request)],
+)
 async def get_risk_score(
+    request: Request,
+    response: Response,
     lat: float = Query(..., description="Latitude", ge=-90, le=90),
     lon: float = Query(..., description="Longitude", ge=-180, le=180),
+    profile: str | None = Query(None, description="Scoring profile name"),
+    at: datetime | None = Query(None, description=_AT_DESCRIPTION),
+):
+    """Compute a location-based risk score, now or at a past time."""
+    cache_headers(response)
+    try:
+        result = await compute_risk_async(lat, lon, profile, at)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from None
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    return formats.respond(request, response, result, RiskScore)
+
+
+@router.post(
+    "/risk/route", response_model=RouteRisk, responses=formats.ROW_RESPONSES,
+    dependencies=[Depends(admit(cost=4.0)), Depends(bind_request)],
+)
+async def get_route_risk(body: RouteRiskRequest, request: Request, response: Response):
+    """Compute risk along a route given as GeoJSON or an encoded polyline.
+
+    As Arrow, the body is the segment table; the other fields are JSON in
+    the schema metadata under ``meta``.
+    """
+    try:
+        result = await score_route_async(
+            geometry=body.geometry,
+            polyline=body.polyline,
+            step_km=body.step_km,
+            buffer_km=body.buffer_km,
+            profile=body.profile,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    return formats.respond(request, response, result, RouteRisk, table="segments")
+
+
+@router.get("/risk/profiles", response_model=list[str])
+def list_scoring_profiles(response: Response):
+    """Return the names of the available scoring profiles."""
+    cache_headers(response)
+    return list_profiles()
+
+
+@router.post("/subscriptions", response_model=Subscription, status_code=201)
+def create_subscription(body: SubscriptionRequest):
+    """Register a location or area to be alerted about when its risk reaches ``level``."""
+    try:
+        sub = alerting.get_engine().add(alerting.Subscription(**body.model_dump(mode="json")))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    return asdict(sub)
+
+
+@router.get("/subscriptions/{sub_id}", response_model=Subscription)
+def get_subscription(sub_id: str):
+    """Return a registered subscription."""
+    sub = alerting.get_engine().get(sub_id)
+    if sub is None:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return asdict(sub)
+
+
+@router.delete("/subscriptions/{sub_id}", status_code=204)
+def delete_subscription(sub_id: str):
+    """Remove a subscription."""
+    if not alerting.get_engine().remove(sub_id):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+
+
+@router.get(
+    "/summary", response_model=SituationSummary,
+    dependencies=[Depends(admit(cost=2.0)), Depends(bind_request)],
+)
+async def get_situation_summary(
+    response: Response,
+    at: datetime | None = Query(None, description=_AT_DESCRIPTION),
 ):
-    """Compute a location-based risk score."""
-    return await compute_risk_async(lat, lon)
+    """Generate an AI-powered situation summary, now or at a past time."""
+    cache_headers(response)
+    try:
+        return await generate_summary_async(at)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from None
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
 
 
-@router.get("/summary", response_model=SituationSummary)
-async def get_situation_summary():
-    """Generate an AI-powered situation summary."""
-    return await generate_summary_async()
+@router.get("/health", response_model=HealthStatus)
+def get_health():
+    """Return upstream circuit breaker state, shared snapshot, executor and admission load.
+
+    ``replay`` is the recording position when serving a replay, else ``None``.
+
+    ``degraded`` means at least one upstream circuit is not closed, so some
+    feeds are being served from last good or mock data.
+    """
+    upstream = upstream_health()
+    degraded = any(b["state"] != "closed" for b in upstream.values())
+    return {
+        "status": "degraded" if degraded else "ok",
+        "upstream": upstream,
+        "shared_snapshot": shared_snapshot_status(),
+        "executor": get_executor().stats(),
+        "admission": admission_stats(),
+        "replay": replay_status(),
+    }
@@ -0,0 +1,527 @@
+"""Alerting Engine — push notifications when risk at subscribed sites crosses a level.
+
+Clients register a :class:`Subscription` (a point, or a disc of
+``radius_km`` around it, a minimum level and a scoring profile). On each
+new feed snapshot :meth:`AlertEngine.process` scores every subscription
+in one pass: subscriptions are bucketed on a lat/lon grid per profile
+and radius band, and each hazard only visits the buckets within its
+reach, so the cost follows (hazards x nearby subscriptions) rather than
+(hazards x all subscriptions). A point subscription scores exactly like ``/api/risk``;
+an area subscription takes each hazard's distance to the nearest point
+of the disc.
+
+Alerts are deduplicated per subscription: one when the level reaches the
+threshold, one per escalation, and one when it drops back below. At most
+one alert per subscription is sent every ``cooldown_s``; suppressed
+changes go out on the first snapshot after the cooldown if they still
+hold. Alerts go to every configured sink (:class:`WebhookSink`,
+:class:`QueueSink`, :class:`MemorySink` for tests).
+
+A subscription may name its own ``webhook_url`` only if the URL is http(s)
+and its host is listed in ``INFRASCOPE_ALERT_WEBHOOK_HOSTS`` (comma
+separated; empty, the default, allows none). Otherwise a client could
+make the server POST to localhost, internal hosts or cloud metadata
+addresses. Alerts without a URL go to the operator's
+``INFRASCOPE_ALERT_WEBHOOK``.
+
+Subscriptions live in memory. With ``INFRASCOPE_SUBSCRIPTIONS_PATH`` they
+are also appended to a JSON-lines log that every process reloads when it
+changes, so API workers can register them while the ingestor (or one
+process with ``INFRASCOPE_ALERT_INTERVAL`` set) evaluates them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import math
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Protocol
+from urllib.parse import urlsplit
+
+from backend.app import metrics
+from backend.app.services.risk_scoring import (
+    _KM_PER_DEG_LAT,
+    _landslide_severity,
+    _river_severity,
+    _road_severity,
+)
+from backend.app.services.scoring_profiles import get_profile
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ("low", "moderate", "high", "critical")
+_RANK = {level: i for i, level in enumerate(LEVELS)}
+
+DEFAULT_CELL_DEG = 0.1
+DEFAULT_COOLDOWN_S = 300.0
+MAX_AREA_RADIUS_KM = 100.0
+
+_EVAL_TIMER = metrics.ALERT_EVALUATION_SECONDS.labels()
+_EMITTED = {kind: metrics.ALERTS_EMITTED.labels(kind) for kind in ("triggered", "escalated", "resolved")}
+_SUPPRESSED = metrics.ALERTS_SUPPRESSED.labels()
+
+
+@dataclass
+class Subscription:
+    lat: float
+    lon: float
+    radius_km: float = 0.0
+    level: str = "high"  # minimum level that raises an alert
+    profile: str = "default"
+    webhook_url: str | None = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+
+
+_webhook_hosts: frozenset[str] = frozenset()
+
+
+def configure_webhook_hosts(hosts: str | list[str] | None) -> None:
+    """Set the hosts subscriptions may send webhooks to (comma-separated or a list)."""
+    global _webhook_hosts
+    if isinstance(hosts, str):
+        hosts = hosts.split(",")
+    _webhook_hosts = frozenset(h.strip().lower() for h in hosts or () if h.strip())
+
+
+def check_webhook_url(url: str) -> None:
+    """Raise ValueError unless ``url`` is http(s) on an allowlisted host."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("webhook_url must be an http(s) URL")
+    if parts.hostname.lower() not in _webhook_hosts:
+        raise ValueError(
+            f"webhook host '{parts.hostname}' is not allowed (see INFRASCOPE_ALERT_WEBHOOK_HOSTS)",
+        )
+
+
+configure_webhook_hosts(os.environ.get("INFRASCOPE_ALERT_WEBHOOK_HOSTS"))
+
+
+def validate_subscription(sub: Subscription) -> Subscription:
+    """Raise ValueError if ``sub`` cannot be evaluated."""
+    if sub.level not in LEVELS[1:]:
+        raise ValueError(f"Unknown alert level '{sub.level}', expected one of {LEVELS[1:]}")
+    if not (-90 <= sub.lat <= 90 and -180 <= sub.lon <= 180):
+        raise ValueError("Coordinates out of range")
+    if not 0 <= sub.radius_km <= MAX_AREA_RADIUS_KM:
+        raise ValueError(f"radius_km must be between 0 and {MAX_AREA_RADIUS_KM}")
+    get_profile(sub.profile)
+    if sub.webhook_url is not None:
+        check_webhook_url(sub.webhook_url)
+    return sub
+
+
+# =====================================================================
+# Spatial index over subscriptions
+# =====================================================================
+
+# Upper radius (km) of each band of area subscriptions. A hazard's search
+# window is its layer radius plus the largest radius in the band, so one
+# wide subscription only widens the window of its own band.
+RADIUS_BANDS = (0.0, 5.0, 20.0, 50.0, MAX_AREA_RADIUS_KM)
+
+
+class _ProfileGroup:
+    """Subscriptions sharing one profile, bucketed by radius band and grid cell."""
+
+    __slots__ = ("profile", "subs", "lats", "lons", "cos_lats", "radii", "bands")
+
+    def __init__(self, profile, subs: list[Subscription], cell_deg: float):
+        self.profile = profile
+        self.subs = subs
+        self.lats = [s.lat for s in subs]
+        self.lons = [s.lon for s in subs]
+        self.cos_lats = [math.cos(math.radians(s.lat)) for s in subs]
+        self.radii = [s.radius_km for s in subs]
+        # band index → (largest radius in the band, cell → subscription slots)
+        by_band: dict[int, tuple[float, dict[tuple[int, int], list[int]]]] = {}
+        for i, s in enumerate(subs):
+            band = bisect.bisect_left(RADIUS_BANDS, s.radius_km)
+            max_radius, cells = by_band.get(band, (0.0, {}))
+            key = (math.floor(s.lat / cell_deg), math.floor(s.lon / cell_deg))
+            cells.setdefault(key, []).append(i)
+            by_band[band] = (max(max_radius, s.radius_km), cells)
+        self.bands = list(by_band.values())
+
+    def layer_scores(
+        self, hazards: list[tuple[float, float, float]], radius: float, falloff, cell_deg: float,
+    ) -> dict[int, float]:
+        """Return the best falloff x severity per subscription slot for one layer."""
+        best: dict[int, float] = {}
+        # Strongest hazards first: a score never exceeds its severity, so
+        # once a subscription's best reaches it, weaker hazards are skipped
+        # before any trigonometry.
+        hazards = sorted((h for h in hazards if h[2] > 0), key=lambda h: -h[2])
+        for max_radius, cells in self.bands:
+            self._band_scores(best, cells, radius + max_radius, hazards, radius, falloff, cell_deg)
+        return best
+
+    def _band_scores(self, best, cells, reach, hazards, radius, falloff, cell_deg) -> None:
+        lats, lons, cos_lats, radii = self.lats, self.lons, self.cos_lats, self.radii
+        sin, sqrt, atan2, radians = math.sin, math.sqrt, math.atan2, math.radians
+        cell_km = cell_deg * _KM_PER_DEG_LAT
+        lat_cells = math.ceil(reach / cell_km)
+        # Haversine "a" at the reach: pairs at or beyond it cannot score.
+        a_max = sin(min(reach / 6371.0, math.pi) / 2) ** 2
+        for h_lat, h_lon, severity in hazards:
+            h_cos = math.cos(radians(h_lat))
+            edge_cos = max(math.cos(radians(min(abs(h_lat) + reach / _KM_PER_DEG_LAT, 89.0))), 0.01)
+            ci = math.floor(h_lat / cell_deg)
+            cj = math.floor(h_lon / cell_deg)
+            r_lat = radians(h_lat)
+            for i in range(ci - lat_cells, ci + lat_cells + 1):
+                # Only the cells of this row that can touch the reach circle.
+                dy = max(i - ci - 1, ci - i - 1, 0) * cell_km
+                if dy > reach:
+                    continue
+                half = sqrt(reach * reach - dy * dy)
+                lon_cells = math.ceil(half / (_KM_PER_DEG_LAT * edge_cos) / cell_deg)
+                for j in range(cj - lon_cells, cj + lon_cells + 1):
+                    bucket = cells.get((i, j))
+                    if bucket is None:
+                        continue
+                    for s in bucket:
+                        if best.get(s, 0.0) >= severity:
+                            continue
+                        # Same haversine as risk_scoring, hazard-centred.
+                        d_lat = radians(lats[s]) - r_lat
+                        d_lon = radians(lons[s] - h_lon)
+                        a = sin(d_lat / 2) ** 2 + h_cos * cos_lats[s] * sin(d_lon / 2) ** 2
+                        if a >= a_max:
+                            continue
+                        dist = 6371.0 * 2 * atan2(sqrt(a), sqrt(1 - a)) - radii[s]
+                        if dist >= radius:
+                            continue
+                        score = falloff(dist if dist > 0 else 0.0) * severity
+                        if score > best.get(s, 0.0):
+                            best[s] = score
+
+
+# =====================================================================
+# Sinks
+# =====================================================================
+
+class AlertSink(Protocol):
+    async def send(self, alerts: list[dict]) -> None: ...
+
+
+class MemorySink:
+    """Keeps every alert in a list (tests, debugging)."""
+
+    def __init__(self):
+        self.alerts: list[dict] = []
+
+    async def send(self, alerts: list[dict]) -> None:
+        self.alerts.extend(alerts)
+
+
+class QueueSink:
+    """Puts alerts on an asyncio queue; drops them when the queue is full."""
+
+    def __init__(self, maxsize: int = 10_000):
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    async def send(self, alerts: list[dict]) -> None:
+        for alert in alerts:
+            try:
+                self.queue.put_nowait(alert)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+
+class WebhookSink:
+    """POSTs ``{"alerts": [...]}`` batches to each subscription's webhook URL.
+
+    Alerts for subscriptions without a URL go to ``default_url`` (dropped if
+    unset). Subscription URLs are checked against the host allowlist again
+    at delivery, so entries logged before it changed are dropped. Failed
+    deliveries are logged and counted, not retried.
+    """
+
+    def __init__(
+        self,
+        default_url: str | None = None,
+        batch_size: int = 500,
+        concurrency: int = 8,
+        timeout: float = 5.0,
+    ):
+        self.default_url = default_url
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.failures = 0
+
+    async def send(self, alerts: list[dict]) -> None:
+        batches: dict[str, list[dict]] = {}
+        for alert in alerts:
+            url = alert.get("webhook_url")
+            if url:
+                try:
+                    check_webhook_url(url)
+                except ValueError:
+                    self.failures += 1
+                    logger.warning("Dropped alert for disallowed webhook %s", url)
+                    continue
+            url = url or self.default_url
+            if url:
+                body = {k: v for k, v in alert.items() if k != "webhook_url"}
+                batches.setdefault(url, []).append(body)
+        if not batches:
+            return
+        import httpx  # deferred until an alert is actually delivered
+
+        gate = asyncio.Semaphore(self.concurrency)
+
+        async def post(client: httpx.AsyncClient, url: str, chunk: list[dict]) -> None:
+            async with gate:
+                try:
+                    resp = await client.post(url, json={"alerts": chunk})
+                    resp.raise_for_status()
+                except Exception:
+                    self.failures += 1
+                    logger.warning("Alert webhook %s failed", url, exc_info=True)
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            await asyncio.gather(*(
+                post(client, url, items[i:i + self.batch_size])
+                for url, items in batches.items()
+                for i in range(0, len(items), self.batch_size)
+            ))
+
+
+# =====================================================================
+# Subscription log (multi-process registration)
+# =====================================================================
+
+class SubscriptionLog:
+    """Append-only JSON-lines log of subscription adds and removals."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._stamp = None  # (mtime, size) when last loaded
+
+    def append(self, sub: Subscription) -> None:
+        self._write({"op": "add", **asdict(sub)})
+
+    def remove(self, sub_id: str) -> None:
+        self._write({"op": "remove", "id": sub_id})
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def changed(self) -> bool:
+        # Size as well as mtime: two appends can land within one mtime tick.
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (st.st_mtime_ns, st.st_size) != self._stamp
+
+    def load(self) -> dict[str, Subscription]:
+        """Replay the log into the current set of subscriptions."""
+        subs: dict[str, Subscription] = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                st = os.fstat(f.fileno())
+                self._stamp = (st.st_mtime_ns, st.st_size)
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn line from a crashed writer
+                    if entry.pop("op") == "add":
+                        subs[entry["id"]] = Subscription(**entry)
+                    else:
+                        subs.pop(entry["id"], None)
+        except FileNotFoundError:
+            pass
+        return subs
+
+
+# =====================================================================
+# Engine
+# =====================================================================
+
+class AlertEngine:
+    """Holds subscriptions and turns feed snapshots into alerts."""
+
+    def __init__(
+        self,
+        sinks: list[AlertSink] | None = None,
+        cooldown_s: float = DEFAULT_COOLDOWN_S,
+        cell_deg: float = DEFAULT_CELL_DEG,
+        log: SubscriptionLog | None = None,
+        clock=time.time,
+    ):
+        self.sinks = list(sinks or [])
+        self.cooldown_s = cooldown_s
+        self.cell_deg = cell_deg
+        self.log = log
+        self._clock = clock
+        self._subs: dict[str, Subscription] = log.load() if log else {}
+        self._groups: list[_ProfileGroup] | None = None
+        # subscription id → (level rank last sent, sent at)
+        self._state: dict[str, tuple[int, float]] = {}
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._subs)
+
+    def add(self, sub: Subscription) -> Subscription:
+        validate_subscription(sub)
+        self._subs[sub.id] = sub
+        self._groups = None
+        if self.log:
+            self.log.append(sub)
+        return sub
+
+    def _refresh(self) -> None:
+        """Reload from the shared log if another process changed it."""
+        if self.log and self.log.changed():
+            self._subs = self.log.load()
+            self._groups = None
+
+    def get(self, sub_id: str) -> Subscription | None:
+        self._refresh()
+        return self._subs.get(sub_id)
+
+    def remove(self, sub_id: str) -> bool:
+        self._refresh()
+        if self._subs.pop(sub_id, None) is None:
+            return False
+        self._state.pop(sub_id, None)
+        self._groups = None
+        if self.log:
+            self.log.remove(sub_id)
+        return True
+
+    def _index(self) -> list[_ProfileGroup]:
+        self._refresh()
+        if self._groups is None:
+            by_profile: dict[str, list[Subscription]] = {}
+            for sub in list(self._subs.values()):
+                by_profile.setdefault(sub.profile, []).append(sub)
+            self._groups = [
+                _ProfileGroup(get_profile(name), subs, self.cell_deg)
+                for name, subs in by_profile.items()
+            ]
+        return self._groups
+
+    @metrics.timed(_EVAL_TIMER)
+    def evaluate(self, feeds: dict[str, list[dict]]) -> list[dict]:
+        """Score every subscription against ``feeds`` and return new alerts."""
+        layers = (
+            [(r["lat"], r["lon"], _river_severity(r)) for r in feeds.get("rivers", ())],
+            [(rd["lat"], rd["lon"], _road_severity(rd)) for rd in feeds.get("roads", ())],
+            [(ls["lat"], ls["lon"], _landslide_severity(ls)) for ls in feeds.get("landslides", ())],
+        )
+        now = self._clock()
+        at = datetime.fromtimestamp(now).astimezone().isoformat()
+        alerts: list[dict] = []
+        for group in self._index():
+            profile = group.profile
+            scores = [
+                group.layer_scores(hazards, radius, falloff, self.cell_deg)
+                for hazards, radius, falloff in zip(layers, profile.radii, profile.falloffs)
+            ]
+            w_river, w_road, w_landslide = profile.weights
+            river, road, landslide = scores
+            touched = river.keys() | road.keys() | landslide.keys()
+            for slot, sub in enumerate(group.subs):
+                last = self._state.get(sub.id)
+                if slot not in touched and last is None:
+                    continue  # the common case: quiet and nothing to resolve
+                r, rd, ls = river.get(slot, 0.0), road.get(slot, 0.0), landslide.get(slot, 0.0)
+                overall = min(round(r * w_river + rd * w_road + ls * w_landslide, 3), 1.0)
+                level = profile.level(overall)
+                rank = _RANK[level]
+                if rank >= _RANK[sub.level]:
+                    if last is not None and rank <= last[0]:
+                        continue
+                    kind = "triggered" if last is None else "escalated"
+                elif last is not None:
+                    kind = "resolved"
+                else:
+                    continue
+                if last is not None and now - last[1] < self.cooldown_s:
+                    _SUPPRESSED.inc()
+                    continue
+                if kind == "resolved":
+                    self._state.pop(sub.id, None)
+                else:
+                    self._state[sub.id] = (rank, now)
+                _EMITTED[kind].inc()
+                alerts.append({
+                    "subscription_id": sub.id,
+                    "kind": kind,
+                    "level": level,
+                    "previous_level": None if last is None else LEVELS[last[0]],
+                    "overall_score": overall,
+                    "river_risk": round(r, 3),
+                    "road_risk": round(rd, 3),
+                    "landslide_risk": round(ls, 3),
+                    "lat": sub.lat,
+                    "lon": sub.lon,
+                    "profile": profile.name,
+                    "at": at,
+                    "webhook_url": sub.webhook_url,
+                })
+        return alerts
+
+    async def process(self, feeds: dict[str, list[dict]]) -> list[dict]:
+        """Evaluate a snapshot off the event loop and deliver its alerts."""
+        if not self._subs and not (self.log and self.log.changed()):
+            return []
+        async with self._lock:
+            alerts = await asyncio.to_thread(self.evaluate, feeds)
+        if alerts:
+            await asyncio.gather(*(sink.send(alerts) for sink in self.sinks))
+        return alerts
+
+
+_engine: AlertEngine | None = None
+
+
+def get_engine() -> AlertEngine:
+    """Return the process-wide engine, configured from the environment."""
+    global _engine
+    if _engine is None:
+        path = os.environ.get("INFRASCOPE_SUBSCRIPTIONS_PATH")
+        _engine = AlertEngine(
+            sinks=[WebhookSink(os.environ.get("INFRASCOPE_ALERT_WEBHOOK"))],
+            cooldown_s=float(os.environ.get("INFRASCOPE_ALERT_COOLDOWN_S", DEFAULT_COOLDOWN_S)),
+            log=SubscriptionLog(path) if path else None,
+        )
+    return _engine
+
+
+async def run_alert_loop(interval: float) -> None:
+    """Evaluate subscriptions against the current feeds every ``interval`` seconds."""
+    from backend.app.mcp import data_provider
+
+    while True:
+        try:
+            rivers, landslides = await asyncio.gather(
+                data_provider.get_river_water_levels_async(),
+                data_provider.get_landslide_warnings_async(),
+            )
+            await get_engine().process({
+                "rivers": rivers, "landslides": landslides, "roads": data_provider.get_road_closures(),
+            })
+        except Exception:
+            logger.exception("Alert evaluation failed")
+        await asyncio.sleep(interval)
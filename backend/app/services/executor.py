@@ -0,0 +1,214 @@
+"""Offload Executor — keeps CPU-heavy service work off the event loop.
+
+Scoring and summary building are pure CPU work. Run on the asyncio loop
+they stall every other request, so services hand them to :func:`offload`
+with a rough ``size`` (work units, e.g. points x hazards) and the executor
+picks where to run them:
+
+  - ``size < inline_below``   → inline on the loop (cheaper than a hop)
+  - ``size < process_from``   → thread pool
+  - otherwise                 → process pool (true parallelism, no GIL)
+
+Each pool has a pending-job limit; beyond it :class:`ExecutorBusy` is
+raised and the app answers 503 with ``Retry-After`` instead of queueing
+without bound. When a request is bound via :func:`bind_request` and the
+client disconnects while its job waits, the job is cancelled and
+:class:`JobCancelled` is raised. Jobs already running in a process run to
+completion, but their result is dropped.
+
+Configuration (environment):
+  - ``INFRASCOPE_THREAD_WORKERS``   (default 4)
+  - ``INFRASCOPE_PROCESS_WORKERS``  (default cpu_count - 1, 0 disables)
+  - ``INFRASCOPE_OFFLOAD_INLINE_BELOW`` / ``INFRASCOPE_OFFLOAD_PROCESS_FROM``
+  - ``INFRASCOPE_OFFLOAD_MAX_PENDING`` (per pool, default 64)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import Request
+
+from backend.app import metrics
+
+logger = logging.getLogger(__name__)
+
+_DISCONNECT_POLL_S = 0.1
+
+_current_request: contextvars.ContextVar[Request | None] = contextvars.ContextVar(
+    "infrascope_offload_request", default=None,
+)
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised when a pool already has ``max_pending`` jobs in flight."""
+
+    def __init__(self, pool: str, retry_after: int = 1):
+        super().__init__(f"{pool} pool is saturated")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class JobCancelled(RuntimeError):
+    """Raised when the client went away before its offloaded job finished."""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+class OffloadExecutor:
+    """Size-based dispatcher over a lazily created thread and process pool."""
+
+    def __init__(
+        self,
+        thread_workers: int = 4,
+        process_workers: int = 0,
+        inline_below: int = 5_000,
+        process_from: int = 2_000_000,
+        max_pending: int = 64,
+    ):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.inline_below = inline_below
+        self.process_from = process_from
+        self.max_pending = max_pending
+        self._pools: dict[str, Executor] = {}
+        self._pending = {"thread": 0, "process": 0}
+        self._completed = {"inline": 0, "thread": 0, "process": 0}
+        self._rejected = 0
+        self._cancelled = 0
+
+    def route(self, size: int) -> str:
+        """Return which tier a job of ``size`` work units runs on."""
+        if size < self.inline_below:
+            return "inline"
+        if size >= self.process_from and self.process_workers > 0:
+            return "process"
+        return "thread"
+
+    def _pool(self, kind: str) -> Executor:
+        pool = self._pools.get(kind)
+        if pool is None:
+            if kind == "process":
+                # spawn: forking a process that runs an event loop and
+                # threads is unsafe.
+                pool = ProcessPoolExecutor(
+                    self.process_workers, mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                pool = ThreadPoolExecutor(self.thread_workers, thread_name_prefix="offload")
+            self._pools[kind] = pool
+        return pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any, size: int = 0) -> Any:
+        """Run ``fn(*args)`` on the tier chosen by ``size`` and return its result."""
+        kind = self.route(size)
+        if kind == "inline":
+            self._completed["inline"] += 1
+            return fn(*args)
+        if self._pending[kind] >= self.max_pending:
+            self._rejected += 1
+            raise ExecutorBusy(kind)
+
+        self._pending[kind] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(fn, *args)
+            if kind == "thread":
+                # Like asyncio.to_thread: keep the tracing span and request
+                # binding visible to the job. Processes cannot share them.
+                call = functools.partial(contextvars.copy_context().run, call)
+            future = loop.run_in_executor(self._pool(kind), call)
+            request = _current_request.get()
+            result = await (future if request is None else self._watch(future, request))
+            self._completed[kind] += 1
+            return result
+        finally:
+            self._pending[kind] -= 1
+
+    async def _watch(self, future: asyncio.Future, request: Request) -> Any:
+        """Await ``future`` while polling the client for a disconnect."""
+        while True:
+            done, _ = await asyncio.wait({future}, timeout=_DISCONNECT_POLL_S)
+            if done:
+                return future.result()
+            if await request.is_disconnected():
+                future.cancel()
+                self._cancelled += 1
+                raise JobCancelled("Client disconnected")
+
+    def stats(self) -> dict:
+        """Return pending / completed / rejected counters for monitoring."""
+        return {
+            "pending": dict(self._pending),
+            "completed": dict(self._completed),
+            "rejected": self._rejected,
+            "cancelled": self._cancelled,
+            "max_pending": self.max_pending,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the pools; queued jobs are cancelled."""
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools.clear()
+
+
+_executor: OffloadExecutor | None = None
+
+
+def get_executor() -> OffloadExecutor:
+    """Return the process-wide executor, configured from the environment."""
+    global _executor
+    if _executor is None:
+        _executor = OffloadExecutor(
+            thread_workers=_env_int("INFRASCOPE_THREAD_WORKERS", 4),
+            process_workers=_env_int(
+                "INFRASCOPE_PROCESS_WORKERS", max((os.cpu_count() or 1) - 1, 0),
+            ),
+            inline_below=_env_int("INFRASCOPE_OFFLOAD_INLINE_BELOW", 5_000),
+            process_from=_env_int("INFRASCOPE_OFFLOAD_PROCESS_FROM", 2_000_000),
+            max_pending=_env_int("INFRASCOPE_OFFLOAD_MAX_PENDING", 64),
+        )
+    return _executor
+
+
+def _pending_jobs() -> dict[tuple[str, ...], float]:
+    if _executor is None:
+        return {}
+    return {(pool,): float(n) for pool, n in _executor.stats()["pending"].items()}
+
+
+metrics.Gauge(
+    "infrascope_offload_pending_jobs", "Jobs queued or running per offload pool.", ["pool"],
+    callback=_pending_jobs,
+)
+
+
+def shutdown_executor() -> None:
+    """Shut down the process-wide executor (called on app shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+async def offload(fn: Callable[..., Any], *args: Any, size: int = 0) -> Any:
+    """Run ``fn(*args)`` through the process-wide executor."""
+    return await get_executor().run(fn, *args, size=size)
+
+
+async def bind_request(request: Request) -> None:
+    """Router dependency: lets offloaded jobs notice client disconnects."""
+    _current_request.set(request)
@@ -2,22 +2,41 @@
 
 from __future__ import annotations
 
+import asyncio
+import bisect
 import math
+from datetime import datetime
 
+from backend.app import metrics, tracing
 from backend.app.mcp.data_provider import (
+    feeds_at,
     get_landslide_warnings,
     get_landslide_warnings_async,
     get_river_water_levels,
     get_river_water_levels_async,
     get_road_closures,
 )
+from backend.app.services.executor import offload
+from backend.app.services.scoring_profiles import (
+    DEFAULT_PROFILE,
+    DEFAULT_RADIUS_KM,
+    CompiledProfile,
+    get_profile,
+)
+
+PROXIMITY_THRESHOLD_KM = DEFAULT_RADIUS_KM
+
+_EARTH_RADIUS_KM = 6371.0
+# On the haversine's sphere, so latitude windows match its distances exactly.
+_KM_PER_DEG_LAT = _EARTH_RADIUS_KM * math.pi / 180.0
 
-PROXIMITY_THRESHOLD_KM = 30.0
+_POINT_TIMER = metrics.RISK_SCORE_SECONDS.labels("point")
+_BATCH_TIMER = metrics.RISK_SCORE_SECONDS.labels("batch")
 
 
 def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Return the great-circle distance in km between two points."""
-    r = 6371.0
+    r = _EARTH_RADIUS_KM
     d_lat = math.radians(lat2 - lat1)
     d_lon = math.radians(lon2 - lon1)
     a = (
@@ -27,29 +46,47 @@ def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return r * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 
-def _proximity_weight(distance_km: float) -> float:
-    """Return a weight between 0 and 1 based on proximity (closer = higher)."""
-    if distance_km >= PROXIMITY_THRESHOLD_KM:
-        return 0.0
-    return 1.0 - (distance_km / PROXIMITY_THRESHOLD_KM)
+def _river_severity(r: dict) -> float:
+    """Return the hazard severity of a river observation."""
+    if r["status"] == "danger":
+        return 1.0
+    if r["status"] == "warning":
+        return 0.6
+    return 0.1
+
+
+def _road_severity(rd: dict) -> float:
+    """Return the hazard severity of a road closure."""
+    return 1.0 if rd["status"] == "closed" else 0.6
+
 
+def _landslide_severity(ls: dict) -> float:
+    """Return the hazard severity of a landslide warning area."""
+    return ls["risk_score"]
 
-def _score_from_data(lat: float, lon: float, rivers: list, roads: list, landslides: list) -> dict:
+
+@metrics.timed(_POINT_TIMER)
+def _score_from_data(
+    lat: float,
+    lon: float,
+    rivers: list,
+    roads: list,
+    landslides: list,
+    profile: CompiledProfile = DEFAULT_PROFILE,
+) -> dict:
     """Core risk computation logic shared by sync and async paths."""
+    river_falloff, road_falloff, landslide_falloff = profile.falloffs
+    w_river, w_road, w_landslide = profile.weights
+
     # --- River risk ---
     river_risk = 0.0
     river_factors: list[str] = []
     for r in rivers:
         dist = _haversine_km(lat, lon, r["lat"], r["lon"])
-        w = _proximity_weight(dist)
+        w = river_falloff(dist)
         if w <= 0:
             continue
-        if r["status"] == "danger":
-            score = w * 1.0
-        elif r["status"] == "warning":
-            score = w * 0.6
-        else:
-            score = w * 0.1
+        score = w * _river_severity(r)
         if score > river_risk:
             river_risk = score
         if r["status"] in ("danger", "warning"):
@@ -60,10 +97,10 @@ def _score_from_data(lat: float, lon: float, rivers: list, roads: list, landslid
     road_factors: list[str] = []
     for rd in roads:
         dist = _haversine_km(lat, lon, rd["lat"], rd["lon"])
-        w = _proximity_weight(dist)
+        w = road_falloff(dist)
         if w <= 0:
             continue
-        score = w * (1.0 if rd["status"] == "closed" else 0.6)
+        score = w * _road_severity(rd)
         if score > road_risk:
             road_risk = score
         road_factors.append(f"{rd['road_name']} {rd['section']}が{rd['cause']}により{rd['status']}")
@@ -73,28 +110,19 @@ def _score_from_data(lat: float, lon: float, rivers: list, roads: list, landslid
     landslide_factors: list[str] = []
     for ls in landslides:
         dist = _haversine_km(lat, lon, ls["lat"], ls["lon"])
-        w = _proximity_weight(dist)
+        w = landslide_falloff(dist)
         if w <= 0:
             continue
-        score = w * ls["risk_score"]
+        score = w * _landslide_severity(ls)
         if score > landslide_risk:
             landslide_risk = score
         if ls["warning_level"] in ("high", "very_high"):
             landslide_factors.append(f"{ls['name']}が土砂災害{ls['warning_level']}レベル")
 
     # --- Aggregate ---
-    overall = round(river_risk * 0.4 + road_risk * 0.25 + landslide_risk * 0.35, 3)
+    overall = round(river_risk * w_river + road_risk * w_road + landslide_risk * w_landslide, 3)
     overall = min(overall, 1.0)
 
-    if overall >= 0.75:
-        level = "critical"
-    elif overall >= 0.5:
-        level = "high"
-    elif overall >= 0.25:
-        level = "moderate"
-    else:
-        level = "low"
-
     return {
         "lat": lat,
         "lon": lon,
@@ -102,24 +130,124 @@ def _score_from_data(lat: float, lon: float, rivers: list, roads: list, landslid
         "river_risk": round(river_risk, 3),
         "road_risk": round(road_risk, 3),
         "landslide_risk": round(landslide_risk, 3),
-        "level": level,
+        "level": profile.level(overall),
         "contributing_factors": river_factors + road_factors + landslide_factors,
+        "profile": profile.name,
     }
 
 
-def compute_risk(lat: float, lon: float) -> dict:
+# =====================================================================
+# Batch scoring
+# =====================================================================
+
+class _LayerIndex:
+    """Hazards of one layer sorted by latitude for windowed lookups."""
+
+    __slots__ = ("lats", "lons", "cos_lats", "severities")
+
+    def __init__(self, hazards: list[tuple[float, float, float]]):
+        hazards = sorted(hazards)
+        self.lats = [h[0] for h in hazards]
+        self.lons = [h[1] for h in hazards]
+        self.cos_lats = [math.cos(math.radians(h[0])) for h in hazards]
+        self.severities = [h[2] for h in hazards]
+
+    def max_score(
+        self, lat: float, lon: float, cos_lat: float, radius: float, falloff,
+    ) -> float:
+        """Return the highest proximity-weighted severity around a point."""
+        window = radius / _KM_PER_DEG_LAT
+        lo = bisect.bisect_left(self.lats, lat - window)
+        hi = bisect.bisect_right(self.lats, lat + window)
+        best = 0.0
+        r_lat = math.radians(lat)
+        for i in range(lo, hi):
+            d_lat = math.radians(self.lats[i]) - r_lat
+            d_lon = math.radians(self.lons[i] - lon)
+            a = math.sin(d_lat / 2) ** 2 + cos_lat * self.cos_lats[i] * math.sin(d_lon / 2) ** 2
+            dist = _EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+            if dist >= radius:
+                continue
+            score = falloff(dist) * self.severities[i]
+            if score > best:
+                best = score
+        return best
+
+
+@metrics.timed(_BATCH_TIMER)
+def score_points(
+    points: list[tuple[float, float]],
+    rivers: list,
+    roads: list,
+    landslides: list,
+    profile: CompiledProfile = DEFAULT_PROFILE,
+) -> list[dict]:
+    """Score many (lat, lon) points against a single data snapshot.
+
+    Produces the same component and overall scores as ``_score_from_data``
+    but skips the contributing-factor text, and indexes each layer once so
+    the per-point cost only depends on the hazards near that point.
+    """
+    river_idx = _LayerIndex([(r["lat"], r["lon"], _river_severity(r)) for r in rivers])
+    road_idx = _LayerIndex([(rd["lat"], rd["lon"], _road_severity(rd)) for rd in roads])
+    landslide_idx = _LayerIndex(
+        [(ls["lat"], ls["lon"], _landslide_severity(ls)) for ls in landslides]
+    )
+    r_river, r_road, r_landslide = profile.radii
+    f_river, f_road, f_landslide = profile.falloffs
+    w_river, w_road, w_landslide = profile.weights
+
+    results: list[dict] = []
+    for lat, lon in points:
+        cos_lat = math.cos(math.radians(lat))
+        river_risk = river_idx.max_score(lat, lon, cos_lat, r_river, f_river)
+        road_risk = road_idx.max_score(lat, lon, cos_lat, r_road, f_road)
+        landslide_risk = landslide_idx.max_score(lat, lon, cos_lat, r_landslide, f_landslide)
+        overall = min(
+            round(river_risk * w_river + road_risk * w_road + landslide_risk * w_landslide, 3),
+            1.0,
+        )
+        results.append({
+            "lat": lat,
+            "lon": lon,
+            "overall_score": overall,
+            "river_risk": round(river_risk, 3),
+            "road_risk": round(road_risk, 3),
+            "landslide_risk": round(landslide_risk, 3),
+            "level": profile.level(overall),
+        })
+    return results
+
+
+def compute_risk(lat: float, lon: float, profile: str | None = None) -> dict:
     """Compute risk using synchronous (mock) data."""
     return _score_from_data(
         lat, lon,
         get_river_water_levels(),
         get_road_closures(),
         get_landslide_warnings(),
+        get_profile(profile),
     )
 
 
-async def compute_risk_async(lat: float, lon: float) -> dict:
-    """Compute risk using async data (real API with fallback)."""
-    rivers = await get_river_water_levels_async()
-    roads = get_road_closures()
-    landslides = await get_landslide_warnings_async()
-    return _score_from_data(lat, lon, rivers, roads, landslides)
+async def compute_risk_async(
+    lat: float, lon: float, profile: str | None = None, at: datetime | None = None,
+) -> dict:
+    """Compute risk using async data (real API with fallback), or the feeds as of ``at``."""
+    compiled = get_profile(profile)
+    with tracing.span("data"):
+        if at is None:
+            rivers = await get_river_water_levels_async()
+            roads = get_road_closures()
+            landslides = await get_landslide_warnings_async()
+        else:
+            as_of, feeds = await asyncio.to_thread(feeds_at, at)
+            rivers, roads, landslides = feeds["rivers"], feeds["roads"], feeds["landslides"]
+    with tracing.span("score"):
+        result = await offload(
+            _score_from_data, lat, lon, rivers, roads, landslides, compiled,
+            size=len(rivers) + len(roads) + len(landslides),
+        )
+    if at is not None:
+        result["as_of"] = as_of.isoformat()
+    return result
@@ -0,0 +1,272 @@
+"""Route Risk Scoring — risk along a polyline instead of a single point.
+
+A route is given either as a GeoJSON ``LineString`` (``[lon, lat]`` pairs)
+or as an encoded polyline (Google polyline algorithm, precision 5). The
+route is densified to a fixed step, every sample is scored in one batch
+against the current data snapshot, and the samples are folded back into
+per-segment results (one segment per pair of consecutive vertices).
+Routes are limited to :data:`MAX_ROUTE_VERTICES` input positions.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from backend.app import metrics, tracing
+from backend.app.mcp.data_provider import (
+    get_landslide_warnings_async,
+    get_river_water_levels_async,
+    get_road_closures,
+)
+from backend.app.services.executor import offload
+from backend.app.services.risk_scoring import (
+    _KM_PER_DEG_LAT,
+    _haversine_km,
+    score_points,
+)
+from backend.app.services.scoring_profiles import DEFAULT_PROFILE, CompiledProfile, get_profile
+
+DEFAULT_STEP_KM = 1.0
+DEFAULT_BUFFER_KM = 1.0
+MAX_ROUTE_POINTS = 20_000
+# Road-closure matching costs roads x vertices, so input size is capped too.
+MAX_ROUTE_VERTICES = 5_000
+
+_ROUTE_TIMER = metrics.RISK_SCORE_SECONDS.labels("route")
+
+
+# =====================================================================
+# Route parsing
+# =====================================================================
+
+def decode_polyline(encoded: str, precision: int = 5) -> list[tuple[float, float]]:
+    """Decode an encoded polyline string into ``(lat, lon)`` pairs."""
+    factor = 10 ** precision
+    coords: list[tuple[float, float]] = []
+    index = lat = lon = 0
+    length = len(encoded)
+
+    while index < length:
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                if index >= length:
+                    raise ValueError("Truncated encoded polyline")
+                b = ord(encoded[index]) - 63
+                index += 1
+                if b < 0 or b > 63:
+                    raise ValueError("Invalid character in encoded polyline")
+                result |= (b & 0x1F) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lon += deltas[1]
+        coords.append((lat / factor, lon / factor))
+    return coords
+
+
+def _coords_from_geojson(geometry: Any) -> list[tuple[float, float]]:
+    """Extract ``(lat, lon)`` pairs from a GeoJSON LineString or Feature."""
+    if isinstance(geometry, dict) and geometry.get("type") == "Feature":
+        geometry = geometry.get("geometry") or {}
+    if not isinstance(geometry, dict) or geometry.get("type") != "LineString":
+        raise ValueError("GeoJSON geometry must be a LineString")
+    positions = geometry.get("coordinates") or []
+    if not isinstance(positions, list):
+        raise ValueError("GeoJSON coordinates must be a list of positions")
+    coords: list[tuple[float, float]] = []
+    for pos in positions:
+        if not isinstance(pos, (list, tuple)):
+            raise ValueError("Invalid GeoJSON position")
+        try:
+            lon, lat = float(pos[0]), float(pos[1])
+        except (TypeError, ValueError, IndexError):
+            raise ValueError("Invalid GeoJSON position") from None
+        coords.append((lat, lon))
+    return coords
+
+
+def parse_route(
+    geometry: dict[str, Any] | None = None, polyline: str | None = None,
+) -> list[tuple[float, float]]:
+    """Return route vertices as ``(lat, lon)`` pairs from either input form."""
+    if (geometry is None) == (polyline is None):
+        raise ValueError("Provide exactly one of 'geometry' or 'polyline'")
+    coords = _coords_from_geojson(geometry) if geometry is not None else decode_polyline(polyline)
+    if len(coords) < 2:
+        raise ValueError("A route needs at least two positions")
+    if len(coords) > MAX_ROUTE_VERTICES:
+        raise ValueError(f"A route may have at most {MAX_ROUTE_VERTICES} positions")
+    for lat, lon in coords:
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"Position out of range: ({lat}, {lon})")
+    return coords
+
+
+# =====================================================================
+# Geometry helpers
+# =====================================================================
+
+def densify(
+    coords: list[tuple[float, float]], step_km: float,
+) -> tuple[list[tuple[float, float]], list[int], list[float]]:
+    """Interpolate points along the route at most ``step_km`` apart.
+
+    Returns the sample points, the segment index of each sample and the
+    length of each segment in km. Segment start vertices are always kept.
+    """
+    points: list[tuple[float, float]] = []
+    owners: list[int] = []
+    lengths: list[float] = []
+    for seg, ((lat1, lon1), (lat2, lon2)) in enumerate(zip(coords, coords[1:])):
+        length = _haversine_km(lat1, lon1, lat2, lon2)
+        lengths.append(length)
+        n = max(1, math.ceil(length / step_km))
+        for i in range(n):
+            t = i / n
+            points.append((lat1 + (lat2 - lat1) * t, lon1 + (lon2 - lon1) * t))
+            owners.append(seg)
+    points.append(coords[-1])
+    owners.append(len(coords) - 2)
+    return points, owners, lengths
+
+
+def _point_segment_km(
+    lat: float, lon: float, a: tuple[float, float], b: tuple[float, float],
+) -> float:
+    """Approximate distance in km from a point to segment ``a``–``b``.
+
+    Uses a local equirectangular projection around the point, which is
+    accurate at corridor-buffer scales.
+    """
+    kx = _KM_PER_DEG_LAT * math.cos(math.radians(lat))
+    ax, ay = (a[1] - lon) * kx, (a[0] - lat) * _KM_PER_DEG_LAT
+    bx, by = (b[1] - lon) * kx, (b[0] - lat) * _KM_PER_DEG_LAT
+    dx, dy = bx - ax, by - ay
+    seg_sq = dx * dx + dy * dy
+    t = 0.0 if seg_sq == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / seg_sq))
+    px, py = ax + t * dx, ay + t * dy
+    return math.hypot(px, py)
+
+
+def closures_along_route(
+    coords: list[tuple[float, float]], roads: list, buffer_km: float,
+) -> list[dict]:
+    """Return road closures lying within ``buffer_km`` of the route."""
+    pad = buffer_km / _KM_PER_DEG_LAT
+    segments = []
+    for a, b in zip(coords, coords[1:]):
+        max_lat = max(abs(a[0]), abs(b[0])) + pad
+        lon_pad = pad / max(math.cos(math.radians(min(max_lat, 89.0))), 1e-6)
+        segments.append((
+            a, b,
+            min(a[0], b[0]) - pad, max(a[0], b[0]) + pad,
+            min(a[1], b[1]) - lon_pad, max(a[1], b[1]) + lon_pad,
+        ))
+
+    hits: list[dict] = []
+    for rd in roads:
+        lat, lon = rd["lat"], rd["lon"]
+        for a, b, lat_lo, lat_hi, lon_lo, lon_hi in segments:
+            if not (lat_lo <= lat <= lat_hi and lon_lo <= lon <= lon_hi):
+                continue
+            if _point_segment_km(lat, lon, a, b) <= buffer_km:
+                hits.append(rd)
+                break
+    return hits
+
+
+# =====================================================================
+# Scoring
+# =====================================================================
+
+@metrics.timed(_ROUTE_TIMER)
+def _score_route(
+    coords: list[tuple[float, float]],
+    rivers: list,
+    roads: list,
+    landslides: list,
+    step_km: float = DEFAULT_STEP_KM,
+    buffer_km: float = DEFAULT_BUFFER_KM,
+    profile: CompiledProfile = DEFAULT_PROFILE,
+) -> dict:
+    """Core route scoring logic, independent of where the data comes from."""
+    total_km = sum(
+        _haversine_km(a[0], a[1], b[0], b[1]) for a, b in zip(coords, coords[1:])
+    )
+    step_km = max(step_km, total_km / MAX_ROUTE_POINTS)
+    points, owners, lengths = densify(coords, step_km)
+    scored = score_points(points, rivers, roads, landslides, profile)
+
+    segments: list[dict] = []
+    for seg, length in enumerate(lengths):
+        segments.append({
+            "index": seg,
+            "start": [coords[seg][0], coords[seg][1]],
+            "end": [coords[seg + 1][0], coords[seg + 1][1]],
+            "length_km": round(length, 3),
+            "overall_score": 0.0,
+            "river_risk": 0.0,
+            "road_risk": 0.0,
+            "landslide_risk": 0.0,
+            "level": "low",
+        })
+
+    # Length-weighted mean: each sample stands for the stretch up to the next one.
+    weighted = 0.0
+    for i, (seg, s) in enumerate(zip(owners, scored)):
+        out = segments[seg]
+        for key in ("overall_score", "river_risk", "road_risk", "landslide_risk"):
+            if s[key] > out[key]:
+                out[key] = s[key]
+        if i + 1 < len(points):
+            nxt = points[i + 1]
+            weighted += s["overall_score"] * _haversine_km(
+                points[i][0], points[i][1], nxt[0], nxt[1],
+            )
+    for out in segments:
+        out["level"] = profile.level(out["overall_score"])
+
+    max_score = max(s["overall_score"] for s in scored)
+    mean_score = weighted / total_km if total_km > 0 else max_score
+
+    return {
+        "distance_km": round(total_km, 3),
+        "step_km": round(step_km, 3),
+        "sample_count": len(points),
+        "max_score": max_score,
+        "mean_score": round(mean_score, 3),
+        "level": profile.level(max_score),
+        "profile": profile.name,
+        "segments": segments,
+        "road_closures": closures_along_route(coords, roads, buffer_km),
+    }
+
+
+async def score_route_async(
+    geometry: dict[str, Any] | None = None,
+    polyline: str | None = None,
+    step_km: float = DEFAULT_STEP_KM,
+    buffer_km: float = DEFAULT_BUFFER_KM,
+    profile: str | None = None,
+) -> dict:
+    """Score a route using async data (real API with fallback)."""
+    coords = parse_route(geometry, polyline)
+    compiled = get_profile(profile)
+    with tracing.span("data"):
+        rivers = await get_river_water_levels_async()
+        roads = get_road_closures()
+        landslides = await get_landslide_warnings_async()
+    samples = sum(
+        _haversine_km(a[0], a[1], b[0], b[1]) for a, b in zip(coords, coords[1:])
+    ) / step_km
+    hazards = len(rivers) + len(roads) + len(landslides)
+    with tracing.span("score"):
+        return await offload(
+            _score_route, coords, rivers, roads, landslides, step_km, buffer_km, compiled,
+            size=int(min(samples, MAX_ROUTE_POINTS) * hazards),
+        )
@@ -0,0 +1,244 @@
+"""Scoring Profiles — named weight / falloff / threshold sets for the risk engine.
+
+A :class:`ScoringProfile` is the declarative form (what a customer asks
+for). Registering it compiles it once into a :class:`CompiledProfile`
+holding per-layer radius / weight tuples and ready-made falloff functions, so
+the scoring hot loop does no dictionary lookups or branching on the
+profile shape. The built-in ``default`` profile reproduces the original
+hardcoded engine exactly.
+
+Extra profiles can be loaded from a JSON file named by the
+``INFRASCOPE_SCORING_PROFILES`` environment variable::
+
+    [{"name": "acme", "falloff": "gaussian",
+      "radius_km": {"river": 15, "road": 5, "landslide": 10},
+      "weights": {"river": 0.5, "road": 0.2, "landslide": 0.3}}]
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+LAYERS = ("river", "road", "landslide")
+FALLOFFS = ("linear", "gaussian", "exponential")
+
+DEFAULT_RADIUS_KM = 30.0
+DEFAULT_WEIGHTS = {"river": 0.4, "road": 0.25, "landslide": 0.35}
+DEFAULT_THRESHOLDS = (0.25, 0.5, 0.75)  # moderate, high, critical
+
+# Shape constants: the gaussian sigma is radius / 3, the exponential decays
+# by e^-3 over one radius. Both are renormalised to reach 0 at the radius.
+_GAUSSIAN_SIGMAS_PER_RADIUS = 3.0
+_EXPONENTIAL_RATE_PER_RADIUS = 3.0
+
+
+@dataclass(frozen=True)
+class ScoringProfile:
+    name: str
+    falloff: str = "linear"  # linear | gaussian | exponential
+    radius_km: dict[str, float] = field(
+        default_factory=lambda: dict.fromkeys(LAYERS, DEFAULT_RADIUS_KM),
+    )
+    weights: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_WEIGHTS))
+    thresholds: tuple[float, float, float] = DEFAULT_THRESHOLDS
+
+
+class CompiledProfile:
+    """Precomputed, per-layer form of a profile used by the scoring loops.
+
+    Layer-indexed tuples follow :data:`LAYERS` order. Pickling sends the
+    source profile and recompiles on the other side, so compiled profiles
+    can be passed to process-pool workers.
+    """
+
+    __slots__ = ("source", "name", "radii", "weights", "falloffs", "thresholds")
+
+    def __init__(
+        self,
+        source: ScoringProfile,
+        name: str,
+        radii: tuple[float, ...],
+        weights: tuple[float, ...],
+        falloffs: tuple[Callable[[float], float], ...],
+        thresholds: tuple[float, float, float],
+    ):
+        self.source = source
+        self.name = name
+        self.radii = radii
+        self.weights = weights
+        self.falloffs = falloffs
+        self.thresholds = thresholds
+
+    def __reduce__(self):
+        return compile_profile, (self.source,)
+
+    def level(self, overall: float) -> str:
+        """Map an overall score to its level label under this profile."""
+        moderate, high, critical = self.thresholds
+        if overall >= critical:
+            return "critical"
+        if overall >= high:
+            return "high"
+        if overall >= moderate:
+            return "moderate"
+        return "low"
+
+
+# =====================================================================
+# Compilation
+# =====================================================================
+
+def _coefficients(kind: str, radius: float) -> tuple[float, float, float]:
+    """Return ``(rate, tail, scale)`` for a falloff curve of the given radius.
+
+    The weight is ``(curve(d) - tail) * scale`` so it is 1 at d=0 and 0 at
+    the radius; ``rate`` parametrises the curve itself.
+    """
+    if kind == "linear":
+        return 1.0 / radius, 0.0, 1.0
+    if kind == "gaussian":
+        sigma = radius / _GAUSSIAN_SIGMAS_PER_RADIUS
+        rate = -1.0 / (2.0 * sigma * sigma)
+        tail = math.exp(rate * radius * radius)
+    elif kind == "exponential":
+        rate = -_EXPONENTIAL_RATE_PER_RADIUS / radius
+        tail = math.exp(rate * radius)
+    else:
+        raise ValueError(f"Unknown falloff '{kind}', expected one of {FALLOFFS}")
+    return rate, tail, 1.0 / (1.0 - tail)
+
+
+def _make_falloff(kind: str, radius: float, coeffs: tuple[float, float, float]) -> Callable[[float], float]:
+    """Build a falloff function with its coefficients bound as locals."""
+    rate, tail, scale = coeffs
+    exp = math.exp
+
+    if kind == "linear":
+        def falloff(d: float) -> float:
+            if d >= radius:
+                return 0.0
+            return 1.0 - d / radius
+    elif kind == "gaussian":
+        def falloff(d: float) -> float:
+            if d >= radius:
+                return 0.0
+            return (exp(rate * d * d) - tail) * scale
+    else:
+        def falloff(d: float) -> float:
+            if d >= radius:
+                return 0.0
+            return (exp(rate * d) - tail) * scale
+    return falloff
+
+
+def compile_profile(profile: ScoringProfile) -> CompiledProfile:
+    """Validate a profile and precompute everything the hot loop needs."""
+    if profile.falloff not in FALLOFFS:
+        raise ValueError(f"Unknown falloff '{profile.falloff}', expected one of {FALLOFFS}")
+    radii = tuple(float(profile.radius_km.get(layer, DEFAULT_RADIUS_KM)) for layer in LAYERS)
+    if any(r <= 0 for r in radii):
+        raise ValueError("Layer radii must be positive")
+    weights = tuple(float(profile.weights.get(layer, 0.0)) for layer in LAYERS)
+    if any(w < 0 for w in weights):
+        raise ValueError("Layer weights must not be negative")
+    thresholds = tuple(float(t) for t in profile.thresholds)
+    if len(thresholds) != 3 or list(thresholds) != sorted(thresholds):
+        raise ValueError("Thresholds must be three ascending values (moderate, high, critical)")
+
+    coefficients = tuple(_coefficients(profile.falloff, r) for r in radii)
+    falloffs = tuple(
+        _make_falloff(profile.falloff, r, c) for r, c in zip(radii, coefficients)
+    )
+    return CompiledProfile(
+        profile, profile.name, radii, weights, falloffs, thresholds,
+    )
+
+
+# =====================================================================
+# Registry
+# =====================================================================
+
+BUILTIN_PROFILES = (
+    ScoringProfile(name="default"),
+    ScoringProfile(
+        name="urban",
+        falloff="gaussian",
+        radius_km={"river": 10.0, "road": 5.0, "landslide": 8.0},
+        weights={"river": 0.4, "road": 0.35, "landslide": 0.25},
+    ),
+    ScoringProfile(
+        name="logistics",
+        falloff="exponential",
+        radius_km={"river": 20.0, "road": 15.0, "landslide": 20.0},
+        weights={"river": 0.25, "road": 0.5, "landslide": 0.25},
+        thresholds=(0.2, 0.4, 0.7),
+    ),
+    ScoringProfile(
+        name="mountain",
+        falloff="linear",
+        radius_km={"river": 20.0, "road": 20.0, "landslide": 40.0},
+        weights={"river": 0.25, "road": 0.2, "landslide": 0.55},
+    ),
+)
+
+_REGISTRY: dict[str, CompiledProfile] = {}
+
+
+def register_profile(profile: ScoringProfile) -> CompiledProfile:
+    """Compile and register a profile, replacing any profile of the same name.
+
+    The ``default`` profile is fixed so the unprofiled path never changes.
+    """
+    if profile.name == "default" and "default" in _REGISTRY:
+        raise ValueError("The 'default' scoring profile cannot be replaced")
+    compiled = compile_profile(profile)
+    _REGISTRY[profile.name] = compiled
+    return compiled
+
+
+def get_profile(name: str | None = None) -> CompiledProfile:
+    """Return the compiled profile for ``name`` (``None`` means default)."""
+    if name is None:
+        return DEFAULT_PROFILE
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown scoring profile '{name}'") from None
+
+
+def list_profiles() -> list[str]:
+    """Return the names of all registered profiles."""
+    return sorted(_REGISTRY)
+
+
+def load_profiles(path: str) -> list[str]:
+    """Register profiles from a JSON file containing a list of profile objects."""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    names: list[str] = []
+    for entry in entries:
+        kwargs = dict(entry)
+        if "thresholds" in kwargs:
+            kwargs["thresholds"] = tuple(kwargs["thresholds"])
+        register_profile(ScoringProfile(**kwargs))
+        names.append(entry["name"])
+    return names
+
+
+for _profile in BUILTIN_PROFILES:
+    register_profile(_profile)
+
+DEFAULT_PROFILE = _REGISTRY["default"]
+
+if os.environ.get("INFRASCOPE_SCORING_PROFILES"):
+    try:
+        load_profiles(os.environ["INFRASCOPE_SCORING_PROFILES"])
+    except (OSError, ValueError, TypeError, KeyError):
+        logger.warning("Could not load scoring profiles", exc_info=True)
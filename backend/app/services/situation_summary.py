@@ -7,19 +7,24 @@ summary from the data snapshot (real or mock).
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
+from backend.app import metrics, tracing
 from backend.app.mcp.data_provider import (
+    feeds_at,
     get_landslide_warnings,
     get_landslide_warnings_async,
     get_river_water_levels,
     get_river_water_levels_async,
     get_road_closures,
 )
+from backend.app.services.executor import offload
 
 JST = timezone(timedelta(hours=9))
 
 
+@metrics.timed(metrics.SUMMARY_BUILD_SECONDS.labels())
 def _build_summary(rivers: list, roads: list, landslides: list) -> dict:
     """Build summary text from data — shared by sync and async."""
     lines: list[str] = []
@@ -100,9 +105,21 @@ def generate_summary() -> dict:
     )
 
 
-async def generate_summary_async() -> dict:
-    """Async summary using real API data with fallback."""
-    rivers = await get_river_water_levels_async()
-    roads = get_road_closures()
-    landslides = await get_landslide_warnings_async()
-    return _build_summary(rivers, roads, landslides)
+async def generate_summary_async(at: datetime | None = None) -> dict:
+    """Async summary using real API data with fallback, or the feeds as of ``at``."""
+    with tracing.span("data"):
+        if at is None:
+            rivers = await get_river_water_levels_async()
+            roads = get_road_closures()
+            landslides = await get_landslide_warnings_async()
+        else:
+            as_of, feeds = await asyncio.to_thread(feeds_at, at)
+            rivers, roads, landslides = feeds["rivers"], feeds["roads"], feeds["landslides"]
+    with tracing.span("summary"):
+        result = await offload(
+            _build_summary, rivers, roads, landslides,
+            size=len(rivers) + len(roads) + len(landslides),
+        )
+    if at is not None:
+        result["as_of"] = as_of.isoformat()
+    return result
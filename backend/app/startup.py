@@ -0,0 +1,120 @@
+"""Startup — cold-start timing, warm-up and readiness.
+
+``main`` imports this module first, so the phases below cover the whole
+application import:
+
+  - ``interpreter``: process start → first application import (Python and
+    the ASGI server starting up; Linux only).
+  - ``import``: importing the application.
+  - ``warmup``: the optional warm-up (``INFRASCOPE_WARMUP=1``), which
+    prefetches every feed in the background after the lifespan starts.
+
+``/readyz`` answers 503 until warm-up has finished (or timed out after
+``INFRASCOPE_WARMUP_TIMEOUT_S``), so an autoscaler only routes traffic to
+containers whose caches are filled. Without warm-up the app is ready as
+soon as the lifespan starts. Phase durations are logged and exported as
+``infrascope_startup_seconds``.
+
+Heavy dependencies that are not needed to serve the first request
+(httpx, Jinja2) are imported on first use by the modules that need them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+
+from backend.app import metrics
+
+logger = logging.getLogger(__name__)
+
+_T0 = time.perf_counter()
+
+WARMUP = os.environ.get("INFRASCOPE_WARMUP", "0") == "1"
+try:
+    WARMUP_TIMEOUT_S = float(os.environ.get("INFRASCOPE_WARMUP_TIMEOUT_S", "30"))
+except ValueError:
+    WARMUP_TIMEOUT_S = 30.0
+
+PHASES: dict[str, float] = {}
+_ready = False
+
+
+def _process_age() -> float | None:
+    """Return seconds since this process started, from /proc (None elsewhere)."""
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+_interpreter = _process_age()
+if _interpreter is not None:
+    PHASES["interpreter"] = max(_interpreter, 0.0)
+
+
+def mark(phase: str, since: float = _T0) -> float:
+    """Record ``phase`` as the time from ``since`` to now; returns now."""
+    now = time.perf_counter()
+    PHASES[phase] = now - since
+    return now
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def set_ready() -> None:
+    global _ready
+    if not _ready:
+        _ready = True
+        logger.info(
+            "Startup complete: %s", ", ".join(f"{k}={v:.3f}s" for k, v in PHASES.items()),
+        )
+
+
+def reset() -> None:
+    """Forget readiness (a new lifespan is starting)."""
+    global _ready
+    _ready = False
+    PHASES.pop("warmup", None)
+
+
+async def _prefetch() -> None:
+    from backend.app.mcp import data_provider
+
+    await asyncio.gather(
+        data_provider.get_river_water_levels_async(),
+        data_provider.get_landslide_warnings_async(),
+        data_provider.get_jma_warnings_async(),
+    )
+    data_provider.get_road_closures()
+
+
+async def warm_up(timeout: float = WARMUP_TIMEOUT_S) -> None:
+    """Prefetch every feed, then mark the app ready (also on failure or timeout)."""
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(_prefetch(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Warm-up did not finish within %.0fs; serving anyway", timeout)
+    except Exception:
+        logger.warning("Warm-up failed; serving anyway", exc_info=True)
+    mark("warmup", since=start)
+    set_ready()
+
+
+metrics.Gauge(
+    "infrascope_startup_seconds", "Duration of each startup phase.", ["phase"],
+    callback=lambda: {(phase,): seconds for phase, seconds in PHASES.items()},
+)
+metrics.Gauge(
+    "infrascope_ready", "1 once startup (and warm-up) has finished.",
+    callback=lambda: {(): float(_ready)},
+)
@@ -0,0 +1,247 @@
+"""Per-request tracing — stage timings via Server-Timing, sampled cProfile dumps.
+
+Tracing is opt-in per request:
+
+  - send ``X-InfraScope-Trace: 1``, or
+  - set ``INFRASCOPE_TRACE_SAMPLE_RATE`` (0.0–1.0) to trace a fraction.
+
+A traced request collects :func:`span` timings from every layer it passes
+through (``fetch.*`` / ``parse.*`` in the data provider, ``score`` and
+``summary`` in the services, ``endpoint`` around the route function) and
+answers with a ``Server-Timing`` header. ``serialize`` is the time from
+the endpoint returning to the response starting, i.e. response-model
+validation and JSON encoding.
+
+Profiling dumps a cProfile ``.prof`` file per request into
+``INFRASCOPE_PROFILE_DIR`` when ``X-InfraScope-Profile: 1`` is sent or
+``INFRASCOPE_PROFILE_SAMPLE_RATE`` selects it. Open the files with
+``python -m pstats`` or snakeviz. Only one request is profiled at a time,
+and since the profiler sees the whole thread, concurrent requests on the
+same event loop show up in the profile too.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import functools
+import inspect
+import os
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+
+TRACE_HEADER = b"x-infrascope-trace"
+PROFILE_HEADER = b"x-infrascope-profile"
+
+
+def _env_rate(name: str) -> float:
+    try:
+        return min(max(float(os.environ[name]), 0.0), 1.0)
+    except (KeyError, ValueError):
+        return 0.0
+
+
+TRACE_SAMPLE_RATE = _env_rate("INFRASCOPE_TRACE_SAMPLE_RATE")
+PROFILE_SAMPLE_RATE = _env_rate("INFRASCOPE_PROFILE_SAMPLE_RATE")
+PROFILE_DIR = os.environ.get("INFRASCOPE_PROFILE_DIR")
+
+
+class Trace:
+    """Span timings collected for one request (milliseconds by stage)."""
+
+    __slots__ = ("spans", "endpoint_done")
+
+    def __init__(self):
+        self.spans: list[tuple[str, float]] = []
+        self.endpoint_done: float | None = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans.append((name, seconds))
+
+    def totals(self) -> dict[str, float]:
+        """Return summed durations in ms per stage, in first-seen order."""
+        out: dict[str, float] = {}
+        for name, seconds in self.spans:
+            out[name] = out.get(name, 0.0) + seconds * 1000.0
+        return out
+
+
+_current: contextvars.ContextVar[Trace | None] = contextvars.ContextVar(
+    "infrascope_trace", default=None,
+)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_trace", "_name", "_start")
+
+    def __init__(self, trace: Trace, name: str):
+        self._trace = trace
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._trace.add(self._name, time.perf_counter() - self._start)
+        return False
+
+
+def span(name: str):
+    """Time a stage of the current traced request (no-op when not tracing)."""
+    trace = _current.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name)
+
+
+def current_trace() -> Trace | None:
+    return _current.get()
+
+
+def server_timing(trace: Trace, total_s: float) -> str:
+    """Format a trace as a ``Server-Timing`` header value."""
+    parts = [f"{name};dur={ms:.2f}" for name, ms in trace.totals().items()]
+    if trace.endpoint_done is not None:
+        parts.append(f"serialize;dur={(time.perf_counter() - trace.endpoint_done) * 1000:.2f}")
+    parts.append(f"total;dur={total_s * 1000:.2f}")
+    return ", ".join(parts)
+
+
+# =====================================================================
+# Route class: times the endpoint function itself
+# =====================================================================
+
+def _traced_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an endpoint so its own duration is recorded as ``endpoint``."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            trace = _current.get()
+            if trace is None:
+                return await endpoint(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                trace.endpoint_done = time.perf_counter()
+                trace.add("endpoint", trace.endpoint_done - start)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            trace = _current.get()
+            if trace is None:
+                return endpoint(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                trace.endpoint_done = time.perf_counter()
+                trace.add("endpoint", trace.endpoint_done - start)
+
+    # Resolve string annotations against the endpoint's own module so
+    # FastAPI sees the real types regardless of how it inspects wrappers.
+    wrapper.__signature__ = inspect.signature(endpoint, eval_str=True)
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """APIRoute that records the endpoint stage for traced requests."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, _traced_endpoint(endpoint), **kwargs)
+
+
+# =====================================================================
+# Middleware
+# =====================================================================
+
+_profiling = False
+
+
+def _header(scope, name: bytes) -> bytes | None:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value
+    return None
+
+
+def _dump_profile(profiler: cProfile.Profile, scope) -> None:
+    path = scope.get("path", "/").strip("/").replace("/", "_") or "root"
+    name = f"{time.strftime('%Y%m%dT%H%M%S')}-{path}-{uuid.uuid4().hex[:8]}.prof"
+    directory = Path(PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(directory / name))
+
+
+class TracingMiddleware:
+    """ASGI middleware activating tracing / profiling for selected requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traced = _header(scope, TRACE_HEADER) == b"1" or (
+            TRACE_SAMPLE_RATE > 0 and random.random() < TRACE_SAMPLE_RATE
+        )
+        profiled = PROFILE_DIR is not None and (
+            _header(scope, PROFILE_HEADER) == b"1"
+            or (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE)
+        )
+        if not traced and not profiled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        token = _current.set(trace) if traced else None
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if traced and message["type"] == "http.response.start":
+                value = server_timing(trace, time.perf_counter() - start)
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"server-timing", value.encode())],
+                }
+            await send(message)
+
+        global _profiling
+        profiler = None
+        if profiled and not _profiling:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                _profiling = True
+            except ValueError:  # another profiler (e.g. coverage) is active
+                profiler = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _profiling = False
+                _dump_profile(profiler, scope)
+            if token is not None:
+                _current.reset(token)
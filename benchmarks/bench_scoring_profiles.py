@@ -0,0 +1,72 @@
+"""Benchmark: profiled risk scoring vs the default profile.
+
+Scores the same points against the same national-size snapshot with every
+registered profile and reports the per-point cost relative to ``default``.
+Profiles are compiled once at registration, so all of them should run
+within noise of the default path.
+
+Usage::
+
+    python -m benchmarks.bench_scoring_profiles [--hazards 2000] [--points 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from backend.app.services.risk_scoring import _score_from_data, score_points
+from backend.app.services.scoring_profiles import get_profile, list_profiles
+from benchmarks.common import scale_feeds
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(hazards: int, points: int, repeat: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    feeds = scale_feeds(hazards, seed)
+    rivers, roads, landslides = feeds["rivers"], feeds["roads"], feeds["landslides"]
+    pts = [(rng.uniform(31.0, 41.0), rng.uniform(130.0, 142.0)) for _ in range(points)]
+    single_pts = pts[: max(1, points // 20)]
+
+    results: dict[str, dict] = {}
+    for name in list_profiles():
+        profile = get_profile(name)
+        single = _best_of(
+            lambda: [_score_from_data(la, lo, rivers, roads, landslides, profile) for la, lo in single_pts],
+            repeat,
+        )
+        batch = _best_of(lambda: score_points(pts, rivers, roads, landslides, profile), repeat)
+        results[name] = {
+            "single_us_per_point": round(single / len(single_pts) * 1e6, 2),
+            "batch_us_per_point": round(batch / len(pts) * 1e6, 2),
+        }
+
+    base = results["default"]
+    for stats in results.values():
+        stats["single_ratio"] = round(stats["single_us_per_point"] / base["single_us_per_point"], 3)
+        stats["batch_ratio"] = round(stats["batch_us_per_point"] / base["batch_us_per_point"], 3)
+    return {"hazards": len(rivers) + len(roads) + len(landslides), "points": points, "profiles": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hazards", type=int, default=2000)
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.hazards, args.points, args.repeat, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
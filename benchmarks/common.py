@@ -0,0 +1,117 @@
+"""Shared helpers for the benchmark suite: fixtures, scaling, timing, output."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from backend.app.mcp import data_provider
+from backend.app.mcp.synthetic import EPOCH, SyntheticWorld
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Upstream feed name → (fixture file, JMA path served by the stub server)
+FEEDS = {
+    "warnings": ("warning_map.json", data_provider.JMA_WARNING_PATH),
+    "flood": ("flood_map.json", data_provider.JMA_FLOOD_PATH),
+    "sediment": ("sediment_map.json", data_provider.JMA_SEDIMENT_PATH),
+}
+
+PARSERS = {
+    "warnings": data_provider._parse_jma_warnings,
+    "flood": data_provider._parse_jma_flood_warnings,
+    "sediment": data_provider._parse_jma_landslide_warnings,
+}
+
+
+# =====================================================================
+# Fixtures
+# =====================================================================
+
+def load_fixture(feed: str) -> bytes:
+    """Return the synthetic nationwide ``map.json`` payload for ``feed``."""
+    return (FIXTURE_DIR / FEEDS[feed][0]).read_bytes()
+
+
+def scale_payload(feed: str, n: int) -> bytes:
+    """Grow a fixture to about ``n`` area entries by cloning its areas.
+
+    Clones keep the prefecture prefix (first four digits) so the parser
+    maps them to coordinates exactly like the fixture entries.
+    """
+    base = json.loads(load_fixture(feed))
+    entries = list(base.items())
+    out: dict[str, dict] = {}
+    i = 0
+    while len(out) < n:
+        code, info = entries[i % len(entries)]
+        out[code if i < len(entries) else f"{code[:4]}{i:06d}"] = info
+        i += 1
+    return json.dumps(out, ensure_ascii=False).encode("utf-8")
+
+
+# Fixed instant near the typhoon's landfall over Kanto, so every run
+# scores the same readings.
+SCENARIO_AT = EPOCH + timedelta(hours=36)
+
+
+def scale_feeds(hazards: int, seed: int = 0) -> dict[str, list[dict]]:
+    """Build snapshot feeds from a synthetic world with ``hazards`` sites.
+
+    Sites split 40% rivers, 40% landslide areas, 20% road sections; only
+    the sections closed at :data:`SCENARIO_AT` appear in ``roads``.
+    """
+    return SyntheticWorld.with_size(hazards, seed).feeds(SCENARIO_AT)
+
+
+# =====================================================================
+# Timing / output
+# =====================================================================
+
+def percentile(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, round(p / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def time_calls(fn: Callable[[], object], repeat: int) -> dict:
+    """Call ``fn`` ``repeat`` times and summarise latency in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return latency_stats(samples)
+
+
+def latency_stats(samples_ms: list[float]) -> dict:
+    return {
+        "n": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 4) if samples_ms else 0.0,
+        "p50_ms": round(percentile(samples_ms, 50), 4),
+        "p99_ms": round(percentile(samples_ms, 99), 4),
+    }
+
+
+def run_metadata(params: dict) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "params": params,
+    }
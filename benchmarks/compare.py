@@ -0,0 +1,70 @@
+"""Compare two benchmark result files and flag regressions.
+
+Usage::
+
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.10]
+
+Latencies (``*_ms``) regress when they grow by more than the threshold,
+throughput (``throughput_rps``) when it drops by more. Exits 1 if any
+metric regressed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+_LOWER_IS_BETTER = ("p50_ms", "p99_ms", "mean_ms")
+_HIGHER_IS_BETTER = ("throughput_rps",)
+
+
+def _flatten(node: dict, prefix: str = "") -> dict[str, float]:
+    out: dict[str, float] = {}
+    for key, value in node.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            out.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and key in _LOWER_IS_BETTER + _HIGHER_IS_BETTER:
+            out[path] = float(value)
+    return out
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list[dict]:
+    """Return one row per metric present in both runs, with a regression flag."""
+    base = _flatten(baseline["results"])
+    cand = _flatten(candidate["results"])
+    rows = []
+    for path in sorted(base.keys() & cand.keys()):
+        old, new = base[path], cand[path]
+        change = (new - old) / old if old else 0.0
+        worse = -change if path.endswith(_HIGHER_IS_BETTER) else change
+        rows.append({
+            "metric": path, "baseline": old, "candidate": new,
+            "change": round(change, 4), "regressed": worse > threshold,
+        })
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    rows = compare(
+        json.loads(Path(args.baseline).read_text(encoding="utf-8")),
+        json.loads(Path(args.candidate).read_text(encoding="utf-8")),
+        args.threshold,
+    )
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else ""
+        print(f"{row['metric']:<60} {row['baseline']:>12.3f} → {row['candidate']:>12.3f} "
+              f"{row['change']:+8.1%} {flag}")
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
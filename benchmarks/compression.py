@@ -0,0 +1,101 @@
+"""Benchmark: bytes on the wire per ``/api/*`` GET route with and without compression.
+
+Serves a national-size synthetic snapshot and fetches every cacheable
+GET route with ``Accept-Encoding: identity``, ``gzip`` and (when the
+``brotli`` package is installed) ``br``, then revalidates with the ETag.
+Also reports the server-side cost of compressing each body.
+
+Usage::
+
+    python -m benchmarks.compression [--hazards 2000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from backend.app.admission import configure_admission, configure_from_env
+from backend.app.http_cache import available_codings, compress
+from backend.app.main import app
+from backend.app.mcp import data_provider
+from backend.app.mcp.snapshot_store import SnapshotWriter
+from benchmarks.common import scale_feeds
+from benchmarks.load import ENDPOINTS
+
+
+def _compress_ms(body: bytes, coding: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        compress(body, coding)
+        best = min(best, time.perf_counter() - t0)
+    return round(best * 1000.0, 3)
+
+
+async def _measure(repeat: int) -> dict:
+    codings = ("identity", *available_codings())
+    transport = httpx.ASGITransport(app=app)
+    results: dict[str, dict] = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path, (method, params, _) in ENDPOINTS.items():
+            if method != "GET":
+                continue
+            stats: dict = {}
+            for coding in codings:
+                resp = await client.get(path, params=params, headers={"Accept-Encoding": coding})
+                stats[f"{coding}_bytes"] = resp.num_bytes_downloaded
+                if coding == "identity":
+                    body = resp.content
+                    etag = resp.headers.get("etag")
+            for coding in codings[1:]:
+                stats[f"{coding}_ratio"] = round(stats[f"{coding}_bytes"] / max(len(body), 1), 3)
+                stats[f"{coding}_compress_ms"] = _compress_ms(body, coding, repeat)
+            if etag is not None:
+                resp = await client.get(path, params=params, headers={"If-None-Match": etag})
+                stats["revalidate_status"] = resp.status_code
+                stats["revalidate_bytes"] = resp.num_bytes_downloaded
+            results[path] = stats
+    return results
+
+
+def run(hazards: int, repeat: int, seed: int) -> dict:
+    logging.disable(logging.WARNING)
+    configure_admission(rate=0, max_concurrent=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "bench.snap")
+            writer = SnapshotWriter(path, capacity=max(1 << 20, hazards * 1024))
+            writer.publish(scale_feeds(hazards, seed))
+            data_provider.configure_shared_snapshot(path)
+            try:
+                endpoints = asyncio.run(_measure(repeat))
+            finally:
+                data_provider.configure_shared_snapshot(None)
+                writer.close()
+    finally:
+        logging.disable(logging.NOTSET)
+        configure_from_env()
+    return {"hazards": hazards, "endpoints": endpoints}
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hazards", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = run(args.hazards, args.repeat, args.seed)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
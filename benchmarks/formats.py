@@ -0,0 +1,140 @@
+"""Benchmark: JSON vs MessagePack vs Arrow IPC — size, encode and decode time.
+
+Encodes a national-size river list and a long route's segment table in
+each format, then times whole ``/api/rivers`` requests per ``Accept``
+header (JSON goes through FastAPI's response-model validation; binary
+formats are projected onto the schema directly).
+
+Usage::
+
+    python -m benchmarks.formats [--hazards 2000] [--segments 2000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from backend.app import formats
+from backend.app.admission import configure_admission, configure_from_env
+from backend.app.main import app
+from backend.app.mcp import data_provider
+from backend.app.mcp.snapshot_store import SnapshotWriter
+from backend.app.models.schemas import RiverWaterLevel, RouteSegmentRisk
+from backend.app.services.route_risk import _score_route
+from benchmarks.common import latency_stats, scale_feeds, time_calls
+
+
+def _codecs(model) -> dict:
+    """format → (encode(rows) -> bytes, decode(bytes))"""
+    # Same settings as FastAPI's JSONResponse.
+    codecs = {
+        "json": (
+            lambda rows: json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode(),
+            json.loads,
+        ),
+    }
+    if formats.MSGPACK in formats.available_formats(columnar=True):
+        import msgpack
+
+        codecs["msgpack"] = (formats.encode_msgpack, msgpack.unpackb)
+    if formats.ARROW in formats.available_formats(columnar=True):
+        import pyarrow as pa
+
+        codecs["arrow"] = (
+            lambda rows: formats.encode_arrow(rows, model),
+            lambda body: pa.ipc.open_stream(body).read_all(),
+        )
+    return codecs
+
+
+def _compare(rows: list[dict], model, repeat: int) -> dict:
+    rows = formats.project(rows, model)
+    out = {}
+    for name, (encode, decode) in _codecs(model).items():
+        body = encode(rows)
+        out[name] = {
+            "bytes": len(body),
+            "encode": time_calls(lambda: encode(rows), repeat),
+            "decode": time_calls(lambda: decode(body), repeat),
+        }
+    return out
+
+
+async def _requests(repeat: int) -> dict:
+    accepts = {
+        "json": formats.JSON, "msgpack": formats.MSGPACK, "arrow": formats.ARROW,
+    }
+    offered = formats.available_formats(columnar=True)
+    out = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, media in accepts.items():
+            if media not in offered:
+                continue
+            headers = {"Accept": media, "Accept-Encoding": "identity"}
+            await client.get("/api/rivers", headers=headers)
+            samples = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                resp = await client.get("/api/rivers", headers=headers)
+                samples.append((time.perf_counter() - t0) * 1000.0)
+            out[name] = {"bytes": len(resp.content), **latency_stats(samples)}
+    return out
+
+
+def run(hazards: int, segments: int, repeat: int, seed: int) -> dict:
+    feeds = scale_feeds(hazards, seed)
+    rng = random.Random(seed)
+    lat, lon, coords = 33.5, 130.4, []
+    for _ in range(segments + 1):
+        coords.append((lat, lon))
+        lat, lon = lat + rng.uniform(-0.002, 0.006), lon + rng.uniform(-0.002, 0.008)
+    route = _score_route(coords, feeds["rivers"], feeds["roads"], feeds["landslides"], step_km=5.0)
+
+    report = {
+        "hazards": hazards,
+        "rivers": _compare(feeds["rivers"], RiverWaterLevel, repeat),
+        "route_segments": _compare(route["segments"], RouteSegmentRisk, repeat),
+    }
+    logging.disable(logging.WARNING)
+    configure_admission(rate=0, max_concurrent=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "bench.snap")
+            writer = SnapshotWriter(path, capacity=max(1 << 20, hazards * 1024))
+            writer.publish(feeds)
+            data_provider.configure_shared_snapshot(path)
+            try:
+                report["rivers_request"] = asyncio.run(_requests(repeat))
+            finally:
+                data_provider.configure_shared_snapshot(None)
+                writer.close()
+    finally:
+        logging.disable(logging.NOTSET)
+        configure_from_env()
+    return report
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hazards", type=int, default=2000)
+    parser.add_argument("--segments", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = run(args.hazards, args.segments, args.repeat, args.seed)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
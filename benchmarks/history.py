@@ -0,0 +1,140 @@
+"""Benchmark: snapshot history — log size, seek time and ``at=`` request latency.
+
+Logs a day of hourly national-size synthetic snapshots, then reports the
+bytes on disk per checkpoint and delta, the time to rebuild a state with
+and without the reader's cache, and ``/api/risk`` / ``/api/summary``
+latency for live requests vs ``at=`` requests into the history.
+
+Usage::
+
+    python -m benchmarks.history [--hazards 2000] [--hours 24] [--checkpoint-every 6]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+
+from backend.app.admission import configure_admission, configure_from_env
+from backend.app.main import app
+from backend.app.mcp import data_provider
+from backend.app.mcp.history import CHECKPOINT, HistoryReader, HistoryWriter
+from backend.app.mcp.recording import iter_records, segments
+from backend.app.mcp.snapshot_store import SnapshotWriter
+from backend.app.mcp.synthetic import EPOCH, SyntheticWorld
+from backend.app.models.schemas import validate_feeds
+from benchmarks.common import latency_stats, time_calls
+
+
+def _write(directory: str, hazards: int, hours: int, checkpoint_every: int, seed: int) -> dict:
+    world = SyntheticWorld.with_size(hazards, seed)
+    writer = HistoryWriter(directory, checkpoint_every)
+    for hour in range(hours):
+        at = EPOCH + timedelta(hours=hour)
+        writer.append(validate_feeds(world.feeds(at)), published_at=at.timestamp())
+    writer.close()
+    sizes: dict[str, list[int]] = {}
+    for rec in iter_records(directory):
+        sizes.setdefault(rec.feed, []).append(len(rec.payload))
+    return {
+        "bytes_on_disk": sum(p.stat().st_size for p in segments(directory)),
+        **{
+            f"{kind}_raw_bytes_mean": round(sum(n) / len(n)) for kind, n in sizes.items()
+        },
+        "checkpoints": len(sizes.get(CHECKPOINT, [])),
+    }
+
+
+def _seeks(directory: str, hours: int, repeat: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    times = [(EPOCH + timedelta(hours=h, minutes=30)).timestamp() for h in range(hours)]
+    cold = HistoryReader(directory, cache_size=0)
+    warm = HistoryReader(directory)
+    target = times[-1]
+    warm.state_at(target)
+    return {
+        "random_uncached": time_calls(lambda: cold.state_at(rng.choice(times)), repeat),
+        "repeat_cached": time_calls(lambda: warm.state_at(target), repeat),
+    }
+
+
+async def _requests(at: str, lat: float, lon: float, repeat: int) -> dict:
+    out = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path, params in (
+            ("/api/risk", {"lat": lat, "lon": lon}),
+            ("/api/summary", {}),
+        ):
+            for label, extra in (("live", {}), ("at", {"at": at})):
+                resp = await client.get(path, params={**params, **extra})
+                resp.raise_for_status()
+                samples = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    await client.get(path, params={**params, **extra})
+                    samples.append((time.perf_counter() - t0) * 1000.0)
+                out[f"{path}_{label}"] = latency_stats(samples)
+    return out
+
+
+def run(hazards: int, hours: int, checkpoint_every: int, repeat: int, seed: int) -> dict:
+    report: dict = {"hazards": hazards, "hours": hours, "checkpoint_every": checkpoint_every}
+    logging.disable(logging.WARNING)
+    configure_admission(rate=0, max_concurrent=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = str(Path(tmp) / "history")
+            report["log"] = _write(directory, hazards, hours, checkpoint_every, seed)
+            report["seek"] = _seeks(directory, hours, repeat, seed)
+
+            # Live requests read the latest snapshot; ``at=`` requests an
+            # hour inside the log, after one checkpoint interval of deltas.
+            latest = validate_feeds(
+                SyntheticWorld.with_size(hazards, seed).feeds(EPOCH + timedelta(hours=hours - 1)),
+            )
+            path = str(Path(tmp) / "bench.snap")
+            writer = SnapshotWriter(path, capacity=max(1 << 20, hazards * 1024))
+            writer.publish(latest)
+            data_provider.configure_shared_snapshot(path)
+            data_provider.configure_history(directory)
+            at = EPOCH + timedelta(hours=min(checkpoint_every - 1, hours - 1), minutes=30)
+            river = latest["rivers"][0]
+            try:
+                report["requests"] = asyncio.run(
+                    _requests(at.isoformat(), river["lat"], river["lon"], repeat),
+                )
+            finally:
+                data_provider.configure_history(None)
+                data_provider.configure_shared_snapshot(None)
+                writer.close()
+    finally:
+        logging.disable(logging.NOTSET)
+        configure_from_env()
+    return report
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hazards", type=int, default=2000)
+    parser.add_argument("--hours", type=int, default=24)
+    parser.add_argument("--checkpoint-every", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = run(args.hazards, args.hours, args.checkpoint_every, args.repeat, args.seed)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Endpoint load generator: throughput and p50/p99 latency per ``/api/*`` route.
+
+Drives the ASGI app in-process through ``httpx.ASGITransport`` by default,
+or a running server when ``base_url`` is given.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.common import latency_stats
+
+ROUTE_BODY = {
+    "geometry": {
+        "type": "LineString",
+        "coordinates": [[130.40, 33.59], [135.50, 34.69], [136.91, 35.18], [139.69, 35.68]],
+    },
+    "step_km": 1.0,
+}
+
+# path → (method, query params, JSON body); routes with path parameters
+# act on resources created here and are not loaded on their own.
+ENDPOINTS: dict[str, tuple[str, dict | None, dict | None]] = {
+    "/api/rivers": ("GET", None, None),
+    "/api/roads": ("GET", None, None),
+    "/api/landslides": ("GET", None, None),
+    "/api/warnings": ("GET", None, None),
+    "/api/risk": ("GET", {"lat": 35.68, "lon": 139.69}, None),
+    "/api/risk/profiles": ("GET", None, None),
+    "/api/risk/route": ("POST", None, ROUTE_BODY),
+    "/api/subscriptions": ("POST", None, {"lat": 35.68, "lon": 139.69, "level": "high"}),
+    "/api/summary": ("GET", None, None),
+    "/api/health": ("GET", None, None),
+}
+
+
+async def load_endpoint(
+    client: httpx.AsyncClient, path: str, requests: int, concurrency: int,
+) -> dict:
+    """Fire ``requests`` calls at ``path`` with ``concurrency`` in flight."""
+    method, params, body = ENDPOINTS[path]
+    samples: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            t0 = time.perf_counter()
+            resp = await client.request(method, path, params=params, json=body)
+            samples.append((time.perf_counter() - t0) * 1000.0)
+            if resp.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    return {
+        **latency_stats(samples),
+        "errors": errors,
+        "throughput_rps": round(len(samples) / wall, 2) if wall > 0 else 0.0,
+    }
+
+
+async def load_all(
+    requests: int, concurrency: int, base_url: str | None = None, paths: list[str] | None = None,
+) -> dict[str, dict]:
+    """Load every endpoint in turn and return per-path statistics."""
+    if base_url is None:
+        from backend.app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+    else:
+        client = httpx.AsyncClient(base_url=base_url, timeout=60)
+    results: dict[str, dict] = {}
+    async with client:
+        for path in paths or ENDPOINTS:
+            await load_endpoint(client, path, min(requests, concurrency), concurrency)  # warm-up
+            results[path] = await load_endpoint(client, path, requests, concurrency)
+    return results
@@ -0,0 +1,84 @@
+"""Regenerate the synthetic JMA fixtures in ``benchmarks/fixtures``.
+
+The fixtures are not captures of the real bosai feeds. Each prefecture the
+parsers know gets a few municipality-style area codes, and every area's
+warning, flood and sediment levels are derived from the synthetic typhoon
+scenario's rainfall at :data:`benchmarks.common.SCENARIO_AT`. The same seed
+always writes the same files.
+
+Usage::
+
+    python -m benchmarks.make_fixtures [--seed 0] [--out benchmarks/fixtures]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+from backend.app.mcp import data_provider
+from backend.app.mcp.synthetic import EPOCH, get_scenario
+from benchmarks.common import FEEDS, FIXTURE_DIR, SCENARIO_AT
+
+# Rain accumulated over these hours drives the sediment (soil) level.
+_SOIL_WINDOW_H = (0.0, 2.0, 4.0)
+
+
+def _warnings(rain: float, coastal: bool, rng: random.Random) -> list[dict]:
+    """Pick warning kinds for an area from its rain intensity."""
+    kinds = []
+    if rain >= 0.3:
+        kinds.append("33")  # heavy rain
+    if rain >= 0.45:
+        kinds.append("03")  # flood
+    if rain >= 0.35:
+        kinds.append("04")  # storm
+    if coastal and rain >= 0.4:
+        kinds += ["07", "08"]  # waves, storm surge
+    if rain >= 0.8:
+        kinds.append("10")  # heavy rain emergency
+    # Some areas are just issued, some continued, a few already lifted.
+    return [
+        {"code": code, "status": rng.choice(("発表", "継続", "継続", "解除"))}
+        for code in kinds
+    ]
+
+
+def build(seed: int = 0) -> dict[str, dict]:
+    """Return {feed: map.json payload} for the three fixture feeds."""
+    scenario = get_scenario("typhoon")
+    hour = (SCENARIO_AT - EPOCH).total_seconds() / 3600.0
+    rng = random.Random(f"{seed}:fixtures")
+    payloads: dict[str, dict] = {feed: {} for feed in FEEDS}
+    for prefix, centre in data_provider._AREA_CENTER_COORDS.items():
+        coastal = rng.random() < 0.6
+        for i in range(1, 4 + rng.randrange(6)):
+            code = f"{prefix}{i:02d}"
+            lat = centre["lat"] + rng.uniform(-0.4, 0.4)
+            lon = centre["lon"] + rng.uniform(-0.4, 0.4)
+            rain = scenario.rain(lat, lon, hour)
+            soaked = sum(scenario.rain(lat, lon, hour - h) for h in _SOIL_WINDOW_H) / len(_SOIL_WINDOW_H)
+            payloads["warnings"][code] = {"warnings": _warnings(rain, coastal, rng)}
+            payloads["flood"][code] = {"level": min(int(rain * 6 + rng.random()), 5)}
+            payloads["sediment"][code] = {"level": min(int(soaked * 6 + rng.random()), 5)}
+    return payloads
+
+
+def main(argv: list[str] | None = None) -> list[Path]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=FIXTURE_DIR)
+    args = parser.parse_args(argv)
+    written = []
+    for feed, payload in build(args.seed).items():
+        path = args.out / FEEDS[feed][0]
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+        written.append(path)
+        print(f"{path}: {len(payload)} areas")
+    return written
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Micro-benchmarks for the CPU hot paths at a given data size."""
+
+from __future__ import annotations
+
+import random
+
+from backend.app.services.alerting import AlertEngine, Subscription
+from backend.app.services.risk_scoring import _score_from_data, score_points
+from backend.app.services.situation_summary import _build_summary
+from benchmarks.common import FEEDS, PARSERS, scale_feeds, scale_payload, time_calls
+
+
+def run_micro(hazards: int, repeat: int = 20, seed: int = 0) -> dict[str, dict]:
+    """Time scoring, summary building and the feed parsers on ``hazards`` records."""
+    feeds = scale_feeds(hazards, seed)
+    rivers, roads, landslides = feeds["rivers"], feeds["roads"], feeds["landslides"]
+    rng = random.Random(seed)
+    points = [(rng.uniform(31.0, 43.5), rng.uniform(129.5, 145.5)) for _ in range(1000)]
+
+    engine = AlertEngine(cooldown_s=0)
+    for lat, lon in points * 10:
+        engine.add(Subscription(lat=lat, lon=lon, level="moderate"))
+    areas = AlertEngine(cooldown_s=0)
+    for lat, lon in points * 10:
+        areas.add(Subscription(lat=lat, lon=lon, radius_km=50, profile="mountain", level="moderate"))
+
+    results = {
+        "score_from_data": time_calls(
+            lambda: _score_from_data(35.68, 139.69, rivers, roads, landslides), repeat,
+        ),
+        "score_points_1k": time_calls(
+            lambda: score_points(points, rivers, roads, landslides), max(3, repeat // 4),
+        ),
+        "build_summary": time_calls(lambda: _build_summary(rivers, roads, landslides), repeat),
+        "alerts_10k_subscriptions": time_calls(lambda: engine.evaluate(feeds), max(3, repeat // 4)),
+        "alerts_10k_area_subscriptions": time_calls(
+            lambda: areas.evaluate(feeds), max(3, repeat // 4),
+        ),
+    }
+    for feed in FEEDS:
+        payload = scale_payload(feed, hazards)
+        parser = PARSERS[feed]
+        results[f"parse_{feed}"] = time_calls(lambda: parser(payload), repeat)
+    return results
@@ -0,0 +1,125 @@
+"""Run the benchmark suite and emit JSON results.
+
+Usage::
+
+    python -m benchmarks.run --sizes 1000,10000,100000 --out bench.json
+    python -m benchmarks.compare baseline.json bench.json
+
+For each size the suite runs the micro-benchmarks and then loads every
+``/api/*`` endpoint. ``--source snapshot`` (default) serves scaled feeds
+through the shared snapshot store so every endpoint sees ``size``
+hazards. ``--source stub`` serves scaled JMA payloads from a local stub
+server, so the fetch and parse path is measured as well. ``--source replay
+--replay-dir DIR`` serves a recorded disaster day (see
+``backend.app.mcp.recording``) through the same path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from backend.app.admission import configure_admission, configure_from_env
+from backend.app.mcp import data_provider
+from backend.app.mcp.snapshot_store import SnapshotWriter
+from backend.app.models.schemas import validate_feeds
+from benchmarks.common import FEEDS, run_metadata, scale_feeds, scale_payload
+from benchmarks.load import load_all
+from benchmarks.micro import run_micro
+from benchmarks.stub_server import StubServer
+
+
+def _bench_size(size: int, args: argparse.Namespace) -> dict:
+    result: dict = {}
+    if not args.skip_micro:
+        result["micro"] = run_micro(size, repeat=args.repeat, seed=args.seed)
+    if args.skip_load:
+        return result
+
+    if args.source == "stub":
+        payloads = {feed: scale_payload(feed, size) for feed in FEEDS}
+        with StubServer(payloads, latency_s=args.stub_latency_ms / 1000.0) as stub:
+            original = data_provider.JMA_BASE_URL
+            data_provider.configure_upstream(stub.base_url)
+            try:
+                result["endpoints"] = asyncio.run(load_all(args.requests, args.concurrency))
+            finally:
+                data_provider.configure_upstream(original)
+        return result
+
+    if args.source == "replay":
+        # Recorded payloads are served at their original size; ``size`` only
+        # labels the run.
+        data_provider.configure_replay(args.replay_dir, speed=args.replay_speed, loop=True)
+        try:
+            result["endpoints"] = asyncio.run(load_all(args.requests, args.concurrency))
+        finally:
+            data_provider.configure_replay(None)
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.snap")
+        writer = SnapshotWriter(path, capacity=max(1 << 20, size * 1024))
+        # Published as the ingestor would: validated once against the schemas.
+        writer.publish(validate_feeds(scale_feeds(size, args.seed)))
+        data_provider.configure_shared_snapshot(path)
+        try:
+            result["endpoints"] = asyncio.run(load_all(args.requests, args.concurrency))
+        finally:
+            data_provider.configure_shared_snapshot(None)
+            writer.close()
+    return result
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="InfraScope benchmark suite")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated hazard counts")
+    parser.add_argument("--source", choices=("snapshot", "stub", "replay"), default="snapshot")
+    parser.add_argument("--replay-dir", help="Recording to replay with --source replay")
+    parser.add_argument("--replay-speed", type=float, default=60.0)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=20, help="Micro-benchmark repetitions")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument(
+        "--keep-admission", action="store_true",
+        help="Keep rate limiting and load shedding on during the load phase",
+    )
+    parser.add_argument("--out", help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.source == "replay" and not args.replay_dir:
+        parser.error("--source replay requires --replay-dir")
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    # Fallback warnings would dominate the output at high request counts.
+    logging.disable(logging.WARNING)
+    if not args.keep_admission:
+        # Every in-process request comes from one client; measure capacity
+        # rather than the rate limiter.
+        configure_admission(rate=0, max_concurrent=0)
+    try:
+        report = {
+            "meta": run_metadata({k: v for k, v in vars(args).items() if k != "out"}),
+            "results": {str(size): _bench_size(size, args) for size in sizes},
+        }
+    finally:
+        logging.disable(logging.NOTSET)
+        configure_from_env()
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+    return report
+
+
+if __name__ == "__main__":
+    main()
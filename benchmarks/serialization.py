@@ -0,0 +1,108 @@
+"""Benchmark: per-request response cost of snapshot lists, fast path vs validation.
+
+Publishes a validated national-size snapshot and times the list routes
+with the pre-encoded fast path on and off (off = FastAPI validates and
+serialises every item on every request). Also times the serialisation
+step alone: validate + dump vs a memo lookup.
+
+Usage::
+
+    python -m benchmarks.serialization [--hazards 2000] [--repeat 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from backend.app import formats
+from backend.app.admission import configure_admission, configure_from_env
+from backend.app.main import app
+from backend.app.mcp import data_provider
+from backend.app.mcp.snapshot_store import SnapshotRows, SnapshotWriter
+from backend.app.models.schemas import FEED_SCHEMAS, validate_feeds
+from benchmarks.common import latency_stats, scale_feeds, time_calls
+
+ROUTES = {"/api/rivers": "rivers", "/api/landslides": "landslides", "/api/roads": "roads"}
+
+
+async def _time_routes(repeat: int, accept_encoding: str) -> dict:
+    out = {}
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": accept_encoding}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ROUTES:
+            await client.get(path, headers=headers)
+            samples = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                await client.get(path, headers=headers)
+                samples.append((time.perf_counter() - t0) * 1000.0)
+            out[path] = latency_stats(samples)
+    return out
+
+
+def _serialisation_only(feeds: dict, repeat: int) -> dict:
+    out = {}
+    for path, feed in ROUTES.items():
+        schema = list[FEED_SCHEMAS[feed]]
+        rows = SnapshotRows(feeds[feed])
+        rows.memo["json"] = formats.encode_json(rows, schema)
+        out[path] = {
+            "validate_and_dump": time_calls(lambda: formats.encode_json(rows, schema), repeat),
+            "memo_lookup": time_calls(lambda: rows.memo["json"], repeat),
+        }
+    return out
+
+
+def run(hazards: int, repeat: int, seed: int) -> dict:
+    feeds = validate_feeds(scale_feeds(hazards, seed))
+    report: dict = {
+        "hazards": hazards,
+        "serialisation": _serialisation_only(feeds, repeat),
+    }
+    logging.disable(logging.WARNING)
+    configure_admission(rate=0, max_concurrent=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "bench.snap")
+            writer = SnapshotWriter(path, capacity=max(1 << 20, hazards * 1024))
+            writer.publish(feeds)
+            data_provider.configure_shared_snapshot(path)
+            try:
+                for encoding in ("identity", "gzip"):
+                    for label, enabled in (("validated", False), ("fast_path", True)):
+                        formats.set_fast_path(enabled)
+                        report[f"requests_{encoding}_{label}"] = asyncio.run(
+                            _time_routes(repeat, encoding),
+                        )
+            finally:
+                formats.set_fast_path(True)
+                data_provider.configure_shared_snapshot(None)
+                writer.close()
+    finally:
+        logging.disable(logging.NOTSET)
+        configure_from_env()
+    return report
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hazards", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = run(args.hazards, args.repeat, args.seed)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark: shared snapshot bytes vs each worker's decoded copy.
+
+Publishes a validated national-size snapshot and measures, with
+tracemalloc, the heap a worker's reader allocates to decode it. The
+encoded snapshot is mapped once for all workers; the decoded feeds are
+allocated again in every worker. Also times a version switch when every
+feed changed vs when only one did (unchanged feeds are not decoded).
+
+Usage::
+
+    python -m benchmarks.snapshot_memory [--hazards 2000] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from backend.app.mcp.snapshot_store import SnapshotReader, SnapshotWriter
+from backend.app.models.schemas import validate_feeds
+from benchmarks.common import scale_feeds
+
+
+def _decoded_bytes(path: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    reader = SnapshotReader(path, reopen_interval=0)
+    reader.read()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    reader.close()
+    return used
+
+
+def _switch_ms(writer: SnapshotWriter, reader: SnapshotReader, feeds: dict) -> float:
+    writer.publish(feeds)
+    t0 = time.perf_counter()
+    reader.read()
+    return round((time.perf_counter() - t0) * 1000.0, 3)
+
+
+def run(hazards: int, workers: int, seed: int) -> dict:
+    feeds = validate_feeds(scale_feeds(hazards, seed))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.snap")
+        writer = SnapshotWriter(path, capacity=max(1 << 20, hazards * 1024))
+        writer.publish(feeds)
+        shared = sum(
+            len(json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode())
+            for rows in feeds.values()
+        )
+        decoded = _decoded_bytes(path)
+
+        reader = SnapshotReader(path, reopen_interval=0)
+        reader.read()
+        roads_changed = {**feeds, "roads": feeds["roads"][1:]}
+        switch = {
+            "one_feed_changed_ms": _switch_ms(writer, reader, roads_changed),
+            "all_feeds_changed_ms": _switch_ms(
+                writer, reader, {name: rows[1:] for name, rows in feeds.items()},
+            ),
+        }
+        reader.close()
+        writer.close()
+    return {
+        "hazards": hazards,
+        "shared_encoded_bytes": shared,
+        "decoded_bytes_per_worker": decoded,
+        "decoded_to_encoded": round(decoded / shared, 1),
+        f"decoded_bytes_{workers}_workers": decoded * workers,
+        "version_switch": switch,
+    }
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hazards", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = run(args.hazards, args.workers, args.seed)
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
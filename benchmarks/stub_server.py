@@ -0,0 +1,63 @@
+"""Local stub of the JMA bosai endpoints serving fixture payloads.
+
+Runs in a background thread so benchmarks exercise the real fetch → parse
+path (httpx, JSON decoding, normalisation) without network access::
+
+    with StubServer({"flood": payload_bytes, ...}, latency_s=0.005) as stub:
+        data_provider.configure_upstream(stub.base_url)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.common import FEEDS, load_fixture
+
+
+class StubServer:
+    """Threaded HTTP server answering JMA paths with fixed payloads."""
+
+    def __init__(self, payloads: dict[str, bytes] | None = None, latency_s: float = 0.0):
+        payloads = payloads or {}
+        routes = {
+            path: payloads.get(feed) or load_fixture(feed) for feed, (_, path) in FEEDS.items()
+        }
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                body = routes.get(self.path)
+                if latency_s:
+                    time.sleep(latency_s)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,111 @@
+"""Tests for rate limiting and admission control."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import admission
+from backend.app.admission import ConcurrencyLimiter, Overloaded, TokenBucketLimiter
+from backend.app.main import app
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_per_client():
+    clock = _Clock()
+    limiter = TokenBucketLimiter(rate=2.0, burst=3, clock=clock)
+    assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("a") == pytest.approx(0.5)
+    assert limiter.acquire("b") == 0.0  # other clients are unaffected
+    clock.now = 0.5
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("a", cost=2) == pytest.approx(1.0)
+
+
+def test_token_bucket_caps_cost_at_burst():
+    clock = _Clock()
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, clock=clock)
+    assert limiter.acquire("a", cost=4.0) == 0.0
+    assert limiter.acquire("a", cost=4.0) == pytest.approx(1.0)
+    clock.now = 1.0
+    assert limiter.acquire("a", cost=4.0) == 0.0
+
+
+def test_token_bucket_evicts_oldest_clients():
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, max_clients=2)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key)
+    assert len(limiter) == 2
+    assert limiter.acquire("a") == 0.0  # evicted, so it starts with a full bucket
+
+
+async def test_concurrency_limiter_queues_then_sheds():
+    gate = ConcurrencyLimiter(limit=1, max_queue=1, queue_timeout=1.0)
+    await gate.acquire()
+    waiter = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+    assert gate.waiting == 1
+    with pytest.raises(Overloaded):
+        await gate.acquire()  # queue full
+    gate.release()
+    await waiter  # slot handed over
+    assert gate.active == 1 and gate.waiting == 0
+    gate.release()
+    assert gate.active == 0
+
+
+async def test_concurrency_limiter_times_out():
+    gate = ConcurrencyLimiter(limit=1, max_queue=4, queue_timeout=0.01)
+    await gate.acquire()
+    with pytest.raises(Overloaded) as exc:
+        await gate.acquire()
+    assert exc.value.retry_after >= 1
+    assert gate.waiting == 0
+
+
+@pytest.fixture
+def strict_admission():
+    admission.configure_admission(rate=0.001, burst=2, max_concurrent=8)
+    yield
+    admission.configure_from_env()
+
+
+def test_expensive_routes_are_rate_limited_per_client(strict_admission):
+    client = TestClient(app)
+    codes = [client.get("/api/risk", params={"lat": 35.68, "lon": 139.69}).status_code for _ in range(3)]
+    assert codes == [200, 200, 429]
+    limited = client.get("/api/risk", params={"lat": 35.68, "lon": 139.69})
+    assert int(limited.headers["Retry-After"]) > 0
+    # Cheap routes and the dashboard are not limited.
+    assert client.get("/api/risk/profiles").status_code == 200
+    assert client.get("/").status_code == 200
+    assert client.get("/api/health").json()["admission"]["rate_limit"]["clients"] == 1
+
+
+def test_costly_route_passes_with_a_small_burst():
+    admission.configure_admission(rate=0.001, burst=1, max_concurrent=8)
+    try:
+        client = TestClient(app)
+        route = {"geometry": {"type": "LineString", "coordinates": [[139.69, 35.68], [139.2, 35.4]]}}
+        codes = [client.post("/api/risk/route", json=route).status_code for _ in range(2)]
+    finally:
+        admission.configure_from_env()
+    assert codes == [200, 429]
+
+
+def test_full_queue_sheds_with_503():
+    admission.configure_admission(rate=0, max_concurrent=1, max_queue=0)
+    try:
+        admission._concurrency.active = 1  # a request is already running
+        resp = TestClient(app).get("/api/summary")
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "1"
+    finally:
+        admission.configure_from_env()
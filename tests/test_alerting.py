@@ -0,0 +1,247 @@
+"""Tests for the subscription alerting engine."""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.services import alerting
+from backend.app.services.alerting import (
+    AlertEngine,
+    MemorySink,
+    QueueSink,
+    Subscription,
+    SubscriptionLog,
+)
+from backend.app.services.risk_scoring import (
+    _haversine_km,
+    _landslide_severity,
+    _river_severity,
+    _road_severity,
+    score_points,
+)
+from backend.app.services.scoring_profiles import get_profile
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _river(lat, lon, status):
+    return {"lat": lat, "lon": lon, "status": status, "name": "n", "river": "r"}
+
+
+def _feeds(*rivers):
+    return {"rivers": list(rivers), "roads": [], "landslides": []}
+
+
+def test_point_subscriptions_score_like_risk_endpoint():
+    rng = random.Random(3)
+    feeds = {
+        "rivers": [_river(rng.uniform(34, 37), rng.uniform(135, 141), "danger") for _ in range(40)],
+        "roads": [
+            {"lat": rng.uniform(34, 37), "lon": rng.uniform(135, 141), "status": "closed"}
+            for _ in range(40)
+        ],
+        "landslides": [
+            {"lat": rng.uniform(34, 37), "lon": rng.uniform(135, 141), "risk_score": 0.9}
+            for _ in range(40)
+        ],
+    }
+    engine = AlertEngine(cooldown_s=0)
+    subs = [
+        engine.add(Subscription(lat=rng.uniform(34, 37), lon=rng.uniform(135, 141), level="moderate"))
+        for _ in range(500)
+    ]
+    got = {a["subscription_id"]: a for a in engine.evaluate(feeds)}
+    expected = score_points(
+        [(s.lat, s.lon) for s in subs], feeds["rivers"], feeds["roads"], feeds["landslides"],
+    )
+    assert got
+    for sub, ref in zip(subs, expected):
+        if ref["level"] == "low":
+            assert sub.id not in got
+        else:
+            assert got[sub.id]["overall_score"] == ref["overall_score"]
+            assert got[sub.id]["level"] == ref["level"]
+
+
+def test_area_subscription_reaches_hazard_outside_point_radius():
+    engine = AlertEngine(cooldown_s=0)
+    # 0.5° of latitude ≈ 55 km: beyond the 30 km default radius of the point.
+    point = engine.add(Subscription(lat=35.5, lon=139.0, level="moderate"))
+    area = engine.add(Subscription(lat=35.5, lon=139.0, radius_km=50, level="moderate"))
+    ids = {a["subscription_id"] for a in engine.evaluate(_feeds(_river(36.0, 139.0, "danger")))}
+    assert ids == {area.id}
+    assert point.id not in ids
+
+
+def _brute_force_score(sub, feeds):
+    """Area score of ``sub`` by checking every hazard (reference for the grid)."""
+    profile = get_profile(sub.profile)
+    layers = (
+        [(r["lat"], r["lon"], _river_severity(r)) for r in feeds["rivers"]],
+        [(rd["lat"], rd["lon"], _road_severity(rd)) for rd in feeds["roads"]],
+        [(ls["lat"], ls["lon"], _landslide_severity(ls)) for ls in feeds["landslides"]],
+    )
+    total = 0.0
+    for hazards, radius, falloff, weight in zip(layers, profile.radii, profile.falloffs, profile.weights):
+        best = 0.0
+        for lat, lon, severity in hazards:
+            dist = _haversine_km(sub.lat, sub.lon, lat, lon) - sub.radius_km
+            if severity > 0 and dist < radius:
+                best = max(best, falloff(max(dist, 0.0)) * severity)
+        total += best * weight
+    return min(round(total, 3), 1.0)
+
+
+def test_area_subscriptions_at_scale_match_brute_force():
+    from benchmarks.common import scale_feeds
+
+    feeds = scale_feeds(300, 1)
+    rng = random.Random(5)
+    engine = AlertEngine(cooldown_s=0)
+    subs = [
+        engine.add(Subscription(
+            lat=rng.uniform(31.0, 43.5), lon=rng.uniform(129.5, 145.5),
+            radius_km=rng.choice((0.0, 3.0, 15.0, 50.0)),
+            profile=rng.choice(("default", "mountain")), level="moderate",
+        ))
+        for _ in range(20_000)
+    ]
+    # One very wide subscription must not change anyone else's result.
+    wide = engine.add(Subscription(lat=36.0, lon=138.0, radius_km=100, level="moderate"))
+    got = {a["subscription_id"]: a["overall_score"] for a in engine.evaluate(feeds)}
+    assert len(got) > 100
+    for sub in rng.sample(subs, 300) + [wide]:
+        expected = _brute_force_score(sub, feeds)
+        if get_profile(sub.profile).level(expected) == "low":
+            assert sub.id not in got
+        else:
+            assert got[sub.id] == expected
+
+
+def test_alerts_are_deduplicated_escalated_and_resolved():
+    clock = _Clock()
+    engine = AlertEngine(cooldown_s=0, clock=clock)
+    sub = engine.add(Subscription(lat=35.0, lon=139.0, level="moderate"))
+
+    warning = _feeds(_river(35.0, 139.0, "warning"))  # 0.6 x 0.4 = 0.24 → low
+    danger = _feeds(_river(35.0, 139.0, "danger"))  # 0.4 → moderate
+    assert engine.evaluate(warning) == []
+    first = engine.evaluate(danger)
+    assert [(a["kind"], a["level"]) for a in first] == [("triggered", "moderate")]
+    assert engine.evaluate(danger) == []  # unchanged → no repeat
+
+    both = {**danger, "landslides": [{"lat": 35.0, "lon": 139.0, "risk_score": 1.0}]}
+    escalated = engine.evaluate(both)
+    assert [(a["kind"], a["level"], a["previous_level"]) for a in escalated] == [
+        ("escalated", "critical", "moderate"),
+    ]
+    resolved = engine.evaluate(_feeds())
+    assert [(a["kind"], a["subscription_id"]) for a in resolved] == [("resolved", sub.id)]
+
+
+def test_cooldown_holds_back_changes_until_it_expires():
+    clock = _Clock()
+    engine = AlertEngine(cooldown_s=300, clock=clock)
+    engine.add(Subscription(lat=35.0, lon=139.0, level="moderate"))
+    assert len(engine.evaluate(_feeds(_river(35.0, 139.0, "danger")))) == 1
+    clock.now += 60
+    assert engine.evaluate(_feeds()) == []  # resolution suppressed
+    clock.now += 300
+    assert [a["kind"] for a in engine.evaluate(_feeds())] == ["resolved"]
+
+
+async def test_process_delivers_to_every_sink():
+    memory, queue = MemorySink(), QueueSink(maxsize=1)
+    engine = AlertEngine(sinks=[memory, queue], cooldown_s=0)
+    engine.add(Subscription(lat=35.0, lon=139.0, level="moderate"))
+    engine.add(Subscription(lat=35.01, lon=139.0, level="moderate"))
+    alerts = await engine.process(_feeds(_river(35.0, 139.0, "danger")))
+    assert len(alerts) == 2
+    assert memory.alerts == alerts
+    assert queue.queue.qsize() == 1 and queue.dropped == 1
+
+
+def test_subscription_log_is_shared_between_engines(tmp_path):
+    path = str(tmp_path / "subs.jsonl")
+    api = AlertEngine(log=SubscriptionLog(path))
+    evaluator = AlertEngine(log=SubscriptionLog(path), cooldown_s=0)
+    kept = api.add(Subscription(lat=35.0, lon=139.0, level="moderate"))
+    gone = api.add(Subscription(lat=35.0, lon=139.0, level="moderate"))
+    api.remove(gone.id)
+    alerts = evaluator.evaluate(_feeds(_river(35.0, 139.0, "danger")))
+    assert [a["subscription_id"] for a in alerts] == [kept.id]
+
+
+def test_get_and_remove_see_subscriptions_from_other_engines(tmp_path):
+    path = str(tmp_path / "subs.jsonl")
+    first = AlertEngine(log=SubscriptionLog(path))
+    second = AlertEngine(log=SubscriptionLog(path))
+    sub = first.add(Subscription(lat=35.0, lon=139.0, level="moderate"))
+    assert second.get(sub.id) == sub
+    other = second.add(Subscription(lat=36.0, lon=140.0, level="high"))
+    assert first.remove(other.id)
+    assert second.get(other.id) is None
+    assert not second.remove(other.id)
+    assert second.remove(sub.id)
+    assert first.get(sub.id) is None
+
+
+def test_invalid_subscription_is_rejected():
+    engine = AlertEngine()
+    with pytest.raises(ValueError):
+        engine.add(Subscription(lat=35.0, lon=139.0, level="low"))
+    with pytest.raises(ValueError):
+        engine.add(Subscription(lat=35.0, lon=139.0, profile="nope"))
+
+
+def test_webhook_urls_must_be_on_allowlisted_hosts(monkeypatch):
+    monkeypatch.setattr(alerting, "_webhook_hosts", frozenset())
+    alerting.configure_webhook_hosts("hooks.example.com, ops.example.com")
+    engine = AlertEngine()
+    engine.add(Subscription(lat=35.0, lon=139.0, webhook_url="https://hooks.example.com/a"))
+    for url in (
+        "http://169.254.169.254/latest/meta-data/",
+        "http://localhost:8000/admin",
+        "file:///etc/passwd",
+        "https://hooks.example.com.evil.test/",
+    ):
+        with pytest.raises(ValueError):
+            engine.add(Subscription(lat=35.0, lon=139.0, webhook_url=url))
+
+    monkeypatch.setattr(alerting, "_engine", AlertEngine())
+    client = TestClient(app)
+    body = {"lat": 35.0, "lon": 139.0, "webhook_url": "http://10.0.0.1/hook"}
+    assert client.post("/api/subscriptions", json=body).status_code == 422
+    body["webhook_url"] = "ftp://hooks.example.com/"
+    assert client.post("/api/subscriptions", json=body).status_code == 422
+    body["webhook_url"] = "https://ops.example.com/hook"
+    assert client.post("/api/subscriptions", json=body).status_code == 201
+
+
+async def test_webhook_sink_drops_disallowed_urls(monkeypatch):
+    monkeypatch.setattr(alerting, "_webhook_hosts", frozenset())
+    sink = alerting.WebhookSink()
+    await sink.send([{"subscription_id": "x", "webhook_url": "http://127.0.0.1:1/"}])
+    assert sink.failures == 1
+
+
+def test_subscription_endpoints(monkeypatch):
+    monkeypatch.setattr(alerting, "_engine", AlertEngine())
+    client = TestClient(app)
+    resp = client.post("/api/subscriptions", json={"lat": 35.68, "lon": 139.69, "radius_km": 5})
+    assert resp.status_code == 201
+    sub = resp.json()
+    assert sub["level"] == "high" and sub["id"]
+    assert client.get(f"/api/subscriptions/{sub['id']}").json() == sub
+    assert client.delete(f"/api/subscriptions/{sub['id']}").status_code == 204
+    assert client.get(f"/api/subscriptions/{sub['id']}").status_code == 404
+    bad = client.post("/api/subscriptions", json={"lat": 35.0, "lon": 139.0, "profile": "nope"})
+    assert bad.status_code == 422
@@ -79,3 +79,39 @@ def test_api_landslides_has_source_field():
     for item in data:
         assert "source" in item
         assert item["source"] in ("mock", "jma")
+
+
+def test_api_route_risk_geojson():
+    body = {"geometry": {"type": "LineString", "coordinates": [[139.69, 35.68], [139.2, 35.4]]}}
+    resp = client.post("/api/risk/route", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["distance_km"] > 0
+    assert len(data["segments"]) == 1
+    assert isinstance(data["road_closures"], list)
+
+
+def test_api_route_risk_invalid_route():
+    resp = client.post("/api/risk/route", json={"polyline": "_p~iF"})
+    assert resp.status_code == 422
+
+
+@pytest.mark.parametrize("geometry", [
+    {"type": "LineString", "coordinates": 5},
+    {"type": "LineString", "coordinates": [[139.0, 35.0], 7]},
+    {"type": "Feature", "geometry": "x"},
+])
+def test_api_route_risk_malformed_geojson(geometry):
+    resp = client.post("/api/risk/route", json={"geometry": geometry})
+    assert resp.status_code == 422
+
+
+def test_api_risk_with_profile():
+    resp = client.get("/api/risk", params={"lat": 35.68, "lon": 139.69, "profile": "urban"})
+    assert resp.status_code == 200
+    assert resp.json()["profile"] == "urban"
+
+
+def test_api_risk_unknown_profile():
+    resp = client.get("/api/risk", params={"lat": 35.68, "lon": 139.69, "profile": "nope"})
+    assert resp.status_code == 422
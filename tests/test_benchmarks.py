@@ -0,0 +1,55 @@
+"""Smoke tests for the benchmark suite (tiny sizes, no timing assertions)."""
+
+import json
+
+import httpx
+from backend.app.mcp import data_provider
+from backend.app.routers.disaster import router
+from benchmarks import compare, run
+from benchmarks.common import FEEDS, PARSERS, scale_payload
+from benchmarks.load import ENDPOINTS
+from benchmarks.stub_server import StubServer
+
+
+def test_every_api_route_is_loaded():
+    paths = {route.path for route in router.routes if "{" not in route.path}
+    assert paths == set(ENDPOINTS)
+
+
+def test_scaled_payloads_parse_to_requested_size():
+    assert len(PARSERS["flood"](scale_payload("flood", 300))) > 0
+    assert len(json.loads(scale_payload("sediment", 300))) >= 300
+
+
+async def test_stub_server_serves_jma_paths():
+    payload = scale_payload("flood", 50)
+    with StubServer({"flood": payload}) as stub:
+        async with httpx.AsyncClient(base_url=stub.base_url) as client:
+            resp = await client.get(FEEDS["flood"][1])
+            missing = await client.get("/nope")
+    assert resp.content == payload
+    assert missing.status_code == 404
+    assert stub.requests == 2
+
+
+def test_run_and_compare(tmp_path):
+    out = tmp_path / "new.json"
+    report = run.main([
+        "--sizes", "200", "--requests", "2", "--concurrency", "1", "--repeat", "1",
+        "--out", str(out),
+    ])
+    assert data_provider.shared_snapshot_status() is None
+    endpoints = report["results"]["200"]["endpoints"]
+    assert set(endpoints) == set(ENDPOINTS)
+    assert all(stats["errors"] == 0 for stats in endpoints.values())
+    assert "commit" in report["meta"]
+
+    baseline = json.loads(out.read_text())
+    slower = json.loads(out.read_text())
+    slower["results"]["200"]["micro"]["build_summary"]["p50_ms"] *= 2
+    rows = compare.compare(baseline, slower, threshold=0.10)
+    assert [r["metric"] for r in rows if r["regressed"]] == ["200/micro/build_summary/p50_ms"]
+
+    (tmp_path / "slow.json").write_text(json.dumps(slower))
+    assert compare.main([str(out), str(out)]) == 0
+    assert compare.main([str(out), str(tmp_path / "slow.json")]) == 1
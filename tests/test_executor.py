@@ -0,0 +1,121 @@
+"""Tests for the CPU offload executor."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.services import executor as executor_mod
+from backend.app.services.executor import (
+    ExecutorBusy,
+    JobCancelled,
+    OffloadExecutor,
+    _current_request,
+)
+from backend.app.services.risk_scoring import _score_from_data
+from backend.app.services.scoring_profiles import get_profile
+
+
+def _spin(seconds: float) -> str:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return "done"
+
+
+class _GoneRequest:
+    async def is_disconnected(self) -> bool:
+        return True
+
+
+class _LiveRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def test_route_by_size():
+    ex = OffloadExecutor(process_workers=1, inline_below=10, process_from=100)
+    assert ex.route(5) == "inline"
+    assert ex.route(50) == "thread"
+    assert ex.route(500) == "process"
+    assert OffloadExecutor(process_workers=0, inline_below=10, process_from=100).route(500) == "thread"
+
+
+async def test_thread_job_keeps_loop_responsive():
+    ex = OffloadExecutor(inline_below=0)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        assert await ex.run(_spin, 0.2, size=1) == "done"
+    finally:
+        task.cancel()
+        ex.shutdown()
+    assert ticks >= 5
+    assert ex.stats()["completed"]["thread"] == 1
+
+
+async def test_thread_job_sees_request_context():
+    ex = OffloadExecutor(inline_below=0)
+    request = _LiveRequest()
+    token = _current_request.set(request)
+    try:
+        assert await ex.run(_current_request.get, size=1) is request
+    finally:
+        _current_request.reset(token)
+        ex.shutdown()
+
+
+async def test_pending_limit_raises_busy():
+    ex = OffloadExecutor(inline_below=0, max_pending=1)
+    first = asyncio.create_task(ex.run(_spin, 0.2, size=1))
+    await asyncio.sleep(0)
+    with pytest.raises(ExecutorBusy):
+        await ex.run(_spin, 0.0, size=1)
+    assert await first == "done"
+    assert ex.stats()["rejected"] == 1
+    ex.shutdown()
+
+
+async def test_disconnect_cancels_job():
+    ex = OffloadExecutor(inline_below=0)
+    token = _current_request.set(_GoneRequest())
+    try:
+        with pytest.raises(JobCancelled):
+            await ex.run(_spin, 0.5, size=1)
+    finally:
+        _current_request.reset(token)
+        ex.shutdown()
+    assert ex.stats()["cancelled"] == 1
+
+
+async def test_process_pool_runs_scoring():
+    ex = OffloadExecutor(process_workers=1, inline_below=0, process_from=0)
+    rivers = [{"name": "A", "river": "A川", "lat": 35.0, "lon": 139.0, "status": "danger"}]
+    try:
+        result = await ex.run(
+            _score_from_data, 35.0, 139.0, rivers, [], [], get_profile("urban"), size=1,
+        )
+    finally:
+        ex.shutdown()
+    assert result["profile"] == "urban"
+    assert result["river_risk"] == 1.0
+    assert ex.stats()["completed"]["process"] == 1
+
+
+def test_api_returns_503_when_saturated(monkeypatch):
+    from backend.app.main import app
+
+    monkeypatch.setattr(
+        executor_mod, "_executor", OffloadExecutor(inline_below=0, max_pending=0),
+    )
+    resp = TestClient(app).get("/api/summary")
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
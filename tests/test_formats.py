@@ -0,0 +1,130 @@
+"""Tests for MessagePack / Arrow content negotiation."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import formats
+from backend.app.main import app
+from backend.app.models.schemas import RiverWaterLevel
+
+client = TestClient(app)
+
+ROUTE = {"polyline": "_p~iF~ps|U_ulLnnqC_mqNvxq`@", "step_km": 5.0}
+
+
+def test_negotiate_prefers_json_on_ties():
+    offered = (formats.JSON, formats.MSGPACK, formats.ARROW)
+    assert formats.negotiate(None, offered) == formats.JSON
+    assert formats.negotiate("*/*", offered) == formats.JSON
+    assert formats.negotiate("text/html,application/xhtml+xml,*/*;q=0.8", offered) == formats.JSON
+    assert formats.negotiate("application/x-msgpack", offered) == formats.MSGPACK
+    assert formats.negotiate(f"{formats.ARROW};q=0.5, {formats.MSGPACK}", offered) == formats.MSGPACK
+    assert formats.negotiate(formats.ARROW, (formats.JSON, formats.MSGPACK)) == formats.JSON
+
+
+def test_project_fills_defaults_and_drops_extras():
+    row = {
+        "station_id": "S1", "name": "n", "river": "r", "lat": 35.0, "lon": 139.0,
+        "water_level_m": 1.0, "warning_level_m": 2.0, "danger_level_m": 3.0,
+        "status": "normal", "observed_at": "2024-01-01T00:00:00+09:00", "extra": 1,
+    }
+    out = formats.project([row], RiverWaterLevel)
+    assert out == [RiverWaterLevel(**row).model_dump()]
+
+
+def test_json_stays_the_default():
+    resp = client.get("/api/rivers")
+    assert resp.headers["content-type"] == "application/json"
+    assert "Accept" in resp.headers["vary"]
+
+
+def test_msgpack_matches_json():
+    msgpack = pytest.importorskip("msgpack")
+    expected = client.get("/api/rivers").json()
+    resp = client.get("/api/rivers", headers={"Accept": formats.MSGPACK})
+    assert resp.headers["content-type"] == formats.MSGPACK
+    assert "etag" in resp.headers and "cache-control" in resp.headers
+    assert msgpack.unpackb(resp.content) == expected
+
+    risk = client.get("/api/risk?lat=35.68&lon=139.69", headers={"Accept": formats.MSGPACK})
+    assert msgpack.unpackb(risk.content) == client.get("/api/risk?lat=35.68&lon=139.69").json()
+
+
+def test_arrow_list_and_route_table():
+    pa = pytest.importorskip("pyarrow")
+    import json
+
+    expected = client.get("/api/landslides").json()
+    resp = client.get("/api/landslides", headers={"Accept": formats.ARROW})
+    assert resp.headers["content-type"] == formats.ARROW
+    assert pa.ipc.open_stream(resp.content).read_all().to_pylist() == expected
+
+    route = client.post("/api/risk/route", json=ROUTE).json()
+    resp = client.post("/api/risk/route", json=ROUTE, headers={"Accept": formats.ARROW})
+    table = pa.ipc.open_stream(resp.content).read_all()
+    assert table.to_pylist() == route.pop("segments")
+    assert json.loads(table.schema.metadata[b"meta"]) == route
+
+
+def test_object_routes_do_not_offer_arrow():
+    resp = client.get("/api/risk?lat=35.68&lon=139.69", headers={"Accept": formats.ARROW})
+    assert resp.headers["content-type"] == "application/json"
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    from backend.app.mcp import data_provider
+    from backend.app.mcp.snapshot_store import SnapshotWriter
+    from backend.app.mcp.synthetic import EPOCH, SyntheticWorld
+    from backend.app.models.schemas import validate_feeds
+
+    path = str(tmp_path / "snap")
+    writer = SnapshotWriter(path, capacity=1 << 20)
+    writer.publish(validate_feeds(SyntheticWorld.with_size(200, 0).feeds(EPOCH)))
+    data_provider.configure_shared_snapshot(path)
+    yield
+    data_provider.configure_shared_snapshot(None)
+    writer.close()
+
+
+def test_snapshot_fast_path_matches_validated_output(snapshot):
+    fast = client.get("/api/rivers", headers={"Accept-Encoding": "identity"})
+    formats.set_fast_path(False)
+    try:
+        slow = client.get("/api/rivers", headers={"Accept-Encoding": "identity"})
+    finally:
+        formats.set_fast_path(True)
+    assert fast.content == slow.content
+    assert fast.headers["etag"] == slow.headers["etag"]
+    assert fast.headers["last-modified"] == slow.headers["last-modified"]
+    assert fast.headers["cache-control"] == slow.headers["cache-control"]
+
+
+def test_snapshot_fast_path_reuses_encodings(snapshot):
+    from backend.app.mcp import data_provider
+
+    first = client.get("/api/landslides", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    rows = data_provider._shared_feed("landslides")
+    cached = dict(rows.memo)
+    again = client.get("/api/landslides", headers={"Accept-Encoding": "gzip"})
+    assert again.content == first.content
+    assert rows.memo.keys() == cached.keys()
+    assert all(rows.memo[k] is v for k, v in cached.items())
+
+    etag = first.headers["etag"]
+    assert client.get("/api/landslides", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_snapshot_fast_path_binary(snapshot):
+    msgpack = pytest.importorskip("msgpack")
+    expected = client.get("/api/roads").json()
+    resp = client.get("/api/roads", headers={"Accept": formats.MSGPACK})
+    assert msgpack.unpackb(resp.content) == expected
+
+
+def test_openapi_schema_is_unchanged():
+    spec = client.get("/openapi.json").json()
+    ok = spec["paths"]["/api/rivers"]["get"]["responses"]["200"]["content"]
+    assert ok["application/json"]["schema"]["items"]["$ref"].endswith("/RiverWaterLevel")
@@ -0,0 +1,198 @@
+"""Tests for the snapshot history log and ``at=`` time-travel queries."""
+
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.mcp import data_provider, history
+from backend.app.mcp.history import HistoryReader, HistoryWriter
+from backend.app.mcp.synthetic import EPOCH, SyntheticWorld
+from backend.app.models.schemas import validate_feeds
+from backend.app.services.risk_scoring import _score_from_data
+from backend.app.services.scoring_profiles import get_profile
+from backend.app.services.situation_summary import _build_summary
+
+client = TestClient(app)
+
+HOURS = 10
+
+
+def _write_day(directory, checkpoint_every=4):
+    """Log one synthetic snapshot per hour; return {timestamp: feeds}."""
+    world = SyntheticWorld.with_size(100, 0)
+    writer = HistoryWriter(str(directory), checkpoint_every=checkpoint_every)
+    states = {}
+    for hour in range(HOURS):
+        at = EPOCH + timedelta(hours=hour)
+        feeds = validate_feeds(world.feeds(at))
+        writer.append(feeds, published_at=at.timestamp())
+        states[at.timestamp()] = feeds
+    writer.close()
+    return states
+
+
+def test_seek_rebuilds_every_snapshot(tmp_path):
+    states = _write_day(tmp_path)
+    reader = HistoryReader(str(tmp_path), cache_size=2)
+    assert reader.status()["snapshots"] == HOURS
+    assert reader.status()["checkpoints"] == 3  # hours 0, 4, 8
+
+    # Out of order, so seeks start from checkpoints and from cached states.
+    for ts in sorted(states, reverse=True) + sorted(states):
+        logged_at, feeds = reader.state_at(ts + 1800)  # between snapshots
+        assert logged_at == ts
+        assert feeds == states[ts]
+
+    with pytest.raises(LookupError):
+        reader.state_at(min(states) - 1)
+
+
+def test_diff_handles_reorder_removal_and_duplicate_keys():
+    a = {"road_id": "a", "status": "closed"}
+    b = {"road_id": "b", "status": "closed"}
+    c = {"road_id": "c", "status": "restricted"}
+    b2 = {**b, "status": "restricted"}
+    for old, new in [
+        ([a, b], [a, b2, c]),
+        ([a, b, c], [c, a]),
+        ([a, b], [b, a]),
+        ([a], [a, a]),
+        ([a, b], [{**a, "status": "open"}, {**b, "status": "open"}, c]),
+    ]:
+        change = history._diff("roads", old, new)
+        assert history._apply("roads", old, change) == new
+    assert history._diff("roads", [a, b], [a, b2]) == {
+        "add": [], "remove": [], "patch": {"b": {"status": "restricted"}},
+    }
+    stamped = [{**row, "updated_at": "t1"} for row in (a, b2)]
+    change = history._diff("roads", [{**a, "updated_at": "t0"}, {**b, "updated_at": "t0"}], stamped)
+    assert change["all"] == {"updated_at": "t1"}
+    assert change["patch"] == {"b": {"status": "restricted"}}
+    assert "rows" in history._diff("roads", [a], [a, a])
+    assert history._diff("roads", [a], [a]) is None
+
+
+async def test_ingestor_appends_each_snapshot(tmp_path):
+    from backend.app.mcp.ingestor import ingest_once
+    from backend.app.mcp.snapshot_store import SnapshotWriter
+
+    writer = SnapshotWriter(str(tmp_path / "snap"), capacity=1024 * 1024)
+    log = HistoryWriter(str(tmp_path / "history"))
+    await ingest_once(writer, log)
+    await ingest_once(writer, log)
+    log.close()
+    reader = HistoryReader(str(tmp_path / "history"))
+    assert reader.status()["snapshots"] == 2
+    _, feeds = reader.state_at(reader.end)
+    assert set(feeds) == {"rivers", "landslides", "warnings", "roads"}
+
+
+def test_reader_picks_up_appended_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "REFRESH_INTERVAL_S", 0.0)
+    writer = HistoryWriter(str(tmp_path), checkpoint_every=3)
+    reader = HistoryReader(str(tmp_path))
+    with pytest.raises(LookupError):
+        reader.state_at(100.0)
+
+    for i in range(5):
+        writer.append({"roads": [{"road_id": "r", "status": str(i)}]}, published_at=float(i))
+        _, feeds = reader.state_at(10.0)
+        assert feeds["roads"][0]["status"] == str(i)
+    writer.close()
+
+
+def test_reader_indexes_lazily(tmp_path, monkeypatch):
+    _write_day(tmp_path)
+    scanned = []
+    real = history._scan_headers
+    monkeypatch.setattr(history, "_scan_headers", lambda *a: scanned.append(a) or real(*a))
+    reader = HistoryReader(str(tmp_path))
+    assert scanned == []
+    reader.state_at(EPOCH.timestamp() + 3600)
+    assert scanned
+
+
+def test_retention_keeps_history_from_a_checkpoint(tmp_path):
+    world = SyntheticWorld.with_size(50, 0)
+    writer = HistoryWriter(str(tmp_path), checkpoint_every=3, segment_seconds=3 * 3600, max_age_s=6 * 3600)
+    for hour in range(24):
+        at = EPOCH + timedelta(hours=hour)
+        writer.append(validate_feeds(world.feeds(at)), published_at=at.timestamp())
+    writer.close()
+
+    files = history.segments(str(tmp_path))
+    assert len(files) < 8  # 24 h in 3 h segments, pruned to the last 6 h or so
+    reader = HistoryReader(str(tmp_path))
+    last = EPOCH.timestamp() + 23 * 3600
+    assert reader.start <= last - 6 * 3600
+    assert reader.status()["snapshots"] == reader.status()["checkpoints"] * 3
+    reader.state_at(reader.start)
+    with pytest.raises(LookupError):
+        reader.state_at(EPOCH.timestamp())
+
+    assert history.prune(str(tmp_path), max_bytes=0) == files[:-1]
+    assert history.segments(str(tmp_path)) == files[-1:]
+
+
+def test_reader_reindexes_after_pruning(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "REFRESH_INTERVAL_S", 0.0)
+    writer = HistoryWriter(str(tmp_path), checkpoint_every=2, segment_seconds=0)
+    for i in range(6):
+        writer.append({"roads": [{"road_id": "r", "status": str(i)}]}, published_at=float(i))
+    reader = HistoryReader(str(tmp_path))
+    assert reader.state_at(1.0)[1]["roads"][0]["status"] == "1"
+    history.prune(str(tmp_path), max_age_s=2.5, now=5.0)  # drops the segment of t=0..1
+    with pytest.raises(LookupError):
+        reader.state_at(0.5)  # not cached: its segment is gone, so the index is rebuilt
+    assert reader.state_at(4.5)[1]["roads"][0]["status"] == "4"
+    writer.close()
+
+
+@pytest.fixture
+def day(tmp_path):
+    states = _write_day(tmp_path)
+    data_provider.configure_history(str(tmp_path))
+    yield states
+    data_provider.configure_history(None)
+
+
+def test_risk_and_summary_at_past_time(day):
+    ts = sorted(day)[6]
+    feeds = day[ts]
+    at = (EPOCH + timedelta(hours=6, minutes=30)).isoformat()
+    lat, lon = feeds["rivers"][0]["lat"], feeds["rivers"][0]["lon"]
+
+    resp = client.get("/api/risk", params={"lat": lat, "lon": lon, "at": at})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["as_of"] == (EPOCH + timedelta(hours=6)).isoformat()
+    expected = _score_from_data(
+        lat, lon, feeds["rivers"], feeds["roads"], feeds["landslides"], get_profile(None),
+    )
+    assert body["overall_score"] == expected["overall_score"]
+
+    resp = client.get("/api/summary", params={"at": at})
+    assert resp.status_code == 200
+    expected = _build_summary(feeds["rivers"], feeds["roads"], feeds["landslides"])
+    assert resp.json()["data_snapshot"] == expected["data_snapshot"]
+    assert resp.json()["as_of"] == body["as_of"]
+
+    # Naive times are JST.
+    naive = (EPOCH + timedelta(hours=6, minutes=30)).replace(tzinfo=None).isoformat()
+    assert client.get("/api/summary", params={"at": naive}).json()["as_of"] == body["as_of"]
+
+
+def test_at_outside_history(day):
+    before = (EPOCH - timedelta(hours=1)).isoformat()
+    assert client.get("/api/summary", params={"at": before}).status_code == 404
+    future = "2999-01-01T00:00:00+09:00"
+    assert client.get("/api/risk", params={"lat": 35, "lon": 139, "at": future}).status_code == 422
+    assert client.get("/api/summary").json()["as_of"] is None  # live
+
+
+def test_at_without_history_is_404():
+    resp = client.get("/api/risk", params={"lat": 35, "lon": 139, "at": EPOCH.isoformat()})
+    assert resp.status_code == 404
+    assert "INFRASCOPE_HISTORY_DIR" in resp.json()["detail"]
@@ -0,0 +1,123 @@
+"""Tests for response compression, ETags / 304s and precompressed static files."""
+
+import gzip
+import os
+from datetime import timezone
+from email.utils import format_datetime
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Mount, Route
+
+from backend.app import http_cache
+from backend.app.main import app
+
+client = TestClient(app)
+
+
+def test_negotiate_honours_q_values_and_wildcards():
+    assert http_cache.negotiate("gzip, br", ("br", "gzip")) == "br"
+    assert http_cache.negotiate("gzip;q=1.0, br;q=0.5", ("br", "gzip")) == "gzip"
+    assert http_cache.negotiate("*;q=0.2, br;q=0", ("br", "gzip")) == "gzip"
+    assert http_cache.negotiate("identity", ("br", "gzip")) is None
+    assert http_cache.negotiate(None) is None
+    assert http_cache.negotiate("br", ("gzip",)) is None
+
+
+def test_feed_is_compressed_with_validators():
+    resp = client.get("/api/rivers", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert resp.headers["cache-control"] == f"public, max-age={http_cache.MAX_AGE_S}"
+    assert resp.headers["etag"].startswith('W/"')
+    assert "last-modified" in resp.headers
+    assert resp.json()  # decoded transparently by the client
+
+    plain = client.get("/api/rivers", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == resp.headers["etag"]
+    assert int(resp.headers["content-length"]) < int(plain.headers["content-length"])
+
+
+def test_matching_etag_gets_304_without_body():
+    etag = client.get("/api/roads").headers["etag"]
+    resp = client.get("/api/roads", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+    assert "content-encoding" not in resp.headers
+
+    assert client.get("/api/roads", headers={"If-None-Match": 'W/"stale"'}).status_code == 200
+
+
+def test_last_modified_is_newest_observation():
+    resp = client.get("/api/landslides")
+    latest = http_cache.newest(resp.json(), "observed_at")
+    assert resp.headers["last-modified"] == format_datetime(latest.astimezone(timezone.utc), usegmt=True)
+
+
+def test_uncacheable_and_small_responses():
+    health = client.get("/api/health")
+    assert "etag" not in health.headers
+    assert "cache-control" not in health.headers
+
+    profiles = client.get("/api/risk/profiles", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in profiles.headers  # below the size threshold
+    assert "etag" in profiles.headers
+
+
+def _stream_app():
+    async def chunks():
+        for i in range(50):
+            yield f"line {i} " * 20 + "\n"
+
+    async def endpoint(request):
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return http_cache.HttpCacheMiddleware(Starlette(routes=[Route("/stream", endpoint)]))
+
+
+def test_streamed_body_is_compressed_incrementally():
+    resp = TestClient(_stream_app()).get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "etag" not in resp.headers
+    assert resp.text.count("\n") == 50
+
+
+def test_precompressed_static_files(tmp_path):
+    js = tmp_path / "app.js"
+    js.write_text("function hello() { return 'hello'; }\n" * 100)
+    (tmp_path / "tiny.css").write_text("a{}")
+    written = http_cache.precompress(str(tmp_path))
+    assert tmp_path / "app.js.gz" in written
+    assert not (tmp_path / "tiny.css.gz").exists()
+
+    static = TestClient(Starlette(routes=[
+        Mount("/static", http_cache.PrecompressedStaticFiles(directory=str(tmp_path))),
+    ]))
+    resp = static.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-type"].startswith(("text/javascript", "application/javascript"))
+    assert resp.headers["cache-control"] == f"public, max-age={http_cache.STATIC_MAX_AGE_S}"
+    assert int(resp.headers["content-length"]) == (tmp_path / "app.js.gz").stat().st_size
+    assert resp.text == js.read_text()
+
+    etag = resp.headers["etag"]
+    again = static.get("/static/app.js", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert again.status_code == 304
+
+    plain = static.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    # A stale sibling (source edited after precompression) is not served.
+    stat = js.stat()
+    os.utime(tmp_path / "app.js.gz", (stat.st_atime, stat.st_mtime - 60))
+    resp = static.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+
+
+def test_gzip_round_trip():
+    body = b'{"a": 1}' * 1000
+    assert gzip.decompress(http_cache.compress(body, "gzip")) == body
@@ -0,0 +1,79 @@
+"""Tests for the Prometheus metrics module."""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.app import metrics
+
+
+def test_histogram_buckets_and_render():
+    hist = metrics.Histogram("test_latency_seconds", "Test.", ["op"], buckets=(0.1, 1.0))
+    child = hist.labels("read")
+    child.observe(0.05)
+    child.observe(0.5)
+    child.observe(5.0)
+    text = hist.render()
+    assert '# TYPE test_latency_seconds histogram' in text
+    assert 'test_latency_seconds_bucket{op="read",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{op="read",le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{op="read",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{op="read"} 3' in text
+
+
+def test_counter_and_disable():
+    counter = metrics.Counter("test_events", "Test.", ["kind"])
+    counter.labels("a").inc()
+    hist = metrics.Histogram("test_off_seconds", "Test.")
+    metrics.set_enabled(False)
+    try:
+        counter.labels("a").inc()
+        with hist.time():
+            pass
+    finally:
+        metrics.set_enabled(True)
+    assert 'test_events_total{kind="a"} 1' in counter.render()
+    assert hist.labels().count == 0
+
+
+def test_disabled_overhead_is_sub_microsecond():
+    hist = metrics.Histogram("test_overhead_seconds", "Test.")
+    child = hist.labels()
+
+    @metrics.timed(child)
+    def noop():
+        return None
+
+    def per_call(fn, n=20_000, repeat=5):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(n):
+                fn()
+            best = min(best, (time.perf_counter() - start) / n)
+        return best
+
+    def with_timer():
+        with child.time():
+            pass
+
+    metrics.set_enabled(False)
+    try:
+        assert per_call(with_timer) < 1e-6
+        assert per_call(noop) < 1e-6
+    finally:
+        metrics.set_enabled(True)
+    assert child.count == 0
+
+
+def test_metrics_endpoint_exposes_hot_path_metrics():
+    from backend.app.main import app
+
+    client = TestClient(app)
+    client.get("/api/risk", params={"lat": 35.68, "lon": 139.69})
+    client.get("/api/summary")
+    text = client.get("/metrics").text
+    assert 'infrascope_risk_score_seconds_count{kind="point"}' in text
+    assert "infrascope_summary_build_seconds_count" in text
+    assert 'infrascope_http_request_seconds_count{method="GET",route="/api/risk",status="200"}' in text
+    assert "infrascope_upstream_circuit_open" in text
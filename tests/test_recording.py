@@ -0,0 +1,138 @@
+"""Tests for upstream payload recording and replay."""
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.mcp import data_provider
+from backend.app.mcp.recording import Recorder, Replayer, iter_records, segments
+from backend.app.mcp.resilience import CircuitBreaker
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_records_round_trip_in_time_order(tmp_path):
+    rec = Recorder(str(tmp_path), segment_seconds=100)
+    rec.record("flood", b'{"a": 1}', recorded_at=1000.0)
+    rec.record("sediment", b'{"b": 2}', recorded_at=1050.0)
+    rec.record("flood", b'{"a": 3}', recorded_at=1200.0)  # rolls to a new segment
+    rec.close()
+    assert len(segments(str(tmp_path))) == 2
+
+    records = list(iter_records(str(tmp_path)))
+    assert [(r.recorded_at, r.feed, r.payload) for r in records] == [
+        (1000.0, "flood", b'{"a": 1}'),
+        (1050.0, "sediment", b'{"b": 2}'),
+        (1200.0, "flood", b'{"a": 3}'),
+    ]
+    assert [r.payload for r in iter_records(str(tmp_path), feeds=("flood",), start=1100)] == [
+        b'{"a": 3}',
+    ]
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    rec = Recorder(str(tmp_path))
+    rec.record("flood", b"x" * 1000, recorded_at=1.0)
+    rec.record("flood", b"y" * 1000, recorded_at=2.0)
+    rec.close()
+    path = segments(str(tmp_path))[0]
+    path.write_bytes(path.read_bytes()[:-5])
+    assert [r.recorded_at for r in iter_records(str(tmp_path))] == [1.0]
+
+
+def test_replayer_follows_accelerated_clock(tmp_path):
+    rec = Recorder(str(tmp_path))
+    for i, t in enumerate((0.0, 60.0, 120.0)):
+        rec.record("flood", f"v{i}".encode(), recorded_at=1000.0 + t)
+    rec.close()
+
+    clock = _Clock()
+    replay = Replayer(str(tmp_path), speed=60.0, clock=clock)
+    assert replay.payload("flood") == b"v0"
+    clock.now = 1.5  # 90 recorded seconds
+    assert replay.payload("flood") == b"v1"
+    clock.now = 100.0
+    assert replay.payload("flood") == b"v2"  # past the end: last payload
+    replay.seek(1000.0)
+    assert replay.payload("flood") == b"v0"
+    with pytest.raises(LookupError):
+        replay.payload("warnings")
+
+
+def test_empty_recording_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Replayer(str(tmp_path))
+
+
+async def test_recorded_fetch_replays_through_parse_path(tmp_path, monkeypatch):
+    payload = b'{"130010": {"level": 4}}'
+
+    async def upstream(url):
+        return payload
+
+    async def offline(url):
+        raise AssertionError("replay must not touch the network")
+
+    monkeypatch.setattr(data_provider, "_last_good", {})
+    monkeypatch.setitem(data_provider._BREAKERS, "flood", CircuitBreaker("flood"))
+    monkeypatch.setattr(data_provider, "_request", upstream)
+    data_provider.configure_recording(str(tmp_path))
+    try:
+        live = await data_provider.get_river_water_levels_async(use_snapshot=False)
+    finally:
+        data_provider.configure_recording(None)
+    assert [r.payload for r in iter_records(str(tmp_path))] == [payload]
+
+    monkeypatch.setattr(data_provider, "_request", offline)
+    data_provider.configure_replay(str(tmp_path), speed=0)
+    try:
+        replayed = await data_provider.get_river_water_levels_async(use_snapshot=False)
+        assert data_provider.replay_status()["speed"] == 0
+    finally:
+        data_provider.configure_replay(None)
+    strip = lambda rows: [{k: v for k, v in r.items() if k != "observed_at"} for r in rows]
+    assert strip(replayed) == strip(live)
+
+
+async def test_recording_writes_off_the_event_loop(tmp_path, monkeypatch):
+    threads = []
+    real = Recorder.record
+    monkeypatch.setattr(
+        Recorder, "record",
+        lambda self, *a, **k: threads.append(threading.current_thread()) or real(self, *a, **k),
+    )
+    monkeypatch.setitem(data_provider._BREAKERS, "flood", CircuitBreaker("flood"))
+
+    async def upstream(url):
+        return b'{"130010": {"level": 4}}'
+
+    monkeypatch.setattr(data_provider, "_request", upstream)
+    data_provider.configure_recording(str(tmp_path))
+    try:
+        await data_provider._fetch_raw("flood", "http://jma.test/flood")
+    finally:
+        data_provider.configure_recording(None)  # drains the writer
+    assert len(threads) == 1
+    assert threads[0] is not threading.current_thread()
+    assert len(list(iter_records(str(tmp_path)))) == 1
+
+
+def test_health_reports_replay_position(tmp_path):
+    rec = Recorder(str(tmp_path))
+    rec.record("flood", b"{}", recorded_at=1000.0)
+    rec.close()
+    client = TestClient(app)
+    assert client.get("/api/health").json()["replay"] is None
+    data_provider.configure_replay(str(tmp_path), speed=0)
+    try:
+        assert client.get("/api/health").json()["replay"]["speed"] == 0
+    finally:
+        data_provider.configure_replay(None)
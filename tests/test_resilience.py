@@ -0,0 +1,156 @@
+"""Tests for upstream circuit breakers and hedged requests."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.mcp import data_provider
+from backend.app.mcp.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    LatencyTracker,
+    hedged,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_and_half_opens():
+    clock = _Clock()
+    breaker = CircuitBreaker("t", failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now = 11
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 22
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["total_rejected"] == 2
+
+
+def test_latency_percentile_needs_samples():
+    tracker = LatencyTracker(min_samples=3)
+    tracker.observe(0.1)
+    assert tracker.percentile(95) is None
+    tracker.observe(0.2)
+    tracker.observe(0.3)
+    assert tracker.percentile(50) == 0.2
+
+
+async def test_hedged_returns_faster_attempt():
+    delays = [0.5, 0.01]
+
+    async def call():
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return delay
+
+    assert await hedged(call, delay=0.02) == 0.01
+
+
+async def test_hedged_raises_when_all_attempts_fail():
+    async def call():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await hedged(call, delay=0.01)
+
+
+@pytest.fixture
+def fresh_upstream(monkeypatch):
+    clock = _Clock()
+    for feed in data_provider.FEEDS:
+        monkeypatch.setitem(
+            data_provider._BREAKERS, feed,
+            CircuitBreaker(feed, failure_threshold=2, reset_timeout=30, clock=clock),
+        )
+    monkeypatch.setattr(data_provider, "_last_good", {})
+    return clock
+
+
+async def test_open_circuit_fails_fast_to_last_good(monkeypatch, fresh_upstream):
+    calls = 0
+    payload = b'{"130010": {"level": 4}}'
+
+    async def ok(url):
+        nonlocal calls
+        calls += 1
+        return payload
+
+    async def fail(url):
+        nonlocal calls
+        calls += 1
+        raise OSError("upstream down")
+
+    monkeypatch.setattr(data_provider, "_request", ok)
+    live = await data_provider.get_river_water_levels_async()
+    assert live[0]["source"] == "jma"
+
+    monkeypatch.setattr(data_provider, "_request", fail)
+    for _ in range(2):
+        assert await data_provider.get_river_water_levels_async() == live
+    assert data_provider._BREAKERS["flood"].state == OPEN
+
+    calls = 0
+    assert await data_provider.get_river_water_levels_async() == live
+    assert calls == 0  # no upstream call while the circuit is open
+
+
+async def test_cancelled_half_open_probe_frees_its_slot(monkeypatch, fresh_upstream):
+    started = asyncio.Event()
+
+    async def hang(url):
+        started.set()
+        await asyncio.sleep(60)
+
+    async def ok(url):
+        return b"{}"
+
+    breaker = data_provider._BREAKERS["flood"]
+    breaker.record_failure()
+    breaker.record_failure()
+    fresh_upstream.now += 30
+    monkeypatch.setattr(data_provider, "_request", hang)
+    probe = asyncio.create_task(data_provider._fetch_raw("flood", "http://jma/flood"))
+    await started.wait()
+    assert breaker.state == HALF_OPEN and not breaker.allow()  # slot taken
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    monkeypatch.setattr(data_provider, "_request", ok)
+    assert await data_provider._fetch_raw("flood", "http://jma/flood") == b"{}"
+    assert breaker.state == CLOSED
+
+
+def test_health_endpoint_reports_breakers(monkeypatch, fresh_upstream):
+    from backend.app.main import app
+
+    data_provider._BREAKERS["sediment"].record_failure()
+    data_provider._BREAKERS["sediment"].record_failure()
+    resp = TestClient(app).get("/api/health")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "degraded"
+    assert data["upstream"]["sediment"]["state"] == "open"
+    assert data["upstream"]["flood"]["state"] == "closed"
@@ -0,0 +1,112 @@
+"""Tests for route risk scoring."""
+
+import pytest
+
+from backend.app.services.risk_scoring import (
+    PROXIMITY_THRESHOLD_KM,
+    _haversine_km,
+    _score_from_data,
+    score_points,
+)
+from backend.app.services.route_risk import (
+    _score_route,
+    closures_along_route,
+    MAX_ROUTE_VERTICES,
+    decode_polyline,
+    densify,
+    parse_route,
+)
+
+RIVERS = [
+    {"station_id": "R1", "name": "A", "river": "A川", "lat": 35.70, "lon": 139.70,
+     "status": "danger"},
+]
+ROADS = [
+    {"road_id": "RD1", "road_name": "国道1号", "section": "x", "lat": 35.60, "lon": 139.405,
+     "cause": "冠水", "status": "closed"},
+    {"road_id": "RD2", "road_name": "国道2号", "section": "y", "lat": 34.00, "lon": 135.00,
+     "cause": "冠水", "status": "closed"},
+]
+LANDSLIDES = [
+    {"area_id": "LS1", "name": "B", "prefecture": "東京都", "lat": 35.60, "lon": 139.20,
+     "risk_score": 0.8, "warning_level": "very_high"},
+]
+
+
+def test_decode_polyline_reference():
+    # Reference example from the polyline algorithm documentation.
+    coords = decode_polyline("_p~iF~ps|U_ulLnnqC_mqNvxq`@")
+    assert coords == [(38.5, -120.2), (40.7, -120.95), (43.252, -126.453)]
+
+
+def test_parse_route_geojson_swaps_axes():
+    coords = parse_route(geometry={"type": "LineString", "coordinates": [[139.0, 35.0], [139.5, 35.5]]})
+    assert coords == [(35.0, 139.0), (35.5, 139.5)]
+
+
+def test_parse_route_requires_exactly_one_input():
+    with pytest.raises(ValueError):
+        parse_route()
+    with pytest.raises(ValueError):
+        parse_route(geometry={"type": "Point", "coordinates": [139.0, 35.0]})
+
+
+@pytest.mark.parametrize("geometry", [
+    {"type": "LineString", "coordinates": 5},
+    {"type": "Feature", "geometry": "x"},
+    {"type": "LineString", "coordinates": [[139.0, 35.0], "ab"]},
+])
+def test_parse_route_rejects_malformed_geojson(geometry):
+    with pytest.raises(ValueError):
+        parse_route(geometry=geometry)
+
+
+def test_parse_route_caps_vertices():
+    line = [[139.0 + i * 1e-4, 35.0] for i in range(MAX_ROUTE_VERTICES + 1)]
+    with pytest.raises(ValueError):
+        parse_route(geometry={"type": "LineString", "coordinates": line})
+    assert len(parse_route(geometry={"type": "LineString", "coordinates": line[:-1]})) == MAX_ROUTE_VERTICES
+
+
+def test_densify_respects_step():
+    points, owners, lengths = densify([(35.0, 139.0), (35.0, 140.0)], step_km=5.0)
+    assert points[0] == (35.0, 139.0)
+    assert points[-1] == (35.0, 140.0)
+    assert len(points) == int(lengths[0] // 5.0) + 2
+    assert set(owners) == {0}
+
+
+def test_score_points_matches_single_point_scoring():
+    points = [(35.60, 139.30), (35.70, 139.69), (0.0, 0.0)]
+    batch = score_points(points, RIVERS, ROADS, LANDSLIDES)
+    for (lat, lon), result in zip(points, batch):
+        single = _score_from_data(lat, lon, RIVERS, ROADS, LANDSLIDES)
+        for key in ("overall_score", "river_risk", "road_risk", "landslide_risk", "level"):
+            assert result[key] == single[key]
+
+
+def test_score_points_reaches_hazards_at_the_radius_due_north():
+    lat, lon = 35.0, 139.0
+    north = lat + 0.999 * PROXIMITY_THRESHOLD_KM / _haversine_km(0.0, 0.0, 1.0, 0.0)
+    rivers = [{**RIVERS[0], "lat": north, "lon": lon}]
+    assert _haversine_km(lat, lon, north, lon) < PROXIMITY_THRESHOLD_KM
+    [batch] = score_points([(lat, lon)], rivers, [], [])
+    single = _score_from_data(lat, lon, rivers, [], [])
+    assert batch["river_risk"] == single["river_risk"] > 0.0
+
+
+def test_closures_along_route_uses_buffer():
+    coords = [(35.60, 139.00), (35.60, 139.80)]
+    assert [rd["road_id"] for rd in closures_along_route(coords, ROADS, 1.0)] == ["RD1"]
+    far = [(36.00, 139.00), (36.00, 139.80)]
+    assert closures_along_route(far, ROADS, 1.0) == []
+
+
+def test_score_route_segments_and_aggregate():
+    coords = [(35.60, 139.00), (35.60, 139.40), (35.70, 139.70)]
+    result = _score_route(coords, RIVERS, ROADS, LANDSLIDES, step_km=1.0, buffer_km=1.0)
+    assert len(result["segments"]) == 2
+    assert result["max_score"] == max(s["overall_score"] for s in result["segments"])
+    assert 0.0 <= result["mean_score"] <= result["max_score"]
+    assert result["level"] in ("low", "moderate", "high", "critical")
+    assert [rd["road_id"] for rd in result["road_closures"]] == ["RD1"]
@@ -0,0 +1,74 @@
+"""Tests for risk scoring profiles."""
+
+import pytest
+
+from backend.app.services import scoring_profiles
+from backend.app.services.risk_scoring import _score_from_data, compute_risk
+from backend.app.services.scoring_profiles import (
+    ScoringProfile,
+    compile_profile,
+    get_profile,
+    list_profiles,
+    register_profile,
+)
+
+RIVERS = [
+    {"station_id": "R1", "name": "A", "river": "A川", "lat": 35.70, "lon": 139.70,
+     "status": "danger"},
+]
+
+
+def test_builtin_profiles_registered():
+    assert {"default", "urban", "logistics", "mountain"} <= set(list_profiles())
+
+
+def test_default_profile_matches_original_engine():
+    # 10 km from a danger station with the original linear 30 km falloff.
+    result = _score_from_data(35.70, 139.70 + 10 / 90.4, RIVERS, [], [])
+    dist_weight = 1.0 - result["river_risk"]
+    assert result["profile"] == "default"
+    assert dist_weight == pytest.approx(10 / 30, abs=0.01)
+    assert result["overall_score"] == round(result["river_risk"] * 0.4, 3)
+
+
+@pytest.mark.parametrize("falloff", ["linear", "gaussian", "exponential"])
+def test_falloff_curves_are_bounded(falloff):
+    compiled = compile_profile(ScoringProfile(name=f"t-{falloff}", falloff=falloff))
+    fn = compiled.falloffs[0]
+    assert fn(0.0) == pytest.approx(1.0)
+    assert fn(30.0) == 0.0
+    assert fn(100.0) == 0.0
+    assert 0.0 < fn(15.0) < 1.0
+    assert fn(5.0) > fn(10.0) > fn(20.0)
+
+
+@pytest.fixture
+def rivers_only():
+    """Register a rivers-only profile for one test, then remove it."""
+    register_profile(ScoringProfile(
+        name="test-rivers-only",
+        radius_km={"river": 5.0, "road": 5.0, "landslide": 5.0},
+        weights={"river": 1.0, "road": 0.0, "landslide": 0.0},
+        thresholds=(0.1, 0.2, 0.3),
+    ))
+    yield "test-rivers-only"
+    scoring_profiles._REGISTRY.pop("test-rivers-only", None)
+
+
+def test_profile_radius_and_weights_apply(rivers_only):
+    near = _score_from_data(35.70, 139.70, RIVERS, [], [], get_profile(rivers_only))
+    assert near["overall_score"] == 1.0
+    assert near["level"] == "critical"
+    far = _score_from_data(35.70, 139.80, RIVERS, [], [], get_profile(rivers_only))
+    assert far["river_risk"] == 0.0
+
+
+def test_invalid_profiles_rejected():
+    with pytest.raises(ValueError):
+        compile_profile(ScoringProfile(name="bad", falloff="cubic"))
+    with pytest.raises(ValueError):
+        compile_profile(ScoringProfile(name="bad", thresholds=(0.5, 0.25, 0.75)))
+    with pytest.raises(ValueError):
+        register_profile(ScoringProfile(name="default", falloff="gaussian"))
+    with pytest.raises(ValueError):
+        compute_risk(35.68, 139.69, profile="no-such-profile")
@@ -0,0 +1,136 @@
+"""Tests for the shared snapshot store used in multi-worker mode."""
+
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from backend.app.mcp import data_provider
+from backend.app.mcp.snapshot_store import SnapshotReader, SnapshotTooLarge, SnapshotWriter
+
+FEEDS = {
+    "rivers": [{"station_id": "S1", "status": "danger"}],
+    "landslides": [],
+    "warnings": [],
+    "roads": [{"road_id": "RD1", "status": "closed"}],
+}
+
+
+def test_publish_and_read_roundtrip(tmp_path):
+    path = str(tmp_path / "snap")
+    writer = SnapshotWriter(path, capacity=4096)
+    reader = SnapshotReader(path, reopen_interval=0)
+    assert reader.read() is None
+
+    assert writer.publish(FEEDS) == 1
+    version, _, feeds = reader.read()
+    assert version == 1
+    assert feeds == FEEDS
+
+    writer.publish({**FEEDS, "roads": []})
+    version, _, feeds = reader.read()
+    assert version == 2
+    assert feeds["roads"] == []
+
+
+def test_reader_caches_decoded_version(tmp_path):
+    path = str(tmp_path / "snap")
+    writer = SnapshotWriter(path, capacity=4096)
+    writer.publish(FEEDS)
+    reader = SnapshotReader(path, reopen_interval=0)
+    assert reader.read()[2] is reader.read()[2]
+
+
+def test_writer_resumes_version(tmp_path):
+    path = str(tmp_path / "snap")
+    SnapshotWriter(path, capacity=4096).publish(FEEDS)
+    assert SnapshotWriter(path, capacity=4096).publish(FEEDS) == 2
+
+
+def test_oversized_snapshot_rejected(tmp_path):
+    writer = SnapshotWriter(str(tmp_path / "snap"), capacity=16)
+    with pytest.raises(SnapshotTooLarge):
+        writer.publish(FEEDS)
+
+
+def test_snapshot_visible_across_processes(tmp_path):
+    path = str(tmp_path / "snap")
+    script = textwrap.dedent(f"""
+        from backend.app.mcp.snapshot_store import SnapshotWriter
+        SnapshotWriter({path!r}, capacity=4096).publish({{"rivers": [{{"station_id": "X"}}]}})
+    """)
+    subprocess.run([sys.executable, "-c", script], check=True)
+    version, _, feeds = SnapshotReader(path, reopen_interval=0).read()
+    assert version == 1
+    assert feeds["rivers"] == [{"station_id": "X"}]
+
+
+async def test_data_provider_serves_shared_snapshot(tmp_path):
+    path = str(tmp_path / "snap")
+    SnapshotWriter(path, capacity=4096).publish(FEEDS)
+    data_provider.configure_shared_snapshot(path)
+    try:
+        assert await data_provider.get_river_water_levels_async() == FEEDS["rivers"]
+        assert data_provider.get_road_closures() == FEEDS["roads"]
+        assert data_provider.shared_snapshot_status()["version"] == 1
+        # The ingestor bypasses the snapshot and fetches for real.
+        assert data_provider.get_road_closures(use_snapshot=False) != FEEDS["roads"]
+    finally:
+        data_provider.configure_shared_snapshot(None)
+
+
+async def test_ingestor_publishes_all_feeds(tmp_path):
+    from backend.app.mcp.ingestor import ingest_once
+
+    path = str(tmp_path / "snap")
+    version = await ingest_once(SnapshotWriter(path, capacity=1024 * 1024))
+    _, _, feeds = SnapshotReader(path, reopen_interval=0).read()
+    assert version == 1
+    assert set(feeds) == {"rivers", "landslides", "warnings", "roads"}
+    assert feeds["rivers"]
+
+
+def test_validate_feeds_normalises_rows():
+    from pydantic import ValidationError
+
+    from backend.app.models.schemas import RoadClosure, validate_feeds
+
+    road = {
+        "road_id": "RD1", "road_name": "R1", "section": "A-B", "lat": "35.1", "lon": 139.0,
+        "cause": "flood", "status": "closed", "since": "t0", "updated_at": "t1", "extra": 1,
+    }
+    feeds = validate_feeds({"roads": [road], "other": [{"x": 1}]})
+    assert feeds["roads"] == [RoadClosure(**road).model_dump()]
+    assert feeds["roads"][0]["lat"] == 35.1
+    assert feeds["other"] == [{"x": 1}]
+    with pytest.raises(ValidationError):
+        validate_feeds({"roads": [{"road_id": "RD1"}]})
+
+
+def test_reader_marks_snapshot_rows(tmp_path):
+    from backend.app.mcp.snapshot_store import SnapshotRows
+
+    path = str(tmp_path / "snap")
+    SnapshotWriter(path, capacity=4096).publish(FEEDS)
+    reader = SnapshotReader(path, reopen_interval=0)
+    _, _, feeds = reader.read()
+    assert isinstance(feeds["rivers"], SnapshotRows)
+    feeds["rivers"].memo["k"] = 1
+    assert reader.read()[2]["rivers"].memo == {"k": 1}  # shared until the feed changes
+
+
+def test_unchanged_feeds_are_not_decoded_again(tmp_path):
+    path = str(tmp_path / "snap")
+    writer = SnapshotWriter(path, capacity=4096)
+    reader = SnapshotReader(path, reopen_interval=0)
+    writer.publish(FEEDS)
+    _, _, before = reader.read()
+    before["rivers"].memo["body"] = b"..."
+
+    writer.publish({**FEEDS, "roads": []})
+    version, _, after = reader.read()
+    assert version == 2
+    assert after["rivers"] is before["rivers"]
+    assert after["rivers"].memo == {"body": b"..."}
+    assert after["roads"] == [] and after["roads"] is not before["roads"]
@@ -0,0 +1,84 @@
+"""Tests for the seeded synthetic data generator."""
+
+import types
+from datetime import timedelta
+
+import pytest
+
+from backend.app.mcp.synthetic import EPOCH, SCENARIOS, SyntheticWorld, get_scenario
+
+LANDFALL = EPOCH + timedelta(hours=36)
+
+
+def test_same_seed_and_time_give_identical_feeds():
+    a = SyntheticWorld.with_size(500, seed=7).feeds(LANDFALL)
+    b = SyntheticWorld.with_size(500, seed=7).feeds(LANDFALL)
+    c = SyntheticWorld.with_size(500, seed=8).feeds(LANDFALL)
+    assert a == b
+    assert a["rivers"] != c["rivers"]
+
+
+def test_times_within_one_step_agree():
+    world = SyntheticWorld()
+    assert world.feeds(LANDFALL) == world.feeds(LANDFALL + timedelta(minutes=9))
+    assert world.feeds(LANDFALL) != world.feeds(LANDFALL + timedelta(hours=6))
+
+
+def test_rows_are_memoised_per_step(monkeypatch):
+    world = SyntheticWorld.with_size(200)
+    calls = []
+    real = world.iter_rivers
+    monkeypatch.setattr(world, "iter_rivers", lambda at=None: calls.append(at) or real(at))
+    first = world.rows("rivers", LANDFALL)
+    again = world.feeds(LANDFALL + timedelta(minutes=9))["rivers"]
+    assert len(calls) == 1
+    assert again == first and again is not first
+    assert again[0] is first[0]
+    assert world.rows("rivers", LANDFALL + timedelta(hours=1)) != first
+    assert len(calls) == 2
+    with pytest.raises(ValueError):
+        world.rows("tides")
+
+
+def test_sizes_and_curated_sites_first():
+    world = SyntheticWorld.with_size(1000)
+    assert world.sizes() == {"rivers": 400, "roads": 200, "landslides": 400}
+    rivers = list(world.iter_rivers(LANDFALL))
+    assert rivers[0]["station_id"] == "R001"
+    assert len({r["station_id"] for r in rivers}) == 400
+    assert all(24.0 < r["lat"] < 46.0 and 122.0 < r["lon"] < 149.0 for r in rivers)
+
+
+def test_feeds_stream():
+    assert isinstance(SyntheticWorld().iter_landslides(), types.GeneratorType)
+
+
+def test_typhoon_passage_raises_levels_and_closes_roads():
+    world = SyntheticWorld()
+    calm = world.feeds(EPOCH)
+    storm = world.feeds(LANDFALL)
+    assert sum(r["water_level_m"] for r in storm["rivers"]) > sum(
+        r["water_level_m"] for r in calm["rivers"]
+    )
+    assert len(storm["roads"]) > len(calm["roads"])
+    # Closures are where the rain is.
+    scenario = get_scenario("typhoon")
+    for road in storm["roads"]:
+        if road["cause"] in ("土砂崩れ", "冠水"):
+            assert scenario.rain(road["lat"], road["lon"], 36.0) >= 0.35
+            assert road["since"] < road["updated_at"]
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_scenarios_stay_in_range(name):
+    world = SyntheticWorld.with_size(300, scenario=name)
+    for hours in range(0, 72, 8):
+        feeds = world.feeds(EPOCH + timedelta(hours=hours))
+        assert all(0.0 <= a["risk_score"] <= 1.0 for a in feeds["landslides"])
+        assert all(r["water_level_m"] >= 0.0 for r in feeds["rivers"])
+        assert feeds["roads"]  # standing incidents are always listed
+
+
+def test_unknown_scenario():
+    with pytest.raises(ValueError):
+        SyntheticWorld(scenario="meteor")
@@ -0,0 +1,48 @@
+"""Tests for per-request tracing and profiling hooks."""
+
+from fastapi.testclient import TestClient
+
+from backend.app import tracing
+from backend.app.main import app
+
+client = TestClient(app)
+
+
+def _stages(header: str) -> set[str]:
+    return {part.split(";")[0].strip() for part in header.split(",")}
+
+
+def test_span_is_noop_without_trace():
+    assert tracing.span("anything") is tracing._NULL_SPAN
+
+
+def test_no_server_timing_by_default():
+    resp = client.get("/api/roads")
+    assert "server-timing" not in resp.headers
+
+
+def test_traced_risk_request_reports_stages():
+    resp = client.get(
+        "/api/risk", params={"lat": 35.68, "lon": 139.69}, headers={"X-InfraScope-Trace": "1"},
+    )
+    assert resp.status_code == 200
+    stages = _stages(resp.headers["server-timing"])
+    assert {"data", "score", "endpoint", "serialize", "total"} <= stages
+
+
+def test_traced_summary_request_reports_stages():
+    resp = client.get("/api/summary", headers={"X-InfraScope-Trace": "1"})
+    assert {"data", "summary", "endpoint", "total"} <= _stages(resp.headers["server-timing"])
+
+
+def test_profile_dumped_to_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "PROFILE_DIR", str(tmp_path))
+    resp = client.get("/api/summary", headers={"X-InfraScope-Profile": "1"})
+    assert resp.status_code == 200
+    dumps = list(tmp_path.glob("*api_summary*.prof"))
+    assert len(dumps) == 1
+
+
+def test_openapi_schema_keeps_endpoint_parameters():
+    params = app.openapi()["paths"]["/api/risk"]["get"]["parameters"]
+    assert {p["name"] for p in params} >= {"lat", "lon", "profile"}